@@ -1,18 +1,22 @@
 import numpy as np
+import numba as nb
 import Tools.AnalyticTools
 
 from scipy.special import ndtr
 from MC_Engines.MC_LocalVol import LocalVolFunctionals
 
 
+@nb.jit("f8(f8)", nopython=True, nogil=True)
 def G(y):
     return Tools.AnalyticTools.normal_pdf(0.0, 1.0, y) - y * ndtr(-y)
 
 
+@nb.jit("f8(f8)", nopython=True, nogil=True)
 def Gq(y):
     return (1+y*y) * ndtr(-y) - Tools.AnalyticTools.normal_pdf(0.0, 1.0, y) * y
 
 
+@nb.jit("f8(f8, f8, f8, f8, f8, f8)", nopython=True, nogil=True)
 def get_quadratic_option_normal_sabr_watanabe_expansion(f0, k, t, alpha, nu, rho):
     y = (k - f0) / (alpha * np.sqrt(t))
     rho_inv = np.sqrt(1.0 - rho * rho)
@@ -36,7 +40,8 @@ def get_quadratic_option_normal_sabr_watanabe_expansion(f0, k, t, alpha, nu, rho
     return alpha * alpha * t * (g_y + a_t + b_t + c_t)
 
 
-def get_option_normal_sabr_watanabe_expansion(f0, k, t, alpha, nu, rho, option_type):
+@nb.jit("f8(f8, f8, f8, f8, f8, f8, i8)", nopython=True, nogil=True)
+def get_option_normal_sabr_watanabe_expansion_value(f0, k, t, alpha, nu, rho, is_call):
     y = (k - f0) / (alpha * np.sqrt(t))
     rho_inv = np.sqrt(1.0 - rho * rho)
     phi_y = Tools.AnalyticTools.normal_pdf(0.0, 1.0, y)
@@ -47,12 +52,17 @@ def get_option_normal_sabr_watanabe_expansion(f0, k, t, alpha, nu, rho, option_t
           0.5 * np.power(nu * rho, 2.0) * np.power(0.5 * (y * y - 1.0), 2.0) + \
           0.5 * np.power(rho_inv * nu, 2.0) * ((np.power(y, 2.0) + 2.0) / 3.0) - 0.25 * nu * nu
 
-    if option_type == 'c':
+    if is_call == 1:
         return alpha * np.sqrt(t) * (g_y + phi_y * np.sqrt(t) * a_t + phi_y * t * b_t)
     else:
         return alpha * np.sqrt(t) * (g_y + phi_y * np.sqrt(t) * a_t + phi_y * t * b_t) - (f0 - k)
 
 
+def get_option_normal_sabr_watanabe_expansion(f0, k, t, alpha, nu, rho, option_type):
+    return get_option_normal_sabr_watanabe_expansion_value(f0, k, t, alpha, nu, rho, 1 if option_type == 'c' else 0)
+
+
+@nb.jit("f8(f8, f8, f8, f8, f8, f8)", nopython=True, nogil=True)
 def get_iv_normal_sabr_watanabe_expansion(f0, k, t, alpha, nu, rho):
     y = (k - f0) / (alpha * np.sqrt(t))
     rho_inv = np.sqrt(1.0 - rho * rho)
@@ -65,6 +75,7 @@ def get_iv_normal_sabr_watanabe_expansion(f0, k, t, alpha, nu, rho):
     return alpha * (1.0 + np.sqrt(t) * a_t + t * b_t)
 
 
+@nb.jit("f8(f8, f8, f8, f8, f8, f8)", nopython=True, nogil=True)
 def get_iv_normal_lv_sabr_watanabe_expansion(f0, k, t, alpha, nu, rho):
     y = (k - f0) / (alpha * np.sqrt(t))
 
@@ -74,7 +85,8 @@ def get_iv_normal_lv_sabr_watanabe_expansion(f0, k, t, alpha, nu, rho):
     return alpha * (1.0 + a_t * np.sqrt(t) + b_t * t)
 
 
-def get_option_normal_sabr_loc_vol_expansion(f0, k, t, alpha, nu, rho, option_type):
+@nb.jit("f8(f8, f8, f8, f8, f8, f8, i8)", nopython=True, nogil=True)
+def get_option_normal_sabr_loc_vol_expansion_value(f0, k, t, alpha, nu, rho, is_call):
     x = np.array([f0])
     sigma_0 = LocalVolFunctionals.local_vol_normal_sabr(t, x, f0, alpha, rho, nu)[0]
     y = (k - f0) / (sigma_0 * np.sqrt(t))
@@ -86,12 +98,83 @@ def get_option_normal_sabr_loc_vol_expansion(f0, k, t, alpha, nu, rho, option_ty
     b_t = nu * nu * (y * y - 1.0) / 6.0
     c_t = 0.25 * np.power(nu * rho_inv, 2.0) + 0.125 * np.power(rho * nu, 2.0) * np.power(y*y - 1.0, 2.0)
 
-    if option_type == 'c':
+    if is_call == 1:
         return alpha * np.sqrt(t) * (g_y + phi_y * np.sqrt(t) * a_t + phi_y * t * (b_t + c_t))
     else:
         return alpha * np.sqrt(t) * (g_y + phi_y * np.sqrt(t) * a_t + phi_y * t * (b_t + c_t)) - (f0 - k)
 
 
+def get_option_normal_sabr_loc_vol_expansion(f0, k, t, alpha, nu, rho, option_type):
+    return get_option_normal_sabr_loc_vol_expansion_value(f0, k, t, alpha, nu, rho, 1 if option_type == 'c' else 0)
+
+
+# The grid versions below evaluate the expansions above for a matrix of parameters (one row [alpha, nu, rho] by set)
+# and a vector of strikes in one call, the output has one row by parameter set and one column by strike.
+@nb.jit("f8[:,:](f8, f8[:], f8, f8[:,:])", nopython=True, nogil=True, parallel=True)
+def get_quadratic_option_normal_sabr_watanabe_expansion_grid(f0, k, t, parameters):
+    no_parameters = parameters.shape[0]
+    no_strikes = len(k)
+    output = np.empty((no_parameters, no_strikes))
+
+    for i in nb.prange(0, no_parameters):
+        for j in range(0, no_strikes):
+            output[i, j] = get_quadratic_option_normal_sabr_watanabe_expansion(f0, k[j], t, parameters[i, 0],
+                                                                               parameters[i, 1], parameters[i, 2])
+
+    return output
+
+
+@nb.jit("f8[:,:](f8, f8[:], f8, f8[:,:], i8)", nopython=True, nogil=True, parallel=True)
+def get_option_normal_sabr_watanabe_expansion_grid(f0, k, t, parameters, is_call):
+    no_parameters = parameters.shape[0]
+    no_strikes = len(k)
+    output = np.empty((no_parameters, no_strikes))
+
+    for i in nb.prange(0, no_parameters):
+        for j in range(0, no_strikes):
+            output[i, j] = get_option_normal_sabr_watanabe_expansion_value(f0, k[j], t, parameters[i, 0],
+                                                                           parameters[i, 1], parameters[i, 2], is_call)
+
+    return output
+
+
+@nb.jit("f8[:,:](f8, f8[:], f8, f8[:,:])", nopython=True, nogil=True, parallel=True)
+def get_iv_normal_sabr_watanabe_expansion_grid(f0, k, t, parameters):
+    no_parameters = parameters.shape[0]
+    no_strikes = len(k)
+    output = np.empty((no_parameters, no_strikes))
+
+    for i in nb.prange(0, no_parameters):
+        for j in range(0, no_strikes):
+            output[i, j] = get_iv_normal_sabr_watanabe_expansion(f0, k[j], t, parameters[i, 0], parameters[i, 1],
+                                                                 parameters[i, 2])
+
+    return output
+
+
+@nb.jit("f8[:,:](f8, f8[:], f8, f8[:,:])", nopython=True, nogil=True, parallel=True)
+def get_iv_normal_lv_sabr_watanabe_expansion_grid(f0, k, t, parameters):
+    no_parameters = parameters.shape[0]
+    no_strikes = len(k)
+    output = np.empty((no_parameters, no_strikes))
+
+    for i in nb.prange(0, no_parameters):
+        for j in range(0, no_strikes):
+            output[i, j] = get_iv_normal_lv_sabr_watanabe_expansion(f0, k[j], t, parameters[i, 0], parameters[i, 1],
+                                                                    parameters[i, 2])
+
+    return output
+
 
+@nb.jit("f8[:,:](f8, f8[:], f8, f8[:,:], i8)", nopython=True, nogil=True, parallel=True)
+def get_option_normal_sabr_loc_vol_expansion_grid(f0, k, t, parameters, is_call):
+    no_parameters = parameters.shape[0]
+    no_strikes = len(k)
+    output = np.empty((no_parameters, no_strikes))
 
+    for i in nb.prange(0, no_parameters):
+        for j in range(0, no_strikes):
+            output[i, j] = get_option_normal_sabr_loc_vol_expansion_value(f0, k[j], t, parameters[i, 0],
+                                                                          parameters[i, 1], parameters[i, 2], is_call)
 
+    return output
@@ -14,6 +14,7 @@ __author__ = 'David Garcia Lorite'
 
 import numpy as np
 import numba as nb
+from functools import partial
 from typing import Callable
 from Tools import Types
 from AnalyticEngines.FourierMethod.COSMethod import COSBlocksOptions
@@ -27,10 +28,10 @@ def get_cos_estimation_density_jit(a: float, b: float, no_terms: int, no_x: int,
     beta = np.pi / (b - a)
     alpha = 2.0 / (b - a)
 
-    for i in range(0, no_terms):
+    for i in nb.prange(0, no_terms):
         f_k[i] = alpha * (cf_k[i] * np.exp(-1j * i * a * beta)).real
 
-    for i in range(0, no_x):
+    for i in nb.prange(0, no_x):
         b_k = 1.0
         output[i] = 0.5 * f_k[0] * b_k
         for j in range(1, no_terms):
@@ -50,7 +51,7 @@ def get_cos_density(a: float, b: float, no_terms: int, cf: Callable[[Types.ndarr
 def get_cos_coefficients_jit(a: float, b: float, no_terms: int, cf_k: Types.ndarray):
     a_k = np.zeros(no_terms, dtype=np.complex_)
     beta = np.pi / (b - a)
-    for i in range(0, no_terms):
+    for i in nb.prange(0, no_terms):
         a_k[i] = cf_k[i] * np.exp(-1j * i * a * beta)
 
     return a_k
@@ -62,34 +63,143 @@ def apply_adjustment_strike_cf(a_k: Types.ndarray, v_k: Types.ndarray, k_s: Type
     no_strikes = len(strikes)
     prices = np.zeros(no_strikes)
     log_strikes = np.log(strikes)
+    delta_k_s = k_s[1] - k_s[0] if no_terms > 1 else 0.0
 
-    for i in range(0, no_strikes):
-        prices[i] = 0.5 * (a_k[0] * np.exp(- 1j * k_s[0] * log_strikes[i])).real * v_k[0]
+    # The frequencies k_s are equally spaced, so exp(- i k_s[j] log(K)) is computed by recurrence in j.
+    for i in nb.prange(0, no_strikes):
+        exp_k_s = np.exp(- 1j * k_s[0] * log_strikes[i])
+        shift = np.exp(- 1j * delta_k_s * log_strikes[i])
+        prices[i] = 0.5 * (a_k[0] * exp_k_s).real * v_k[0]
         for j in range(1, no_terms):
-            prices[i] += (a_k[j] * np.exp(- 1j * k_s[j] * log_strikes[i])).real * v_k[j]
+            exp_k_s *= shift
+            prices[i] += (a_k[j] * exp_k_s).real * v_k[j]
 
     return prices * strikes
 
 
+@nb.jit("c16[:,:](f8,i8,f8[:])", nopython=True, nogil=True, parallel=True)
+def get_strike_adjustment_matrix(beta: float, no_terms: int, strikes: Types.ndarray):
+    # Matrix exp(- i k beta log(K)) with k = 0,...,no_terms-1 by row and one column by strike.
+    no_strikes = len(strikes)
+    output = np.empty((no_terms, no_strikes), dtype=np.complex128)
+
+    for i in nb.prange(0, no_strikes):
+        shift = np.exp(- 1j * beta * np.log(strikes[i]))
+        output[0, i] = 1.0
+        for j in range(1, no_terms):
+            output[j, i] = output[j - 1, i] * shift
+
+    return output
+
+
 def get_european_option_price(option_type: TypeEuropeanOption, a: float, b: float, no_terms: int,
                               strikes: Types.ndarray, cf: Callable[[Types.ndarray], Types.ndarray]):
     k_s = np.arange(0, no_terms, 1) * (np.pi / (b - a))
     cf_k = cf(k_s)
     a_k = get_cos_coefficients_jit(a, b, no_terms, cf_k)
+    v_k = get_payoff_coefficients(option_type, a, b, no_terms)
+    return apply_adjustment_strike_cf(a_k, v_k, k_s, strikes, no_terms)
+
 
+def get_payoff_coefficients(option_type: TypeEuropeanOption, a: float, b: float, no_terms: int):
     if option_type == TypeEuropeanOption.CALL:
         chi_k_s = COSBlocksOptions.call_put_block(a, b, 0.0, b, no_terms)
         phi_k_s = COSBlocksOptions.digital_block(a, b, 0.0, b, no_terms)
-        v_k = (2.0 / (b - a)) * (chi_k_s - phi_k_s)
-        return apply_adjustment_strike_cf(a_k, v_k, k_s, strikes, no_terms)
-
+        return (2.0 / (b - a)) * (chi_k_s - phi_k_s)
     else:
         chi_k_s = COSBlocksOptions.call_put_block(a, b, a, 0.0, no_terms)
         phi_k_s = COSBlocksOptions.digital_block(a, b, a, 0.0, no_terms)
-        v_k = (2.0 / (b - a)) * (- chi_k_s + phi_k_s)
-        return apply_adjustment_strike_cf(a_k, v_k, k_s, strikes, no_terms)
+        return (2.0 / (b - a)) * (- chi_k_s + phi_k_s)
 
 
+def get_european_option_price_surface(option_type: TypeEuropeanOption, a: float, b: float, no_terms: int,
+                                      strikes: Types.ndarray, maturities: Types.ndarray,
+                                      cf: Callable[[Types.ndarray, float], Types.ndarray]):
+    # cf(w, t) is the characteristic function of log(S_t) (for instance a partial of get_trap_cf without t). The
+    # output is the matrix of prices with one row by maturity and one column by strike, the whole surface is
+    # computed with one complex matrix product. In calibration loops cf can be a CachedCharesticFunction, so the cf
+    # values are shared with the other pricers that use the same cache.
+    no_maturities = len(maturities)
+    beta = np.pi / (b - a)
+    k_s = np.arange(0, no_terms, 1) * beta
+    v_k = get_payoff_coefficients(option_type, a, b, no_terms)
+    v_k[0] *= 0.5
+
+    a_k_v_k = np.empty((no_maturities, no_terms), dtype=np.complex128)
+    for i in range(0, no_maturities):
+        a_k_v_k[i] = get_cos_coefficients_jit(a, b, no_terms, cf(k_s, t=maturities[i])) * v_k
 
+    exp_k_s = get_strike_adjustment_matrix(beta, no_terms, strikes)
 
+    return np.dot(a_k_v_k, exp_k_s).real * strikes
 
+
+def get_cumulants(cf: Callable[[Types.ndarray], Types.ndarray], h: float = 1e-02):
+    # First, second and fourth cumulants of log(S_t) from finite differences of log(cf) at zero, c_n is the real part
+    # of (-i)^n times the n-th derivative.
+    log_cf = np.log(cf(h * np.arange(-2.0, 3.0, 1.0)))
+    d_1 = (log_cf[0] - 8.0 * log_cf[1] + 8.0 * log_cf[3] - log_cf[4]) / (12.0 * h)
+    d_2 = (- log_cf[0] + 16.0 * log_cf[1] - 30.0 * log_cf[2] + 16.0 * log_cf[3] - log_cf[4]) / (12.0 * h * h)
+    d_4 = (log_cf[0] - 4.0 * log_cf[1] + 6.0 * log_cf[2] - 4.0 * log_cf[3] + log_cf[4]) / (h * h * h * h)
+    return d_1.imag, - d_2.real, d_4.real
+
+
+def get_truncation_range(cf: Callable[[Types.ndarray], Types.ndarray], strikes: Types.ndarray, l: float = 10.0):
+    # Fang and Oosterlee's interval c_1 -/+ l * sqrt(c_2 + sqrt(c_4)) for log(S_t), shifted by the log-strikes because
+    # the COS expansion is in log(S_t / K). The interval always contains zero, where the payoff has its kink.
+    c_1, c_2, c_4 = get_cumulants(cf)
+    width = l * np.sqrt(np.abs(c_2) + np.sqrt(np.abs(c_4)))
+    log_strikes = np.log(strikes)
+    a = min(c_1 - np.max(log_strikes) - width, 0.0)
+    b = max(c_1 - np.min(log_strikes) + width, 0.0)
+    return a, b
+
+
+def get_no_terms(cf: Callable[[Types.ndarray], Types.ndarray], a: float, b: float, tolerance: float = 1e-08,
+                 min_terms: int = 16, max_terms: int = 2 ** 14):
+    # The number of terms is doubled until the tail of the cos coefficients |cf(k pi / (b - a))| is below the
+    # tolerance. The coefficients of the payoff are bounded, so the tail bounds the error of the price.
+    beta = np.pi / (b - a)
+    no_terms = min_terms
+    while no_terms < max_terms:
+        cf_k = cf(np.arange(no_terms, 2 * no_terms, 1) * beta)
+        if (2.0 / (b - a)) * np.sum(np.abs(cf_k)) < tolerance:
+            break
+        no_terms *= 2
+
+    return min(no_terms, max_terms)
+
+
+def get_european_option_price_adaptive(option_type: TypeEuropeanOption, strikes: Types.ndarray,
+                                       cf: Callable[[Types.ndarray], Types.ndarray], tolerance: float = 1e-08,
+                                       l: float = 10.0, min_terms: int = 16, max_terms: int = 2 ** 14):
+    # get_european_option_price with the truncation range from the cumulants of cf and the number of terms from the
+    # decay of the coefficients, so each model and maturity uses the minimum number of terms. The tolerance is in
+    # units of price, the prices are the strike times the cos expansion. The calls are computed from the puts and the
+    # put-call parity with the forward cf(-i), because the call coefficients amplify the truncation error of the right
+    # tail by exp(b).
+    strikes = np.asarray(strikes, dtype=float)
+    a, b = get_truncation_range(cf, strikes, l)
+    no_terms = get_no_terms(cf, a, b, tolerance / np.max(strikes), min_terms, max_terms)
+    put_prices = get_european_option_price(TypeEuropeanOption.PUT, a, b, no_terms, strikes, cf)
+
+    if option_type == TypeEuropeanOption.CALL:
+        forward = cf(np.array([-1j]))[0].real
+        return put_prices + forward - strikes
+    else:
+        return put_prices
+
+
+def get_european_option_price_surface_adaptive(option_type: TypeEuropeanOption, strikes: Types.ndarray,
+                                               maturities: Types.ndarray,
+                                               cf: Callable[[Types.ndarray, float], Types.ndarray],
+                                               tolerance: float = 1e-08, l: float = 10.0, min_terms: int = 16,
+                                               max_terms: int = 2 ** 14):
+    # cf(w, t) as in get_european_option_price_surface, the range and the number of terms are chosen by maturity.
+    no_maturities = len(maturities)
+    prices = np.empty((no_maturities, len(strikes)))
+    for i in range(0, no_maturities):
+        prices[i] = get_european_option_price_adaptive(option_type, strikes, partial(cf, t=maturities[i]), tolerance,
+                                                       l, min_terms, max_terms)
+
+    return prices
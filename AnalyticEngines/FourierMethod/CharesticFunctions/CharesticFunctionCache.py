@@ -0,0 +1,98 @@
+__author__ = 'David Garcia Lorite'
+
+#
+# Copyright 2020 David Garcia Lorite
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+import hashlib
+import numpy as np
+
+from collections import OrderedDict
+from typing import Callable
+from Tools.Types import ndarray
+
+
+class CharesticFunctionCache(object):
+    # LRU cache of the values of a characteristic function. The key is the function, a hash of the frequency grid and
+    # the parameters (maturity included), so the same evaluation is shared by strikes, greeks and repeated points of
+    # a calibration. The cached arrays must not be modified by the caller.
+    def __init__(self, max_size: int = 128):
+        self._max_size = max_size
+        self._values = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    def __len__(self):
+        return len(self._values)
+
+    def clear(self):
+        self._values.clear()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def get_key(cf: Callable, w: ndarray, parameters: dict):
+        grid_hash = hashlib.sha1(w.view(np.uint8)).hexdigest()
+        cf_id = (getattr(cf, '__module__', None), getattr(cf, '__name__', id(cf)))
+        return cf_id, w.dtype.str, w.shape, grid_hash, tuple(sorted(parameters.items()))
+
+    def get_value(self, cf: Callable, w: ndarray, **parameters) -> ndarray:
+        w = np.ascontiguousarray(w)
+        key = self.get_key(cf, w, parameters)
+
+        if key in self._values:
+            self._hits += 1
+            self._values.move_to_end(key)
+            return self._values[key]
+
+        self._misses += 1
+        value = cf(w, **parameters)
+        self._values[key] = value
+
+        if len(self._values) > self._max_size:
+            self._values.popitem(last=False)
+
+        return value
+
+
+# Cache shared by default by the COS and analytic Heston pricers.
+cf_cache = CharesticFunctionCache()
+
+
+class CachedCharesticFunction(object):
+    # Replacement of partial(cf, **parameters) whose evaluations go through a CharesticFunctionCache. The extra keyword
+    # arguments of the call (for instance t in the surface pricers) are added to the parameters.
+    def __init__(self,
+                 cf: Callable,
+                 cache: CharesticFunctionCache = None,
+                 **parameters):
+        self._cf = cf
+        self._cache = cf_cache if cache is None else cache
+        self._parameters = parameters
+
+    @property
+    def cache(self):
+        return self._cache
+
+    def __call__(self, w: ndarray, **kwargs) -> ndarray:
+        return self._cache.get_value(self._cf, w, **{**self._parameters, **kwargs})
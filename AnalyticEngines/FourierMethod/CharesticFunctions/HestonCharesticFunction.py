@@ -16,7 +16,8 @@ import numba as nb
 import numpy as np
 
 
-@nb.jit("c16[:](f8[:], f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)", nopython=True, nogil=True)
+@nb.jit(["c16[:](f8[:], f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)",
+         "c16[:](c16[:], f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)"], nopython=True, nogil=True)
 def get_cf(w, t, x, v, r_t, theta, rho, k, epsilon, b, u):
     a = k * theta
 
@@ -37,7 +38,8 @@ def get_cf(w, t, x, v, r_t, theta, rho, k, epsilon, b, u):
     return np.exp(c_t + d_t * v + 1j * w * x)
 
 
-@nb.jit("c16[:](f8[:], f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)", nopython=True, nogil=True)
+@nb.jit(["c16[:](f8[:], f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)",
+         "c16[:](c16[:], f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)"], nopython=True, nogil=True)
 def get_trap_cf(w, t, x, v, r_t, theta, rho, k, epsilon, b, u):
     a = k * theta
 
@@ -57,6 +59,61 @@ def get_trap_cf(w, t, x, v, r_t, theta, rho, k, epsilon, b, u):
     return np.exp(c_t + d_t * v + 1j * w * x)
 
 
+@nb.jit("c16[:,:](f8[:], f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)", nopython=True, nogil=True)
+def get_trap_cf_gradient(w, t, x, v, r_t, theta, rho, k, epsilon, b, u):
+    # Derivatives of log(get_trap_cf) respect to (v, theta, rho, k, epsilon), one row by parameter. We suppose that
+    # b = k + lambda, so the derivative of b respect to k is one.
+    no_w = len(w)
+    output = np.empty((5, no_w), dtype=np.complex128)
+    a = k * theta
+    var = epsilon * epsilon
+
+    p = u * 1j * w - 0.5 * w * w
+    q = b - rho * epsilon * 1j * w
+    d = np.sqrt(q * q - 2.0 * p * var)
+    c = (q - d) / (q + d)
+    e = np.exp(- d * t)
+    n_t = 1.0 - e
+    m_t = 1.0 - c * e
+    l_t = (q - d) / var
+    d_t = (n_t / m_t) * l_t
+    c_t = (q - d) * t - 2.0 * (np.log(m_t) - np.log(1.0 - c))
+
+    # derivative of log(cf) respect to v
+    output[0, :] = d_t
+
+    # derivative respect to theta
+    output[1, :] = (k / var) * c_t
+
+    # rho, k and epsilon change q (and epsilon the variance), we apply the chain rule through d, c and exp(- d t)
+    for j in range(0, 3):
+        if j == 0:
+            d_q = - epsilon * 1j * w
+            d_eps = 0.0
+            d_a = 0.0
+        elif j == 1:
+            d_q = np.ones(no_w, dtype=np.complex128)
+            d_eps = 0.0
+            d_a = theta
+        else:
+            d_q = - rho * 1j * w
+            d_eps = 1.0
+            d_a = 0.0
+
+        d_d = (q * d_q - 2.0 * p * epsilon * d_eps) / d
+        d_c = 2.0 * (d * d_q - q * d_d) / ((q + d) * (q + d))
+        d_e = - t * e * d_d
+        d_m_t = - (d_c * e + c * d_e)
+        d_l_t = (d_q - d_d) / var - 2.0 * l_t * d_eps / epsilon
+        d_d_t = (- d_e / m_t - n_t * d_m_t / (m_t * m_t)) * l_t + (n_t / m_t) * d_l_t
+        d_c_t = (d_q - d_d) * t - 2.0 * (d_m_t / m_t + d_c / (1.0 - c))
+        d_a_var = d_a / var - 2.0 * a * d_eps / (var * epsilon)
+
+        output[2 + j, :] = d_a_var * c_t + (a / var) * d_c_t + d_d_t * v
+
+    return output
+
+
 # nb.jit("f8[:](f8[:], f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)", nopython=True, nogil=True)
 def f_heston(w, t, x, v, r_t, theta, rho, k, epsilon, b, u, strike):
     k_log = np.log(strike)
@@ -19,17 +19,20 @@ from scipy.special import gamma
 
 
 # We suppose that the distributions of the jumps is exp(N(jumpmean, jumpstd))
-@nb.jit("c16[:](f8[:], f8, f8, f8, f8, f8, f8)", nopython=True, nogil=True)
+@nb.jit(["c16[:](f8[:], f8, f8, f8, f8, f8, f8)",
+         "c16[:](c16[:], f8, f8, f8, f8, f8, f8)"], nopython=True, nogil=True)
 def get_merton_cf(w, t, x, sigma, jumpmean, jumpstd, lambda_t):
     jumpmean_transform = jumpmean - 0.5 * jumpstd * jumpstd
     alpha = (np.exp(jumpmean_transform + 0.5 * jumpstd * jumpstd) - 1.0) * lambda_t * t
     x_i_u = (x - 0.5 * sigma * sigma * t) * 1j * w
     x_u = - 0.5 * np.power(w * sigma, 2.0) * t
-    nu_t = (np.exp((1j * w * jumpmean_transform - 0.5 * np.power(w * jumpstd, 2.0))) - 1.0) * lambda_t * t - alpha
+    nu_t = (np.exp((1j * w * jumpmean_transform - 0.5 * np.power(w * jumpstd, 2.0))) - 1.0) * lambda_t * t - \
+        1j * w * alpha
     return np.exp(x_i_u + x_u + nu_t)
 
 
-@nb.jit("c16[:](f8[:], f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)", nopython=True, nogil=True)
+@nb.jit(["c16[:](f8[:], f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)",
+         "c16[:](c16[:], f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)"], nopython=True, nogil=True)
 def get_bates_cf(w, t, x, v, r_t, theta, rho, k, epsilon, jump_mean, jump_std, jump_intensity, b, u):
     a = k * theta
 
@@ -54,6 +57,22 @@ def get_bates_cf(w, t, x, v, r_t, theta, rho, k, epsilon, jump_mean, jump_std, j
     return np.exp(jump_term+c_t + d_t * v + 1j * w * x)
 
 
+@nb.jit("c16[:,:](f8[:], f8, f8, f8, f8)", nopython=True, nogil=True)
+def get_bates_jump_gradient(w, t, jump_mean, jump_std, jump_intensity):
+    # Derivatives of the jump term of log(get_bates_cf) respect to (jump_mean, jump_std, jump_intensity), one row by
+    # parameter. The derivatives respect to the Heston parameters are the ones of get_trap_cf_gradient.
+    output = np.empty((3, len(w)), dtype=np.complex128)
+    jump_var = 0.5 * jump_std * jump_std
+    aux_jump1 = np.exp(jump_mean + jump_var)
+    aux_jump2 = np.exp(jump_mean * 1j * w - jump_var * w * w)
+
+    output[0, :] = jump_intensity * t * (1j * w * aux_jump2 - 1j * w * aux_jump1)
+    output[1, :] = jump_intensity * t * jump_std * (- w * w * aux_jump2 - 1j * w * aux_jump1)
+    output[2, :] = t * ((aux_jump2 - 1.0) - 1j * w * (aux_jump1 - 1.0))
+
+    return output
+
+
 # @nb.jit("c16(c16, f8, f8, f8, f8, f8, f8)", nopython=True, nogil=True)
 def h_bates_lewis(w, v, t, k, theta, epsilon, rho):
     var = epsilon * epsilon
@@ -80,7 +99,8 @@ def f_lewis_bate(w, t, spot, v, r_t, theta, rho, k, epsilon, lambda_jump, mu_jum
     return value.real
 
 
-@nb.jit("f8(c16, f8, f8, f8, f8, f8, f8, f8, f8)", nopython=True, nogil=True)
+@nb.jit(["c16[:](f8[:], f8, f8, f8, f8, f8, f8, f8, f8)",
+         "c16[:](c16[:], f8, f8, f8, f8, f8, f8, f8, f8)"], nopython=True, nogil=True)
 def get_CGMYB_cf(w, t, x, r, sigma, C, G, M, Y):
     var = sigma*sigma
     aux = np.power((M-1), Y) - np.power(M, Y) + np.power((G+1), Y) - np.power(G, Y)
@@ -89,12 +109,11 @@ def get_CGMYB_cf(w, t, x, r, sigma, C, G, M, Y):
     mu = r - 0.5 * var + wbar
     phi = np.exp(C * t * gamma(-Y) * aux2)
 
-    value = np.exp(1j * w * (x + mu * t) - 0.5 * var * w * w * t) * phi
-
-    return value.real
+    return np.exp(1j * w * (x + mu * t) - 0.5 * var * w * w * t) * phi
 
 
-@nb.jit("c16[:](f8[:], f8, f8, f8, f8, f8, f8,f8)", nopython=True, nogil=True)
+@nb.jit(["c16[:](f8[:], f8, f8, f8, f8, f8, f8, f8)",
+         "c16[:](c16[:], f8, f8, f8, f8, f8, f8, f8)"], nopython=True, nogil=True)
 def get_NIGB_cf(w, t, x, r, sigma, alpha, beta, delta):
     var = sigma*sigma
     alpha2 = alpha*alpha
@@ -109,7 +128,8 @@ def get_NIGB_cf(w, t, x, r, sigma, alpha, beta, delta):
     return np.exp(1j * w * x + 1j * w * mu * t - 0.5 * var * w * w * t) * phi
 
 
-@nb.jit("c16[:](f8[:],f8, f8, f8, f8, f8, f8)", nopython=True, nogil=True)
+@nb.jit(["c16[:](f8[:], f8, f8, f8, f8, f8, f8)",
+         "c16[:](c16[:], f8, f8, f8, f8, f8, f8)"], nopython=True, nogil=True)
 def get_VG_cf(w, t, x, r, sigma, beta, theta):
     var = sigma*sigma
     wbar = (1/beta) * np.log(1-beta*(theta + 0.5*var))
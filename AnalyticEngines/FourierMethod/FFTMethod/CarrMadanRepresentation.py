@@ -0,0 +1,104 @@
+__author__ = 'David Garcia Lorite'
+
+#
+# Copyright 2020 David Garcia Lorite
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+import numpy as np
+import numba as nb
+
+from typing import Callable
+from scipy.interpolate import interp1d
+from Tools import Types
+from Instruments.EuropeanInstruments import TypeEuropeanOption
+
+
+@nb.jit("f8[:](i8)", nopython=True, nogil=True)
+def get_simpson_weights(no_terms: int):
+    weights = np.empty(no_terms)
+    for i in range(0, no_terms):
+        weights[i] = (3.0 + (-1.0) ** (i + 1)) / 3.0
+    weights[0] = 1.0 / 3.0
+    return weights
+
+
+@nb.jit("c16[:](c16[:],f8[:],f8,f8)", nopython=True, nogil=True)
+def get_damped_cf(cf_v: Types.ndarray, v: Types.ndarray, alpha: float, eta: float):
+    # Fourier transform of the damped call price exp(alpha k) C(k) (Carr-Madan), the cf is evaluated at v-(alpha+1)i.
+    no_terms = len(v)
+    weights = get_simpson_weights(no_terms)
+    psi = np.empty(no_terms, dtype=np.complex128)
+    for i in range(0, no_terms):
+        psi[i] = eta * weights[i] * cf_v[i] / (alpha * alpha + alpha - v[i] * v[i] + 1j * (2.0 * alpha + 1.0) * v[i])
+    return psi
+
+
+def get_fractional_fft(x: Types.ndarray, zeta: float):
+    # sum_j x_j exp(-2 pi i zeta j u) for u = 0,...,n-1 with three FFT of size 2n (Bailey and Swarztrauber).
+    n = len(x)
+    j_2 = np.power(np.arange(0, n), 2.0)
+    y = np.concatenate((x * np.exp(- 1j * np.pi * zeta * j_2), np.zeros(n)))
+    z = np.concatenate((np.exp(1j * np.pi * zeta * j_2), np.exp(1j * np.pi * zeta * np.power(n - np.arange(0, n), 2.0))))
+    return np.exp(- 1j * np.pi * zeta * j_2) * np.fft.ifft(np.fft.fft(y) * np.fft.fft(z))[0:n]
+
+
+def get_call_price_grid(cf: Callable[[Types.ndarray], Types.ndarray], no_terms: int, eta: float, alpha: float,
+                        log_strike_center: float, delta_log_strike: float = None):
+    # Undiscounted call prices on the log-strike grid log_strike_center + delta_log_strike * (u - no_terms / 2). If
+    # delta_log_strike is None, we use the FFT with delta_log_strike = 2 pi / (no_terms * eta), otherwise the
+    # fractional FFT, which decouples the strike spacing from the frequency spacing.
+    v = eta * np.arange(0, no_terms)
+
+    if delta_log_strike is None:
+        delta_log_strike = 2.0 * np.pi / (no_terms * eta)
+
+    k_min = log_strike_center - 0.5 * no_terms * delta_log_strike
+    log_strikes = k_min + delta_log_strike * np.arange(0, no_terms)
+
+    psi = get_damped_cf(cf(v - (alpha + 1.0) * 1j), v, alpha, eta) * np.exp(- 1j * v * k_min)
+    zeta = eta * delta_log_strike / (2.0 * np.pi)
+
+    if np.abs(zeta * no_terms - 1.0) < 1e-12:
+        transform = np.fft.fft(psi)
+    else:
+        transform = get_fractional_fft(psi, zeta)
+
+    return log_strikes, np.exp(- alpha * log_strikes) * transform.real / np.pi
+
+
+def get_european_option_price(option_type: TypeEuropeanOption, strikes: Types.ndarray,
+                              cf: Callable[[Types.ndarray], Types.ndarray], no_terms: int = 4096, eta: float = 0.25,
+                              alpha: float = 1.5, delta_log_strike: float = None):
+    # cf is the characteristic function of log(S_t) and it must accept complex frequencies. The prices are undiscounted
+    # as in COSRepresentation.get_european_option_price and they are interpolated from the log-strike grid.
+    log_strikes = np.log(strikes)
+    log_strike_center = 0.5 * (np.min(log_strikes) + np.max(log_strikes))
+    grid, prices = get_call_price_grid(cf, no_terms, eta, alpha, log_strike_center, delta_log_strike)
+    call_prices = interp1d(grid, prices, kind='cubic')(log_strikes)
+
+    if option_type == TypeEuropeanOption.CALL:
+        return call_prices
+    else:
+        forward = cf(np.array([- 1j]))[0].real
+        return call_prices - (forward - strikes)
+
+
+def get_european_option_price_surface(option_type: TypeEuropeanOption, strikes: Types.ndarray,
+                                      maturities: Types.ndarray, cf: Callable[[Types.ndarray, float], Types.ndarray],
+                                      no_terms: int = 4096, eta: float = 0.25, alpha: float = 1.5,
+                                      delta_log_strike: float = None):
+    # One FFT by maturity, cf(w, t) as in COSRepresentation.get_european_option_price_surface.
+    no_maturities = len(maturities)
+    prices = np.empty((no_maturities, len(strikes)))
+    for i in range(0, no_maturities):
+        prices[i] = get_european_option_price(option_type, strikes, lambda w: cf(w, t=maturities[i]), no_terms, eta,
+                                              alpha, delta_log_strike)
+    return prices
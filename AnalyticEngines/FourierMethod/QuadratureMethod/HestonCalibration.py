@@ -0,0 +1,146 @@
+__author__ = 'David Garcia Lorite'
+
+#
+# Copyright 2020 David Garcia Lorite
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+import numpy as np
+
+from AnalyticEngines.FourierMethod.CharesticFunctions.HestonCharesticFunction import get_trap_cf, get_trap_cf_gradient
+from AnalyticEngines.FourierMethod.CharesticFunctions.JumpDiffusionCharesticFunction import get_bates_cf, \
+    get_bates_jump_gradient
+from AnalyticEngines.FourierMethod.QuadratureMethod.HestonQuadrature import get_quadrature_nodes
+from Tools.AnalyticTools import bs_price, bs_vega
+from Tools.Types import ndarray, QUADRATURE_TYPE, CALIBRATION_MODEL
+
+# The parameters are [v0, theta, rho, k, epsilon] for Heston and [v0, theta, rho, k, epsilon, jump_mean, jump_std,
+# jump_intensity] for Bates.
+HESTON_LOWER_BOUNDS = np.array([1e-06, 1e-06, -0.999, 1e-04, 1e-04])
+HESTON_UPPER_BOUNDS = np.array([5.0, 5.0, 0.999, 20.0, 5.0])
+BATES_LOWER_BOUNDS = np.append(HESTON_LOWER_BOUNDS, [-2.0, 1e-04, 0.0])
+BATES_UPPER_BOUNDS = np.append(HESTON_UPPER_BOUNDS, [2.0, 2.0, 10.0])
+
+
+def get_bounds(model: CALIBRATION_MODEL):
+    if model == CALIBRATION_MODEL.HESTON:
+        return HESTON_LOWER_BOUNDS, HESTON_UPPER_BOUNDS
+    elif model == CALIBRATION_MODEL.BATES:
+        return BATES_LOWER_BOUNDS, BATES_UPPER_BOUNDS
+    else:
+        raise Exception("The calibration model " + str(model) + " is unknown.")
+
+
+def get_cf_and_gradient(model: CALIBRATION_MODEL, w: ndarray, t: float, x: float, r: float, parameters: ndarray):
+    v0, theta, rho, k, epsilon = parameters[0:5]
+    gradient = get_trap_cf_gradient(w, t, x, v0, r, theta, rho, k, epsilon, k, -0.5)
+
+    if model == CALIBRATION_MODEL.HESTON:
+        cf_w = get_trap_cf(w, t, x, v0, r, theta, rho, k, epsilon, k, -0.5)
+    else:
+        jump_mean, jump_std, jump_intensity = parameters[5:8]
+        cf_w = get_bates_cf(w, t, x, v0, r, theta, rho, k, epsilon, jump_mean, jump_std, jump_intensity, k, -0.5)
+        gradient = np.vstack((gradient, get_bates_jump_gradient(w, t, jump_mean, jump_std, jump_intensity)))
+
+    return cf_w, gradient
+
+
+def get_call_prices_and_jacobian(model: CALIBRATION_MODEL, spot: float, strikes: ndarray, maturities: ndarray,
+                                 r: float, parameters: ndarray, w: ndarray, weights: ndarray):
+    # Attari's representation of the call prices on the grid (maturities x strikes) and their derivatives respect to
+    # the parameters. The price is linear in the cf, so the derivatives are the same integrals with the cf replaced by
+    # cf * d log(cf) / d parameter. By maturity, all strikes and parameters are done with two matrix products.
+    no_maturities = len(maturities)
+    no_strikes = len(strikes)
+    no_parameters = len(parameters)
+    x = np.log(spot)
+    den = weights / (1.0 + w * w)
+
+    prices = np.empty((no_maturities, no_strikes))
+    jacobian = np.empty((no_maturities, no_strikes, no_parameters))
+
+    for i in range(0, no_maturities):
+        t = maturities[i]
+        df = np.exp(- r * t)
+        cf_w, gradient = get_cf_and_gradient(model, w, t, x, r, parameters)
+        phi2 = cf_w * np.exp(- 1j * w * (x + r * t))
+        phi2_s = np.vstack((phi2, phi2 * gradient))
+
+        a_u = (phi2_s.real + phi2_s.imag / w) * den
+        b_u = (phi2_s.imag - phi2_s.real / w) * den
+        w_l = np.outer(np.log(df * strikes / spot), w)
+        integrals = np.dot(np.cos(w_l), a_u.T) + np.dot(np.sin(w_l), b_u.T)
+
+        scale = strikes * df / np.pi
+        prices[i] = spot - 0.5 * strikes * df - scale * integrals[:, 0]
+        jacobian[i] = - scale[:, None] * integrals[:, 1:]
+
+    return prices, jacobian
+
+
+def get_calibration(model: CALIBRATION_MODEL, spot: float, strikes: ndarray, maturities: ndarray, r: float,
+                    market_vols: ndarray, initial_parameters: ndarray, max_iterations: int = 100,
+                    tolerance: float = 1e-10, quadrature_type: QUADRATURE_TYPE = QUADRATURE_TYPE.GAUSS_LEGENDRE,
+                    no_nodes: int = 128, upper_bound: float = 200.0):
+    # Levenberg-Marquardt fit of the model to the implied vol surface market_vols (maturities x strikes), the nan
+    # values are not quoted. The residuals are the differences of call prices divided by the market vega, which is
+    # the first order approximation of the error in vol, and the jacobian is analytic. The output is the calibrated
+    # parameters, the rmse of the residuals and the number of iterations.
+    lower_bounds, upper_bounds = get_bounds(model)
+    if len(initial_parameters) != len(lower_bounds):
+        raise Exception("The model " + str(model) + " needs " + str(len(lower_bounds)) + " parameters.")
+
+    w, weights = get_quadrature_nodes(quadrature_type, no_nodes, upper_bound)
+    strikes = np.asarray(strikes, dtype=float)
+    maturities = np.asarray(maturities, dtype=float)
+    quoted = ~np.isnan(market_vols)
+
+    t_s = np.repeat(maturities, len(strikes)).reshape(market_vols.shape)[quoted]
+    k_s = np.tile(strikes, len(maturities)).reshape(market_vols.shape)[quoted]
+    df_s = np.exp(- r * t_s)
+    f_s = spot / df_s
+    market_prices = df_s * bs_price(f_s, k_s, t_s, market_vols[quoted], 1)
+    vegas = np.maximum(df_s * bs_vega(f_s, k_s, t_s, market_vols[quoted]), 1e-08)
+
+    def get_residuals(parameters: ndarray):
+        prices, jacobian = get_call_prices_and_jacobian(model, spot, strikes, maturities, r, parameters, w, weights)
+        return (prices[quoted] - market_prices) / vegas, jacobian[quoted] / vegas[:, None]
+
+    parameters = np.clip(np.asarray(initial_parameters, dtype=float), lower_bounds, upper_bounds)
+    residuals, jacobian = get_residuals(parameters)
+    cost = np.dot(residuals, residuals)
+    mu = 1e-03
+    no_iterations = 0
+
+    while no_iterations < max_iterations:
+        no_iterations += 1
+        j_t_j = np.dot(jacobian.T, jacobian)
+        gradient = np.dot(jacobian.T, residuals)
+        if np.max(np.abs(gradient)) < tolerance:
+            break
+
+        # The damping is scaled by the diagonal of J^T J, so the step does not depend on the units of the parameters.
+        step = np.linalg.solve(j_t_j + mu * np.diag(np.diag(j_t_j) + 1e-12), - gradient)
+        new_parameters = np.clip(parameters + step, lower_bounds, upper_bounds)
+        new_residuals, new_jacobian = get_residuals(new_parameters)
+        new_cost = np.dot(new_residuals, new_residuals)
+
+        if new_cost < cost:
+            converged = (cost - new_cost) < tolerance * cost
+            parameters, residuals, jacobian, cost = new_parameters, new_residuals, new_jacobian, new_cost
+            mu = max(mu / 3.0, 1e-12)
+            if converged:
+                break
+        else:
+            mu *= 2.0
+            if mu > 1e12:
+                break
+
+    return parameters, np.sqrt(cost / len(residuals)), no_iterations
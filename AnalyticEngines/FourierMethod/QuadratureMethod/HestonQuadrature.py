@@ -0,0 +1,122 @@
+__author__ = 'David Garcia Lorite'
+
+#
+# Copyright 2020 David Garcia Lorite
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+import numpy as np
+
+from functools import lru_cache
+from scipy.special import roots_laguerre, roots_legendre
+from AnalyticEngines.FourierMethod.CharesticFunctions.HestonCharesticFunction import get_trap_cf
+from AnalyticEngines.FourierMethod.CharesticFunctions.CharesticFunctionCache import CharesticFunctionCache, cf_cache
+from Tools.Types import ndarray, TypeEuropeanOption, TypeGreeks, QUADRATURE_TYPE
+
+
+@lru_cache(maxsize=32)
+def get_quadrature_nodes(quadrature_type: QUADRATURE_TYPE, no_nodes: int, upper_bound: float):
+    # Nodes and weights to integrate on [0, inf). The Gauss-Laguerre weights include the factor exp(x) and
+    # upper_bound is only used by the truncated Gauss-Legendre rule on [0, upper_bound].
+    if quadrature_type == QUADRATURE_TYPE.GAUSS_LAGUERRE:
+        nodes, weights = roots_laguerre(no_nodes)
+        weights = weights * np.exp(nodes)
+    elif quadrature_type == QUADRATURE_TYPE.GAUSS_LEGENDRE:
+        nodes, weights = roots_legendre(no_nodes)
+        nodes = 0.5 * upper_bound * (nodes + 1.0)
+        weights = 0.5 * upper_bound * weights
+    else:
+        raise Exception("The quadrature " + str(quadrature_type) + " is unknown.")
+
+    return nodes, weights
+
+
+def get_attari_integrals(phi2: ndarray, w: ndarray, weights: ndarray, l: ndarray, spot: float, strikes: ndarray):
+    # Integrals of f_attari_heston, f_delta_attari_heston, f_dual_delta_attari_heston and f_gamma_attari_heston for
+    # all the strikes at once, phi2 is the cf of log(S_t / S_0) - r t on the nodes w.
+    r2_u = phi2.real
+    i2_u = phi2.imag
+    a_u = r2_u + i2_u / w
+    b_u = i2_u - r2_u / w
+    w_l = np.outer(l, w)
+    cos_w_l = np.cos(w_l)
+    sin_w_l = np.sin(w_l)
+    den = 1.0 + w * w
+
+    integral = np.dot(a_u * cos_w_l + b_u * sin_w_l, weights / den)
+    int_delta = np.dot((a_u * sin_w_l - b_u * cos_w_l), weights * w / den) / spot
+    int_dual_delta = np.dot((- a_u * sin_w_l + b_u * cos_w_l), weights * w / den) / strikes
+    pow_spot = spot * spot
+    int_gamma = - (np.dot(a_u * sin_w_l - b_u * cos_w_l, weights * w / den) +
+                   np.dot(a_u * cos_w_l + b_u * sin_w_l, weights * w * w / den)) / pow_spot
+
+    return integral, int_delta, int_dual_delta, int_gamma
+
+
+def get_heston_price_surface(option_type: TypeEuropeanOption, spot: float, strikes: ndarray, maturities: ndarray,
+                             r: float, theta: float, rho: float, k: float, epsilon: float, v0: float,
+                             risk_lambda: float = 0.0, compute_greek: bool = False,
+                             quadrature_type: QUADRATURE_TYPE = QUADRATURE_TYPE.GAUSS_LEGENDRE,
+                             no_nodes: int = 128, upper_bound: float = 200.0, cache: CharesticFunctionCache = cf_cache):
+    # Attari's representation of EuropeanOption.get_analytic_value(HESTON_MODEL_ATTARI) on a fixed node set. The cf is
+    # evaluated once by maturity and the integrals for all strikes and greeks are matrix products. The output is a
+    # matrix (maturities x strikes) of prices and, if compute_greek, a map with the greeks in the same layout. The cf
+    # values go through the cache (None to disable it).
+    w, weights = get_quadrature_nodes(quadrature_type, no_nodes, upper_bound)
+    strikes = np.asarray(strikes, dtype=float)
+    no_maturities = len(maturities)
+    no_strikes = len(strikes)
+    b2 = k + risk_lambda
+    u2 = -0.5
+    x = np.log(spot)
+
+    prices = np.empty((no_maturities, no_strikes))
+    greeks_map = {TypeGreeks.DELTA: np.empty((no_maturities, no_strikes)),
+                  TypeGreeks.GAMMA: np.empty((no_maturities, no_strikes)),
+                  TypeGreeks.DUAL_DELTA: np.empty((no_maturities, no_strikes))}
+
+    for i in range(0, no_maturities):
+        t = maturities[i]
+        df = np.exp(- r * t)
+        if cache is None:
+            cf_w = get_trap_cf(w, t, x, v0, r, theta, rho, k, epsilon, b2, u2)
+        else:
+            cf_w = cache.get_value(get_trap_cf, w, t=t, x=x, v=v0, r_t=r, theta=theta, rho=rho, k=k, epsilon=epsilon,
+                                   b=b2, u=u2)
+
+        phi2 = cf_w * np.exp(- 1j * w * (x + r * t))
+        l = np.log(df * strikes / spot)
+        integral, int_delta, int_dual_delta, int_gamma = get_attari_integrals(phi2, w, weights, l, spot, strikes)
+
+        discrete_value = spot - 0.5 * strikes * df
+        call_price = discrete_value - (strikes * df / np.pi) * integral
+
+        if option_type == TypeEuropeanOption.CALL:
+            prices[i] = call_price
+        else:
+            prices[i] = call_price - (spot - strikes * df)
+
+        if compute_greek:
+            delta = 1.0 - (strikes * df / np.pi) * int_delta
+            dual_delta = - 0.5 * df - (discrete_value - call_price) / strikes - (df * strikes / np.pi) * int_dual_delta
+
+            if option_type == TypeEuropeanOption.CALL:
+                greeks_map[TypeGreeks.DELTA][i] = delta
+                greeks_map[TypeGreeks.DUAL_DELTA][i] = dual_delta
+            else:
+                greeks_map[TypeGreeks.DELTA][i] = delta - 1.0
+                greeks_map[TypeGreeks.DUAL_DELTA][i] = dual_delta + df
+
+            greeks_map[TypeGreeks.GAMMA][i] = - (strikes * df / np.pi) * int_gamma
+
+    if compute_greek:
+        return prices, greeks_map
+    else:
+        return prices
@@ -0,0 +1,142 @@
+__author__ = 'David Garcia Lorite'
+
+#
+# Copyright 2020 David Garcia Lorite
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+import numpy as np
+import QuantLib as ql
+
+from typing import Callable, List
+from scipy.interpolate import RegularGridInterpolator, interp1d
+from Tools import Types
+from AnalyticEngines.LocalVolatility.Dupire.NonParametricLV import LocalVol
+from Solvers.PDE_Solver import PDESolvers, PDEOperators, JitPDEs
+from Solvers.PDE_Solver.Meshes import Mesh, uniform_mesh
+from Solvers.PDE_Solver.PDEs import PDE, LN_FORWARD_LOCAL_VOL_PDE
+from Solvers.PDE_Solver.Types import BoundaryConditionType, SchemeType, GridStorageType
+from Solvers.PDE_Solver.TerminalConditions import TerminalCondition
+from Solvers.PDE_Solver.BoundariesConditions import Zero_Laplacian_BC
+from Solvers.PDE_Solver.GridStorage import GridStorage
+
+
+def get_local_vol_grid(local_vol: LocalVol, dates: List[int], forwards: Types.ndarray, log_moneyness: Types.ndarray):
+    # Local vol of SVILocalVol or SABRLocalVol on the grid (dates x log_moneyness), log_moneyness is log(K / F(t)).
+    no_dates = len(dates)
+    loc_vol_grid = np.empty((no_dates, len(log_moneyness)))
+    for i in range(0, no_dates):
+        loc_vol_grid[i, :] = local_vol.get_vol(int(dates[i]), np.log(forwards[i]) + log_moneyness, forwards[i])
+
+    return loc_vol_grid
+
+
+def get_local_vol_interpolator(times: Types.ndarray, log_moneyness: Types.ndarray, loc_vol_grid: Types.ndarray):
+    # Bilinear interpolation of the local vol grid, the local vol is flat outside the grid.
+    f_interpolator = RegularGridInterpolator((times, log_moneyness), loc_vol_grid, method='linear')
+
+    def f_local_vol(t: float, y: Types.ndarray):
+        t_s = np.full(len(y), np.clip(t, times[0], times[-1]))
+        return f_interpolator(np.column_stack((t_s, np.clip(y, log_moneyness[0], log_moneyness[-1]))))
+
+    return f_local_vol
+
+
+class DupireForwardPDEPricer(object):
+    # Forward equation of Dupire for c(T, y) = C(T, K) / (D(T) F(T)) with y = log(K / F(T)),
+    # c_T = 0.5 sigma^2(T, y) (c_yy - c_y) and c(0, y) = max(1 - exp(y), 0), so one forward march gives the call prices
+    # of all the strikes of the mesh and all the maturities. The equation is solved with FDSolver in the reversed time
+    # t_max - T, so it is the backward LN_FORWARD_LOCAL_VOL_PDE with the initial condition as terminal condition.
+    def __init__(self,
+                 f_local_vol: Callable[[float, Types.ndarray], Types.ndarray],
+                 t_max: float,
+                 no_time_steps: int,
+                 mesh_y: Mesh,
+                 rannacher_steps: int = 2,
+                 loc_vol_grid: tuple = None):
+        self._f_local_vol = f_local_vol
+        self._t_max = t_max
+        self._no_time_steps = no_time_steps
+        self._mesh_y = mesh_y
+        self._rannacher_steps = rannacher_steps
+        # (times, nodes, local vol) if the local vol is a grid, then the coefficients of the PDE are compiled.
+        self._loc_vol_grid = loc_vol_grid
+
+    @classmethod
+    def from_local_vol(cls, local_vol: LocalVol, value_date: ql.Date, day_counter: ql.DayCounter, dates: List[int],
+                       forwards: Types.ndarray, no_time_steps: int, mesh_y: Mesh, rannacher_steps: int = 2):
+        # The local vol is computed once on the pillar dates and the nodes of mesh_y, the solver interpolates it.
+        times = np.array([day_counter.yearFraction(value_date, ql.Date(int(d))) for d in dates])
+        loc_vol_grid = get_local_vol_grid(local_vol, dates, forwards, mesh_y.get_points())
+        f_local_vol = get_local_vol_interpolator(times, mesh_y.get_points(), loc_vol_grid)
+        return cls(f_local_vol, times[-1], no_time_steps, mesh_y, rannacher_steps,
+                   (times, mesh_y.get_points(), loc_vol_grid))
+
+    def get_pde(self):
+        # PDE in the reversed time t_max - T.
+        if self._loc_vol_grid is None:
+            t_max = self._t_max
+            f_local_vol = self._f_local_vol
+            return PDE.from_ipde_terms(LN_FORWARD_LOCAL_VOL_PDE(lambda t, y: f_local_vol(t_max - t, y)))
+        else:
+            times, nodes, loc_vol_grid = self._loc_vol_grid
+            return PDE.from_jit_terms(JitPDEs.LN_FORWARD_LOCAL_VOL_PDE_JIT(
+                np.ascontiguousarray(self._t_max - times[::-1], dtype=float),
+                np.ascontiguousarray(nodes, dtype=float),
+                np.ascontiguousarray(loc_vol_grid[::-1], dtype=float)))
+
+    def get_mesh_y(self):
+        return self._mesh_y
+
+    def get_normalised_call_prices(self, maturities: Types.ndarray):
+        # Matrix (maturities x nodes of mesh_y) with c(T, y).
+        maturities = np.asarray(maturities, dtype=float)
+        if np.any(maturities <= 0.0) or np.any(maturities > self._t_max):
+            raise Exception("The maturities must be in (0, t_max].")
+
+        # The reversed maturities are points of the time mesh.
+        reversed_maturities = self._t_max - maturities
+
+        def time_mesh(no_points: int, t0: float, t1: float):
+            return np.unique(np.concatenate((uniform_mesh(no_points, t0, t1), reversed_maturities)))
+
+        mesh_t = Mesh(time_mesh, self._no_time_steps + 1, 0.0, self._t_max)
+
+        pde = self.get_pde()
+        bc = Zero_Laplacian_BC()
+        operators = [PDEOperators.LinearPDEOperator(self._mesh_y, pde, bc),
+                     PDEOperators.LinearPDEOperator(self._mesh_y, pde, bc)]
+        tc = TerminalCondition(lambda mesh: np.maximum(1.0 - np.exp(mesh.get_points()), 0.0))
+
+        pd_solver = PDESolvers.FDSolver(mesh_t,
+                                        self._mesh_y,
+                                        operators,
+                                        SchemeType.CRANK_NICOLSON,
+                                        BoundaryConditionType.ZERO_LAPLACIAN,
+                                        tc,
+                                        self._rannacher_steps,
+                                        GridStorage(GridStorageType.TIMES, save_times=reversed_maturities))
+        pd_solver.solver()
+
+        columns = np.searchsorted(pd_solver.get_solution_times(), reversed_maturities)
+        return pd_solver.get_solution_grid()[:, columns].T
+
+    def get_call_prices(self, maturities: Types.ndarray, strikes: Types.ndarray, forwards: Types.ndarray,
+                        discount_factors: Types.ndarray):
+        # Matrix (maturities x strikes) of call prices D(T) F(T) c(T, log(K / F(T))), forwards and discount factors
+        # by maturity.
+        c = self.get_normalised_call_prices(maturities)
+        no_maturities = len(maturities)
+        prices = np.empty((no_maturities, len(strikes)))
+        for i in range(0, no_maturities):
+            f_c = interp1d(self._mesh_y.get_points(), c[i], kind='cubic')
+            prices[i] = discount_factors[i] * forwards[i] * f_c(np.log(np.asarray(strikes) / forwards[i]))
+
+        return prices
@@ -0,0 +1,76 @@
+__author__ = 'David Garcia Lorite'
+
+#
+# Copyright 2020 David Garcia Lorite
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+import numpy as np
+
+from typing import List
+from Tools.Types import TypeSellBuy, TypeEuropeanOption, ndarray
+from MCPricers.AmericanPricers import get_lsm_price
+
+
+class BermudanOption(object):
+    def __init__(self,
+                 strike: float,
+                 notional: float,
+                 buy_sell: TypeSellBuy,
+                 option_type: TypeEuropeanOption,
+                 spot: float,
+                 exercise_times: ndarray,
+                 delta_time: float):
+
+        self._strike = strike
+        self._notional = notional
+        self._option_type = option_type
+        self._buy_sell = buy_sell
+        self._spot = spot
+        self._delta_time = delta_time
+        self._exercise_times = np.unique(np.append(exercise_times, delta_time))
+        self._exercise_indexes = None
+        self._sampling_dates = None
+
+        if buy_sell == TypeSellBuy.BUY:
+            self._mult_buy_sell = 1.0
+        else:
+            self._mult_buy_sell = -1.0
+
+    def update_strike(self, strike: float):
+        self._strike = strike
+
+    def update_exercise_date_index(self, sampling_dates: ndarray):
+        # The sampling dates of the MC engine must contain the exercise dates (see extra_sampling_points).
+        sampling_dates = np.array(sampling_dates)
+        exercise_indexes = np.searchsorted(sampling_dates, self._exercise_times, side='left')
+
+        if np.any(exercise_indexes >= len(sampling_dates)) or \
+                not np.allclose(sampling_dates[np.minimum(exercise_indexes, len(sampling_dates) - 1)],
+                                self._exercise_times):
+            raise Exception("The exercise dates must be in the sampling dates of the MC engine.")
+
+        self._sampling_dates = sampling_dates
+        self._exercise_indexes = exercise_indexes
+
+    def get_price(self, x: ndarray, state_variables: List[ndarray] = None, r: float = 0.0, degree: int = 2,
+                  chunk_size: int = 100000, sampling_dates: ndarray = None) -> ndarray:
+        # The sampling dates of x can be given here or before with update_exercise_date_index.
+        if sampling_dates is not None:
+            self.update_exercise_date_index(sampling_dates)
+
+        if self._sampling_dates is None:
+            raise Exception("The sampling dates of the paths must be given before computing the price of the option.")
+
+        is_call = 1 if self._option_type == TypeEuropeanOption.CALL else -1
+        price = get_lsm_price(x, self._exercise_indexes, self._sampling_dates, self._strike, is_call,
+                              state_variables, r, degree, chunk_size)
+
+        return self._mult_buy_sell * self._notional * price
@@ -18,7 +18,9 @@ from functools import partial
 from typing import Callable, List
 from Tools.Types import TypeSellBuy, TypeEuropeanOption
 from MCPricers.EuropeanPricers import quadratic_call_operator, quadratic_put_operator, malliavin_delta_call_put, malliavin_gamma_call_put, \
-    call_operator_control_variate, put_operator_control_variate, call_operator, put_operator
+    call_operator_control_variate, put_operator_control_variate, call_operator, put_operator, call_accumulator, \
+    put_accumulator, quadratic_call_accumulator, quadratic_put_accumulator
+from MCPricers.Accumulators import get_statistics
 from Tools.Types import ndarray, ANALYTIC_MODEL, TypeGreeks
 from AnalyticEngines.FourierMethod.CharesticFunctions.HestonCharesticFunction import f_attari_heston, \
     f_delta_attari_heston, \
@@ -58,10 +60,30 @@ class QuadraticEuropeanOption(object):
         else:
             mult_buy_sell = -1.0
 
+        self._mult_buy_sell = mult_buy_sell
+
         if option_type == TypeEuropeanOption.CALL:
             self._payoff = EuropeanPayoff(lambda x: mult_buy_sell * notional * quadratic_call_operator(x, strike))
+            self._accumulator = quadratic_call_accumulator
         else:
             self._payoff = EuropeanPayoff(lambda x: mult_buy_sell * notional * quadratic_put_operator(x, strike))
+            self._accumulator = quadratic_put_accumulator
+
+    @property
+    def strike(self):
+        return self._strike
+
+    @property
+    def spot(self):
+        return self._spot
+
+    @property
+    def delta_time(self):
+        return self._delta_time
+
+    @property
+    def option_type(self):
+        return self._option_type
 
     def update_strike(self, strike: float):
         self._strike = strike
@@ -72,6 +94,15 @@ class QuadraticEuropeanOption(object):
         else:
             return self._payoff.get_value(x[:, -1])
 
+    def update_accumulator(self, x: ndarray, accumulator: ndarray):
+        if len(x.shape) == 1:
+            self._accumulator(x, self._strike, accumulator)
+        else:
+            self._accumulator(np.ascontiguousarray(x[:, -1]), self._strike, accumulator)
+
+    def get_price_from_accumulator(self, accumulator: ndarray) -> ndarray:
+        return self._mult_buy_sell * self._notional * get_statistics(accumulator)
+
 
 class EuropeanOption(object):
     def __init__(self,
@@ -95,10 +126,30 @@ class EuropeanOption(object):
         else:
             mult_buy_sell = -1.0
 
+        self._mult_buy_sell = mult_buy_sell
+
         if option_type == TypeEuropeanOption.CALL:
             self._payoff = EuropeanPayoff(lambda x: mult_buy_sell * notional * call_operator(x, strike))
+            self._accumulator = call_accumulator
         else:
             self._payoff = EuropeanPayoff(lambda x: mult_buy_sell * notional * put_operator(x, strike))
+            self._accumulator = put_accumulator
+
+    @property
+    def strike(self):
+        return self._strike
+
+    @property
+    def spot(self):
+        return self._spot
+
+    @property
+    def delta_time(self):
+        return self._delta_time
+
+    @property
+    def option_type(self):
+        return self._option_type
 
     def update_strike(self, strike: float):
         self._strike = strike
@@ -109,6 +160,15 @@ class EuropeanOption(object):
         else:
             return self._payoff.get_value(x[:, -1])
 
+    def update_accumulator(self, x: ndarray, accumulator: ndarray):
+        if len(x.shape) == 1:
+            self._accumulator(x, self._strike, accumulator)
+        else:
+            self._accumulator(np.ascontiguousarray(x[:, -1]), self._strike, accumulator)
+
+    def get_price_from_accumulator(self, accumulator: ndarray) -> ndarray:
+        return self._mult_buy_sell * self._notional * get_statistics(accumulator)
+
     def get_price_control_variate(self, x: ndarray, int_v_t: ndarray):
         vol_swap_t_i = np.sqrt(np.sum(int_v_t, axis=1) / self._delta_time)
         if self._option_type == TypeEuropeanOption.CALL:
@@ -15,7 +15,7 @@ __author__ = 'David Garcia Lorite'
 import numpy as np
 from Tools.Types import TypeSellBuy, TypeEuropeanOption, ndarray
 from MCPricers.ForwardStartEuropeanPricers import forward_start_call_operator, forward_start_put_operator, \
-    forward_call_operator_control_variate, forward_put_operator_control_variate
+    forward_call_operator_control_variate, forward_put_operator_control_variate, forward_start_strip_operator
 from Tools.Types import ndarray
 from typing import Callable, List
 
@@ -89,3 +89,50 @@ class ForwardStartEuropeanOption(object):
 
     def get_price(self, x: ndarray) -> ndarray:
         return self._payoff.get_value(self._forward_start_index, x)
+
+
+class ForwardStartEuropeanStrip(object):
+    def __init__(self,
+                 strikes: ndarray,
+                 notional: float,
+                 buy_sell: TypeSellBuy,
+                 option_type: TypeEuropeanOption,
+                 spot: float,
+                 forward_start_times: ndarray,
+                 delta_time: float):
+
+        # Each pair (forward_start_times[i], strikes[i]) is one forward start option of the strip.
+        self._strikes = np.array(strikes, dtype=float)
+        self._forward_start_times = np.array(forward_start_times, dtype=float)
+
+        if self._strikes.shape != self._forward_start_times.shape:
+            raise Exception("The number of strikes and forward start times must be the same.")
+
+        self._forward_start_indexes = np.zeros(len(self._strikes), dtype=np.int64)
+        self._notional = notional
+        self._option_type = option_type
+        self._buy_sell = buy_sell
+        self._spot = spot
+        self._delta_time = delta_time
+
+        if buy_sell == TypeSellBuy.BUY:
+            self._mult_buy_sell = 1.0
+        else:
+            self._mult_buy_sell = -1.0
+
+    @property
+    def strikes(self):
+        return self._strikes
+
+    @property
+    def forward_start_times(self):
+        return self._forward_start_times
+
+    def update_forward_start_date_index(self, sampling_dates: ndarray):
+        self._forward_start_indexes = np.searchsorted(sampling_dates, self._forward_start_times,
+                                                      side='left').astype(np.int64)
+
+    def get_price(self, x: ndarray) -> ndarray:
+        is_call = 1 if self._option_type == TypeEuropeanOption.CALL else -1
+        return self._mult_buy_sell * self._notional * forward_start_strip_operator(self._forward_start_indexes,
+                                                                                   self._strikes, x, is_call)
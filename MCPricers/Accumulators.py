@@ -0,0 +1,83 @@
+__author__ = 'David Garcia Lorite'
+
+#
+# Copyright 2020 David Garcia Lorite
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+import numba as nb
+import numpy as np
+
+# An accumulator is a vector with the layout [count, mean, M2, digital count]. The mean and M2 (sum of the squared
+# deviations to the mean) are updated with the Welford recursion and two accumulators are merged with the Chan's
+# parallel formula, so the statistics of chunked or distributed simulations are exact and numerically stable.
+ACCUMULATOR_SIZE = 4
+COUNT = 0
+MEAN = 1
+M2 = 2
+DIGITAL = 3
+
+# The parallel kernels split the paths in chunks of CHUNK_SIZE paths with one accumulator by chunk.
+CHUNK_SIZE = 4096
+
+
+@nb.jit("f8[:]()", nopython=True, nogil=True)
+def get_accumulator():
+    return np.zeros(ACCUMULATOR_SIZE)
+
+
+@nb.jit("(f8[:],f8,f8)", nopython=True, nogil=True)
+def update_accumulator(accumulator, value, digital):
+    accumulator[COUNT] += 1.0
+    delta = value - accumulator[MEAN]
+    accumulator[MEAN] += delta / accumulator[COUNT]
+    accumulator[M2] += delta * (value - accumulator[MEAN])
+    accumulator[DIGITAL] += digital
+
+
+@nb.jit("(f8[:],f8[:])", nopython=True, nogil=True)
+def merge_accumulator(accumulator, other):
+    n_a = accumulator[COUNT]
+    n_b = other[COUNT]
+    n = n_a + n_b
+
+    if n_b > 0.0:
+        delta = other[MEAN] - accumulator[MEAN]
+        accumulator[MEAN] += delta * n_b / n
+        accumulator[M2] += other[M2] + delta * delta * n_a * n_b / n
+        accumulator[COUNT] = n
+        accumulator[DIGITAL] += other[DIGITAL]
+
+
+@nb.jit("f8[:,:](i8)", nopython=True, nogil=True)
+def get_chunk_accumulators(no_paths):
+    no_chunks = (no_paths + CHUNK_SIZE - 1) // CHUNK_SIZE
+    return np.zeros((no_chunks, ACCUMULATOR_SIZE))
+
+
+@nb.jit("(f8[:],f8[:,:])", nopython=True, nogil=True)
+def merge_chunk_accumulators(accumulator, chunk_accumulators):
+    # The chunks are merged in order, so the statistics do not depend on the number of threads.
+    for c in range(0, chunk_accumulators.shape[0]):
+        merge_accumulator(accumulator, chunk_accumulators[c])
+
+
+@nb.jit("f8[:](f8[:])", nopython=True, nogil=True)
+def get_statistics(accumulator):
+    # The output is [mean, standard error of the mean, probability of the digital event].
+    results = np.zeros(3)
+    n = accumulator[COUNT]
+
+    if n > 0.0:
+        results[0] = accumulator[MEAN]
+        results[1] = np.sqrt(accumulator[M2]) / n
+        results[2] = accumulator[DIGITAL] / n
+
+    return results
@@ -0,0 +1,142 @@
+__author__ = 'David Garcia Lorite'
+
+#
+# Copyright 2020 David Garcia Lorite
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+import numba as nb
+import numpy as np
+
+from typing import List
+from Tools.Types import ndarray
+from MCPricers.Accumulators import get_accumulator, update_accumulator, get_statistics
+
+
+@nb.jit("f8[:,:](f8[:],f8[:,:],i8)", nopython=True, nogil=True)
+def get_basis_functions(x, state_variables, degree):
+    # The basis is 1, x^p and z_j^p for p = 1,...,degree and the cross terms x * z_j, where z_j are the extra state
+    # variables of the model (variance, volatility, ...).
+    no_paths = len(x)
+    no_states = state_variables.shape[1]
+    no_basis = 1 + degree * (1 + no_states) + no_states
+    basis = np.empty((no_paths, no_basis))
+
+    for i in range(0, no_paths):
+        basis[i, 0] = 1.0
+        column = 1
+        x_p = 1.0
+        for p in range(0, degree):
+            x_p *= x[i]
+            basis[i, column] = x_p
+            column += 1
+
+        for j in range(0, no_states):
+            z_p = 1.0
+            for p in range(0, degree):
+                z_p *= state_variables[i, j]
+                basis[i, column] = z_p
+                column += 1
+
+            basis[i, column] = x[i] * state_variables[i, j]
+            column += 1
+
+    return basis
+
+
+@nb.jit("(f8[:],f8[:])", nopython=True, nogil=True)
+def cash_flow_accumulator(cash_flow, accumulator):
+    no_paths = len(cash_flow)
+    for i in range(0, no_paths):
+        update_accumulator(accumulator, cash_flow[i], 1.0 if cash_flow[i] > 0.0 else 0.0)
+
+
+def get_state_variables(state_variables: List[ndarray], index: int, start: int, end: int):
+    no_states = len(state_variables)
+    z = np.empty((end - start, no_states))
+    for j in range(0, no_states):
+        z[:, j] = state_variables[j][start:end, index]
+    return z
+
+
+def get_regression_coefficients(x: ndarray,
+                                state_variables: List[ndarray],
+                                index: int,
+                                intrinsic_value: ndarray,
+                                cash_flow: ndarray,
+                                strike: float,
+                                degree: int,
+                                chunk_size: int):
+    # The normal equations B^T B beta = B^T y are accumulated over chunks of paths, so the memory is bounded by the
+    # chunk size and the products are done by BLAS. Only the paths in the money are used in the regression.
+    no_paths = x.shape[0]
+    no_basis = 1 + degree * (1 + len(state_variables)) + len(state_variables)
+    b_t_b = np.zeros((no_basis, no_basis))
+    b_t_y = np.zeros(no_basis)
+
+    for start in range(0, no_paths, chunk_size):
+        end = min(start + chunk_size, no_paths)
+        itm = intrinsic_value[start:end] > 0.0
+        if not np.any(itm):
+            continue
+
+        z = get_state_variables(state_variables, index, start, end)[itm]
+        basis = get_basis_functions(np.ascontiguousarray(x[start:end, index][itm]) / strike, z, degree)
+        b_t_b += np.dot(basis.T, basis)
+        b_t_y += np.dot(basis.T, cash_flow[start:end][itm])
+
+    return np.linalg.lstsq(b_t_b, b_t_y, rcond=None)[0]
+
+
+def get_lsm_price(x: ndarray,
+                  exercise_indexes: ndarray,
+                  times: ndarray,
+                  strike: float,
+                  is_call: int,
+                  state_variables: List[ndarray] = None,
+                  r: float = 0.0,
+                  degree: int = 2,
+                  chunk_size: int = 100000):
+    # Longstaff-Schwartz estimator of the price of a Bermudan option with exercise dates times[exercise_indexes]. The
+    # last exercise date is the maturity of the option. The extra state variables are matrices with the same shape
+    # that x (for instance the variance paths of Heston or the vol paths of SABR). The output is [price, std error,
+    # probability of a positive cash flow].
+    state_variables = [] if state_variables is None else state_variables
+    exercise_indexes = np.unique(exercise_indexes)
+    no_paths = x.shape[0]
+    phi = 1.0 if is_call > 0 else -1.0
+
+    index_next = exercise_indexes[-1]
+    cash_flow = np.maximum(phi * (x[:, index_next] - strike), 0.0)
+
+    for index in exercise_indexes[-2::-1]:
+        cash_flow *= np.exp(- r * (times[index_next] - times[index]))
+        intrinsic_value = np.maximum(phi * (x[:, index] - strike), 0.0)
+
+        beta = get_regression_coefficients(x, state_variables, index, intrinsic_value, cash_flow, strike, degree,
+                                           chunk_size)
+
+        for start in range(0, no_paths, chunk_size):
+            end = min(start + chunk_size, no_paths)
+            z = get_state_variables(state_variables, index, start, end)
+            continuation_value = np.dot(get_basis_functions(np.ascontiguousarray(x[start:end, index]) / strike, z,
+                                                            degree), beta)
+            exercise = np.logical_and(intrinsic_value[start:end] > 0.0,
+                                      intrinsic_value[start:end] >= continuation_value)
+            cash_flow[start:end][exercise] = intrinsic_value[start:end][exercise]
+
+        index_next = index
+
+    cash_flow *= np.exp(- r * (times[index_next] - times[0]))
+
+    accumulator = get_accumulator()
+    cash_flow_accumulator(cash_flow, accumulator)
+
+    return get_statistics(accumulator)
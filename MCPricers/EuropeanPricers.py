@@ -16,6 +16,8 @@ import numba as nb
 import numpy as np
 
 from scipy.special import ndtr
+from MCPricers.Accumulators import get_accumulator, update_accumulator, get_statistics, \
+    get_chunk_accumulators, merge_chunk_accumulators, CHUNK_SIZE
 
 
 @nb.jit("f8(f8,f8,f8,f8,i8)", nopython=True, nogil=True)
@@ -26,52 +28,48 @@ def black_scholes(f0: float, k: float, sigma: float, t: float, is_call: int):
     return f0 * ndtr(d_1) - k * ndtr(d_2)
 
 
-@nb.jit("f8[:](f8[:], f8)", nopython=True, nogil=True)
-def call_operator(x, strike):
+@nb.jit("(f8[:],f8,f8[:])", nopython=True, nogil=True, parallel=True)
+def call_accumulator(x, strike, accumulator):
     no_paths = len(x)
-    results = np.empty(3)
-    acum = 0.0
-    acum_pow = 0.0
-    acum_digital = 0.0
+    chunk_accumulators = get_chunk_accumulators(no_paths)
 
-    for i in range(0, no_paths):
-        index = 0.0
-        if x[i] > strike:
-            index = 1.0
-        val = (x[i] - strike) * index
-        acum += val
-        acum_pow += val * val
-        acum_digital += index
+    for c in nb.prange(0, chunk_accumulators.shape[0]):
+        for i in range(c * CHUNK_SIZE, min((c + 1) * CHUNK_SIZE, no_paths)):
+            index = 0.0
+            if x[i] > strike:
+                index = 1.0
+            update_accumulator(chunk_accumulators[c], (x[i] - strike) * index, index)
 
-    results[0] = acum / no_paths
-    results[1] = np.sqrt((acum_pow / no_paths - results[0] * results[0]) / no_paths)
-    results[2] = acum_digital / no_paths
-
-    return results
+    merge_chunk_accumulators(accumulator, chunk_accumulators)
 
 
 @nb.jit("f8[:](f8[:], f8)", nopython=True, nogil=True)
-def quadratic_call_operator(x, strike):
+def call_operator(x, strike):
+    accumulator = get_accumulator()
+    call_accumulator(x, strike, accumulator)
+    return get_statistics(accumulator)
+
+
+@nb.jit("(f8[:],f8,f8[:])", nopython=True, nogil=True, parallel=True)
+def quadratic_call_accumulator(x, strike, accumulator):
     no_paths = len(x)
-    results = np.empty(3)
-    acum = 0.0
-    acum_pow = 0.0
-    acum_digital = 0.0
+    chunk_accumulators = get_chunk_accumulators(no_paths)
 
-    for i in range(0, no_paths):
-        index = 0.0
-        if x[i] > strike:
-            index = 1.0
-        val = np.power((x[i] - strike) * index, 2.0)
-        acum += val
-        acum_pow += val * val
-        acum_digital += index
+    for c in nb.prange(0, chunk_accumulators.shape[0]):
+        for i in range(c * CHUNK_SIZE, min((c + 1) * CHUNK_SIZE, no_paths)):
+            index = 0.0
+            if x[i] > strike:
+                index = 1.0
+            update_accumulator(chunk_accumulators[c], np.power((x[i] - strike) * index, 2.0), index)
 
-    results[0] = acum / no_paths
-    results[1] = np.sqrt((acum_pow / no_paths - results[0] * results[0]) / no_paths)
-    results[2] = acum_digital / no_paths
+    merge_chunk_accumulators(accumulator, chunk_accumulators)
 
-    return results
+
+@nb.jit("f8[:](f8[:], f8)", nopython=True, nogil=True)
+def quadratic_call_operator(x, strike):
+    accumulator = get_accumulator()
+    quadratic_call_accumulator(x, strike, accumulator)
+    return get_statistics(accumulator)
 
 
 @nb.jit("f8[:](f8[:],f8,f8[:],f8,f8)", nopython=True, nogil=True)
@@ -80,11 +78,6 @@ def call_operator_control_variate(x, x0, vol_swap_t, k, t):
     bs_prices = np.zeros(no_paths)
     v_prices = np.zeros(no_paths)
 
-    results = np.empty(2)
-
-    acum = 0.0
-    acum_pow = 0.0
-
     for i in range(0, no_paths):
         bs_prices[i] = black_scholes(x0, k, vol_swap_t[i], t, 1)
         v_prices[i] = np.maximum(x[i] - k, 0.0)
@@ -99,15 +92,11 @@ def call_operator_control_variate(x, x0, vol_swap_t, k, t):
 
     b_estimated = (num_b / den_b)
 
+    accumulator = get_accumulator()
     for i in range(0, no_paths):
-        value = v_prices[i] - b_estimated * (bs_prices[i] - mean_bs_price)
-        acum += value
-        acum_pow += value * value
-
-    results[0] = acum / no_paths
-    results[1] = np.sqrt((acum_pow / no_paths - results[0] * results[0]) / no_paths)
+        update_accumulator(accumulator, v_prices[i] - b_estimated * (bs_prices[i] - mean_bs_price), 0.0)
 
-    return results
+    return get_statistics(accumulator)[0:2]
 
 
 @nb.jit("f8[:](f8[:],f8,f8[:],f8,f8)", nopython=True, nogil=True)
@@ -116,11 +105,6 @@ def put_operator_control_variate(x, x0, vol_swap_t, k, t):
     bs_prices = np.zeros(no_paths)
     v_prices = np.zeros(no_paths)
 
-    results = np.empty(2)
-
-    acum = 0.0
-    acum_pow = 0.0
-
     for i in range(0, no_paths):
         bs_prices[i] = black_scholes(x0, k, vol_swap_t[i], t, -1)
         v_prices[i] = np.maximum(k - x[i], 0.0)
@@ -135,63 +119,55 @@ def put_operator_control_variate(x, x0, vol_swap_t, k, t):
 
     b_estimated = (num_b / den_b)
 
+    accumulator = get_accumulator()
     for i in range(0, no_paths):
-        value = v_prices[i] - b_estimated * (bs_prices[i] - mean_bs_price)
-        acum += value
-        acum_pow += value * value
+        update_accumulator(accumulator, v_prices[i] - b_estimated * (bs_prices[i] - mean_bs_price), 0.0)
 
-    results[0] = acum / no_paths
-    results[1] = np.sqrt((acum_pow / no_paths - results[0] * results[0]) / no_paths)
+    return get_statistics(accumulator)[0:2]
 
-    return results
 
-
-@nb.jit("f8[:](f8[:], f8)", nopython=True, nogil=True)
-def put_operator(x, strike):
+@nb.jit("(f8[:],f8,f8[:])", nopython=True, nogil=True, parallel=True)
+def put_accumulator(x, strike, accumulator):
     no_paths = len(x)
-    results = np.empty(3)
-    acum = 0.0
-    acum_pow = 0.0
-    acum_digital = 0.0
-
-    for i in range(0, no_paths):
-        index = 0.0
-        if x[i] < strike:
-            index = 1.0
-        val = (strike - x[i]) * index
-        acum += val
-        acum_digital += index
-        acum_pow += val * val
+    chunk_accumulators = get_chunk_accumulators(no_paths)
 
-    results[0] = acum / no_paths
-    results[1] = np.sqrt((acum_pow / no_paths - results[0] * results[0]) / no_paths)
-    results[2] = acum_digital / no_paths
+    for c in nb.prange(0, chunk_accumulators.shape[0]):
+        for i in range(c * CHUNK_SIZE, min((c + 1) * CHUNK_SIZE, no_paths)):
+            index = 0.0
+            if x[i] < strike:
+                index = 1.0
+            update_accumulator(chunk_accumulators[c], (strike - x[i]) * index, index)
 
-    return results
+    merge_chunk_accumulators(accumulator, chunk_accumulators)
 
 
 @nb.jit("f8[:](f8[:], f8)", nopython=True, nogil=True)
-def quadratic_put_operator(x, strike):
+def put_operator(x, strike):
+    accumulator = get_accumulator()
+    put_accumulator(x, strike, accumulator)
+    return get_statistics(accumulator)
+
+
+@nb.jit("(f8[:],f8,f8[:])", nopython=True, nogil=True, parallel=True)
+def quadratic_put_accumulator(x, strike, accumulator):
     no_paths = len(x)
-    results = np.empty(3)
-    acum = 0.0
-    acum_pow = 0.0
-    acum_digital = 0.0
+    chunk_accumulators = get_chunk_accumulators(no_paths)
 
-    for i in range(0, no_paths):
-        index = 0.0
-        if x[i] > strike:
-            index = 1.0
-        val = np.power((strike - x[i]) * index, 2.0)
-        acum += val
-        acum_pow += val * val
-        acum_digital += index
+    for c in nb.prange(0, chunk_accumulators.shape[0]):
+        for i in range(c * CHUNK_SIZE, min((c + 1) * CHUNK_SIZE, no_paths)):
+            index = 0.0
+            if x[i] > strike:
+                index = 1.0
+            update_accumulator(chunk_accumulators[c], np.power((strike - x[i]) * index, 2.0), index)
 
-    results[0] = acum / no_paths
-    results[1] = np.sqrt((acum_pow / no_paths - results[0] * results[0]) / no_paths)
-    results[2] = acum_digital / no_paths
+    merge_chunk_accumulators(accumulator, chunk_accumulators)
 
-    return results
+
+@nb.jit("f8[:](f8[:], f8)", nopython=True, nogil=True)
+def quadratic_put_operator(x, strike):
+    accumulator = get_accumulator()
+    quadratic_put_accumulator(x, strike, accumulator)
+    return get_statistics(accumulator)
 
 
 @nb.jit("f8(f8, f8, f8)", nopython=True, nogil=True)
@@ -251,55 +227,36 @@ def f_put_delta(x, delta, strike):
 @nb.jit("f8[:](f8[:], f8, f8, f8[:], f8)", nopython=True, nogil=True)
 def malliavin_delta_call_put(x, strike, f0, weights, call_put):
     no_paths = len(x)
-    results = np.empty(2)
     delta = 0.001
     # delta = 0.01 * strike
-    acum = 0.0
-    acum_pow = 0.0
+    accumulator = get_accumulator()
 
     if call_put > 0:
         for i in range(0, no_paths):
             acum_part_1 = (x[i] / f0) * h_delta(x[i], delta, strike)
             acum_part_2 = f_call_delta(x[i], delta, strike) * weights[i]
-            val = (acum_part_1 + acum_part_2)
-            acum += val
-            acum_pow += val * val
-
-        results[0] = acum / no_paths
-        results[1] = np.sqrt((acum_pow / no_paths - results[0] * results[0]) / no_paths)
+            update_accumulator(accumulator, acum_part_1 + acum_part_2, 0.0)
 
-        return results
+        return get_statistics(accumulator)[0:2]
     else:
         for i in range(0, no_paths):
             acum_part_1 = (x[i] / f0) * (1.0 - h_delta(x[i], delta, strike))
             acum_part_2 = f_put_delta(x[i], delta, strike) * weights[i]
-            val = (acum_part_1 + acum_part_2)
-            acum += val
-            acum_pow += val * val
+            update_accumulator(accumulator, acum_part_1 + acum_part_2, 0.0)
 
-        results[0] = acum / no_paths
-        results[1] = np.sqrt((acum_pow / no_paths - results[0] * results[0]) / no_paths)
-
-        return results
+        return get_statistics(accumulator)[0:2]
 
 
 @nb.jit("f8[:](f8[:], f8, f8, f8[:])", nopython=True, nogil=True)
 def malliavin_gamma_call_put(x, strike, f0, gamma_weights):
     no_paths = len(x)
-    results = np.empty(2)
     # delta = 0.01
     delta = 0.0001 * strike
-    acum = 0.0
-    acum_pow = 0.0
+    accumulator = get_accumulator()
 
     for i in range(0, no_paths):
         acum_part_1 = np.power((x[i] / f0), 2.0) * i_gamma(x[i], delta, strike)
         acum_part_2 = gamma_weights[i] * f_gamma(x[i], delta, strike)
-        val = (acum_part_1 + acum_part_2)
-        acum += val
-        acum_pow += val * val
-
-    results[0] = acum / no_paths
-    results[1] = np.sqrt((acum_pow / no_paths - results[0] * results[0]) / no_paths)
+        update_accumulator(accumulator, acum_part_1 + acum_part_2, 0.0)
 
-    return results
+    return get_statistics(accumulator)[0:2]
@@ -19,6 +19,8 @@ import numpy as np
 from Tools import Types
 # from ncephes import ndtr
 from scipy.special import ndtr
+from MCPricers.Accumulators import get_accumulator, update_accumulator, get_statistics, \
+    get_chunk_accumulators, merge_chunk_accumulators, CHUNK_SIZE
 
 
 @nb.jit("f8(f8,f8,f8,f8,i8)", nopython=True, nogil=True)
@@ -29,38 +31,46 @@ def black_scholes(f0: float, k: float, sigma: float, t: float, is_call: int):
     return f0 * ndtr(d_1) - k * ndtr(d_2)
 
 
-@nb.jit("f8[:](f8,i8,f8[:,:])", nopython=True, nogil=True)
-def forward_start_call_operator(k: float, index_strike: int, x: Types.ndarray):
+@nb.jit("(f8,i8,f8[:,:],f8[:])", nopython=True, nogil=True, parallel=True)
+def forward_start_call_accumulator(k: float, index_strike: int, x: Types.ndarray, accumulator: Types.ndarray):
     no_paths = x.shape[0]
     no_time_steps = x.shape[1]
-    results = np.empty(2)
-    acum = 0.0
-    acum_pow = 0.0
-    for i in range(0, no_paths):
-        val = np.maximum((x[i, no_time_steps - 1] - x[i, index_strike] * k), 0.0)
-        acum += val
-        acum_pow += val * val
+    chunk_accumulators = get_chunk_accumulators(no_paths)
 
-    results[0] = acum / no_paths
-    results[1] = np.sqrt((acum_pow / no_paths - results[0] * results[0]) / no_paths)
-    return results
+    for c in nb.prange(0, chunk_accumulators.shape[0]):
+        for i in range(c * CHUNK_SIZE, min((c + 1) * CHUNK_SIZE, no_paths)):
+            payoff = np.maximum(x[i, no_time_steps - 1] - x[i, index_strike] * k, 0.0)
+            update_accumulator(chunk_accumulators[c], payoff, 0.0)
+
+    merge_chunk_accumulators(accumulator, chunk_accumulators)
 
 
 @nb.jit("f8[:](f8,i8,f8[:,:])", nopython=True, nogil=True)
-def forward_start_put_operator(k: float, index_strike: int, x: Types.ndarray):
+def forward_start_call_operator(k: float, index_strike: int, x: Types.ndarray):
+    accumulator = get_accumulator()
+    forward_start_call_accumulator(k, index_strike, x, accumulator)
+    return get_statistics(accumulator)[0:2]
+
+
+@nb.jit("(f8,i8,f8[:,:],f8[:])", nopython=True, nogil=True, parallel=True)
+def forward_start_put_accumulator(k: float, index_strike: int, x: Types.ndarray, accumulator: Types.ndarray):
     no_paths = x.shape[0]
     no_time_steps = x.shape[1]
-    results = np.empty(2)
-    acum = 0.0
-    acum_pow = 0.0
-    for i in range(0, no_paths):
-        val = np.maximum(k * x[i, index_strike] - x[i, no_time_steps - 1], 0.0)
-        acum += val
-        acum_pow += val * val
+    chunk_accumulators = get_chunk_accumulators(no_paths)
 
-    results[0] = acum / no_paths
-    results[1] = np.sqrt((acum_pow / no_paths - results[0] * results[0]) / no_paths)
-    return results
+    for c in nb.prange(0, chunk_accumulators.shape[0]):
+        for i in range(c * CHUNK_SIZE, min((c + 1) * CHUNK_SIZE, no_paths)):
+            payoff = np.maximum(k * x[i, index_strike] - x[i, no_time_steps - 1], 0.0)
+            update_accumulator(chunk_accumulators[c], payoff, 0.0)
+
+    merge_chunk_accumulators(accumulator, chunk_accumulators)
+
+
+@nb.jit("f8[:](f8,i8,f8[:,:])", nopython=True, nogil=True)
+def forward_start_put_operator(k: float, index_strike: int, x: Types.ndarray):
+    accumulator = get_accumulator()
+    forward_start_put_accumulator(k, index_strike, x, accumulator)
+    return get_statistics(accumulator)[0:2]
 
 
 @nb.jit("f8[:](f8[:],f8[:],f8[:],f8,f8,f8)", nopython=True, nogil=True)
@@ -69,11 +79,6 @@ def forward_call_operator_control_variate(x, x1, vol_swap_t, k, t1, t2):
     bs_prices = np.zeros(no_paths)
     v_prices = np.zeros(no_paths)
 
-    results = np.empty(2)
-
-    acum = 0.0
-    acum_pow = 0.0
-
     for i in range(0, no_paths):
         bs_prices[i] = black_scholes(1.0, k, vol_swap_t[i], (t2 - t1), 1) * x1[i]
         v_prices[i] = np.maximum(x[i] - x1[i] * k, 0.0)
@@ -88,15 +93,11 @@ def forward_call_operator_control_variate(x, x1, vol_swap_t, k, t1, t2):
 
     b_estimated = (num_b / den_b)
 
+    accumulator = get_accumulator()
     for i in range(0, no_paths):
-        value = v_prices[i] - b_estimated * (bs_prices[i] - mean_bs_price)
-        acum += value
-        acum_pow += value * value
+        update_accumulator(accumulator, v_prices[i] - b_estimated * (bs_prices[i] - mean_bs_price), 0.0)
 
-    results[0] = acum / no_paths
-    results[1] = np.sqrt((acum_pow / no_paths - results[0] * results[0]) / no_paths)
-
-    return results
+    return get_statistics(accumulator)[0:2]
 
 
 @nb.jit("f8[:](f8[:],f8[:],f8[:],f8,f8,f8)", nopython=True, nogil=True)
@@ -105,11 +106,6 @@ def forward_put_operator_control_variate(x, x1, vol_swap_t, k, t1, t2):
     bs_prices = np.zeros(no_paths)
     v_prices = np.zeros(no_paths)
 
-    results = np.empty(2)
-
-    acum = 0.0
-    acum_pow = 0.0
-
     for i in range(0, no_paths):
         bs_prices[i] = black_scholes(1.0, k, vol_swap_t[i], (t2 - t1), 1) * x1[i]
         v_prices[i] = np.maximum(x1[i] * k - x[i], 0.0)
@@ -124,13 +120,40 @@ def forward_put_operator_control_variate(x, x1, vol_swap_t, k, t1, t2):
 
     b_estimated = (num_b / den_b)
 
+    accumulator = get_accumulator()
     for i in range(0, no_paths):
-        value = v_prices[i] - b_estimated * (bs_prices[i] - mean_bs_price)
-        acum += value
-        acum_pow += value * value
+        update_accumulator(accumulator, v_prices[i] - b_estimated * (bs_prices[i] - mean_bs_price), 0.0)
 
-    results[0] = acum / no_paths
-    results[1] = np.sqrt((acum_pow / no_paths - results[0] * results[0]) / no_paths)
+    return get_statistics(accumulator)[0:2]
 
-    return results
 
+@nb.jit("f8[:,:](i8[:],f8[:],f8[:,:],i8)", nopython=True, nogil=True, parallel=True)
+def forward_start_strip_operator(index_strikes: Types.ndarray, k: Types.ndarray, x: Types.ndarray, is_call: int):
+    no_paths = x.shape[0]
+    no_time_steps = x.shape[1]
+    no_options = len(k)
+    results = np.empty((no_options, 2))
+
+    start_indexes = np.unique(index_strikes)
+    no_start_indexes = len(start_indexes)
+    ratios = np.empty((no_start_indexes, no_paths))
+
+    for j in nb.prange(0, no_start_indexes):
+        for i in range(0, no_paths):
+            ratios[j, i] = x[i, no_time_steps - 1] / x[i, start_indexes[j]]
+
+    phi = 1.0 if is_call > 0 else -1.0
+
+    for j in nb.prange(0, no_options):
+        index_ratio = np.searchsorted(start_indexes, index_strikes[j])
+        index_start = start_indexes[index_ratio]
+        accumulator = get_accumulator()
+        for i in range(0, no_paths):
+            update_accumulator(accumulator, x[i, index_start] * np.maximum(phi * (ratios[index_ratio, i] - k[j]), 0.0),
+                               0.0)
+
+        statistics = get_statistics(accumulator)
+        results[j, 0] = statistics[0]
+        results[j, 1] = statistics[1]
+
+    return results
@@ -0,0 +1,106 @@
+__author__ = 'David Garcia Lorite'
+
+#
+# Copyright 2020 David Garcia Lorite
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+import numba as nb
+import numpy as np
+
+from Tools.Types import ndarray
+
+# The state of the observer is a matrix (no_paths, OBSERVER_SIZE) with the running aggregates of each path. The MC
+# engines update it at each sampling date (t0 included), so the Asian, lookback and barrier payoffs can be priced
+# without storing the full paths of the underlying.
+OBSERVER_SIZE = 5
+COUNT = 0
+RUNNING_SUM = 1
+RUNNING_MAX = 2
+RUNNING_MIN = 3
+BARRIER_HIT = 4
+
+
+@nb.jit("(f8[:,:],i8,f8,f8,f8)", nopython=True, nogil=True)
+def observe_value(state, i, x, lower_barrier, upper_barrier):
+    state[i, COUNT] += 1.0
+    state[i, RUNNING_SUM] += x
+
+    if x > state[i, RUNNING_MAX]:
+        state[i, RUNNING_MAX] = x
+
+    if x < state[i, RUNNING_MIN]:
+        state[i, RUNNING_MIN] = x
+
+    if x <= lower_barrier or x >= upper_barrier:
+        state[i, BARRIER_HIT] = 1.0
+
+
+@nb.jit("(f8[:,:],f8[:],f8,f8)", nopython=True, nogil=True, parallel=True)
+def observe_values(state, x, lower_barrier, upper_barrier):
+    no_paths = len(x)
+    for i in nb.prange(0, no_paths):
+        observe_value(state, i, x[i], lower_barrier, upper_barrier)
+
+
+@nb.jit("(f8[:,:],f8[:],f8,f8)", nopython=True, nogil=True, parallel=True)
+def observe_log_values(state, ln_x, lower_barrier, upper_barrier):
+    # The engines that simulate log(S_t) update the observer without building exp(log(S_t)) at each step.
+    no_paths = len(ln_x)
+    for i in nb.prange(0, no_paths):
+        observe_value(state, i, np.exp(ln_x[i]), lower_barrier, upper_barrier)
+
+
+class PathObserver(object):
+    def __init__(self,
+                 lower_barrier: float = -np.inf,
+                 upper_barrier: float = np.inf):
+        self._lower_barrier = lower_barrier
+        self._upper_barrier = upper_barrier
+        self._state = np.empty((0, OBSERVER_SIZE))
+
+    @property
+    def lower_barrier(self):
+        return self._lower_barrier
+
+    @property
+    def upper_barrier(self):
+        return self._upper_barrier
+
+    @property
+    def state(self):
+        return self._state
+
+    @property
+    def average(self):
+        return self._state[:, RUNNING_SUM] / self._state[:, COUNT]
+
+    @property
+    def maximum(self):
+        return self._state[:, RUNNING_MAX]
+
+    @property
+    def minimum(self):
+        return self._state[:, RUNNING_MIN]
+
+    @property
+    def barrier_hit(self):
+        return self._state[:, BARRIER_HIT] > 0.0
+
+    def initialize(self, no_paths: int):
+        self._state = np.zeros((no_paths, OBSERVER_SIZE))
+        self._state[:, RUNNING_MAX] = -np.inf
+        self._state[:, RUNNING_MIN] = np.inf
+
+    def update(self, x: ndarray):
+        observe_values(self._state, x, self._lower_barrier, self._upper_barrier)
+
+    def update_log(self, ln_x: ndarray):
+        observe_log_values(self._state, ln_x, self._lower_barrier, self._upper_barrier)
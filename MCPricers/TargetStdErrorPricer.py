@@ -0,0 +1,84 @@
+__author__ = 'David Garcia Lorite'
+
+#
+# Copyright 2020 David Garcia Lorite
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+import time
+import numpy as np
+
+from typing import Callable, List
+from Instruments.EuropeanInstruments import EuropeanOption, TypeEuropeanOption
+from MCPricers.Accumulators import get_accumulator, get_statistics
+from Tools.AnalyticTools import bs_implied_volatility, bs_vega
+from Tools.Types import ndarray, TYPE_STD_ERROR
+
+
+def get_std_error(option: EuropeanOption, statistics: ndarray, std_error_type: TYPE_STD_ERROR):
+    if std_error_type == TYPE_STD_ERROR.PRICE:
+        return statistics[1]
+
+    elif std_error_type == TYPE_STD_ERROR.IMPLIED_VOL:
+        # The error in vol points is the error in price divided by the vega at the implied vol of the MC price.
+        is_call = 1 if option.option_type == TypeEuropeanOption.CALL else -1
+        iv = bs_implied_volatility(statistics[0], option.spot, option.strike, option.delta_time, is_call)
+        vega = bs_vega(option.spot, option.strike, option.delta_time, iv)
+        return statistics[1] / vega if vega > 0.0 else np.inf
+
+    else:
+        raise Exception("The std error type " + str(std_error_type) + " is unknown.")
+
+
+def get_price_target_std_error(path_generator: Callable[[int], ndarray],
+                               options: List[EuropeanOption],
+                               target_std_error: float,
+                               no_paths_batch: int,
+                               std_error_type: TYPE_STD_ERROR = TYPE_STD_ERROR.PRICE,
+                               max_time: float = np.inf,
+                               max_paths: int = 100000000,
+                               growth_factor: float = 2.0):
+    # path_generator(no_paths) must return new paths of the underlying on each call, for instance
+    # lambda n: Heston_Engine.get_path_multi_step(t0, t1, parameters, f0, v0, n, no_time_steps,
+    #                                             type_random_numbers, rnd_generator)[HESTON_OUTPUT.PATHS]
+    # The paths of every batch are merged in one accumulator by option. An option stops to be updated when its
+    # std error is below the target. The output is the matrix [price, std error, digital] by option and the number
+    # of simulated paths.
+    no_options = len(options)
+    accumulators = [get_accumulator() for _ in range(0, no_options)]
+    converged = np.zeros(no_options, dtype=bool)
+    std_errors = np.full(no_options, np.inf)
+
+    start_time = time.time()
+    total_paths = 0
+    no_paths = no_paths_batch
+
+    while True:
+        paths = path_generator(no_paths)
+        total_paths += paths.shape[0]
+
+        for i in range(0, no_options):
+            if not converged[i]:
+                options[i].update_accumulator(paths, accumulators[i])
+                std_errors[i] = get_std_error(options[i], get_statistics(accumulators[i]), std_error_type)
+                converged[i] = std_errors[i] <= target_std_error
+
+        if np.all(converged) or (time.time() - start_time) > max_time or total_paths >= max_paths:
+            break
+
+        # The std error decreases as 1/sqrt(n), so we estimate the paths needed by the worst option and we bound
+        # the size of the next batch by the growth factor.
+        worst_std_error = np.max(std_errors[~converged])
+        paths_needed = total_paths * (worst_std_error / target_std_error) ** 2 - total_paths
+        no_paths = int(min(max(paths_needed, no_paths_batch), growth_factor * total_paths, max_paths - total_paths))
+
+    prices = np.array([options[i].get_price_from_accumulator(accumulators[i]) for i in range(0, no_options)])
+
+    return prices, total_paths
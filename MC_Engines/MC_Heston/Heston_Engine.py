@@ -17,6 +17,7 @@ import numpy as np
 from Tools.Types import Vector, ndarray, HESTON_OUTPUT
 from MC_Engines.MC_Heston import HestonTools, VarianceMC
 from Tools import AnalyticTools, Types
+from MCPricers.PathObservers import PathObserver
 
 
 def get_time_steps(t0: float, t1: float, no_time_steps: int, **kwargs):
@@ -29,6 +30,25 @@ def get_time_steps(t0: float, t1: float, no_time_steps: int, **kwargs):
         return np.linspace(t0, t1, no_time_steps)
 
 
+def get_qe_step(k: float, theta: float, epsilon: float, rho: float, t_i_1: float, t_i: float, ln_x_t_i_1: ndarray,
+                v_t_i_1: ndarray, u_variance: ndarray, z_f: ndarray, no_paths: int):
+    # Step of log(S_t) and V_t from t_i_1 to t_i with the QE scheme of the variance and the central discretisation of
+    # the integral of the variance in log(S_t). The output is (log(S_t_i), V_t_i, int_t_i_1^t_i V_s ds).
+    delta_t = t_i - t_i_1
+    v_t_i = VarianceMC.get_variance(k, theta, epsilon, 1.5, t_i_1, t_i, v_t_i_1, u_variance, no_paths)
+    int_v_t_i = HestonTools.get_integral_variance(t_i_1, t_i, v_t_i_1, v_t_i, 0.5, 0.5)
+
+    k0 = - delta_t * (rho * k * theta) / epsilon
+    k1 = 0.5 * delta_t * ((k * rho) / epsilon - 0.5) - rho / epsilon
+    k2 = 0.5 * delta_t * ((k * rho) / epsilon - 0.5) + rho / epsilon
+    k3 = 0.5 * delta_t * (1.0 - rho * rho)
+
+    ln_x_t_i = ln_x_t_i_1 + k0 + k1 * v_t_i_1 + k2 * v_t_i + \
+        np.sqrt(k3) * AnalyticTools.dot_wise(np.sqrt(v_t_i_1 + v_t_i), z_f)
+
+    return ln_x_t_i, v_t_i, int_v_t_i
+
+
 def get_path_multi_step(t0: float,
                         t1: float,
                         parameters: Vector,
@@ -38,6 +58,7 @@ def get_path_multi_step(t0: float,
                         no_time_steps: int,
                         type_random_numbers: Types.TYPE_STANDARD_NORMAL_SAMPLING,
                         rnd_generator,
+                        path_observer: PathObserver = None,
                         **kwargs) -> ndarray:
 
     k = parameters[0]
@@ -51,22 +72,28 @@ def get_path_multi_step(t0: float,
     no_time_steps = len(t_i)
 
     t_i = np.linspace(t0, t1, no_time_steps)
-    delta_t_i = np.diff(t_i)
-
-    f_t = np.empty((no_paths, no_time_steps))
-    f_t[:, 0] = f0
 
     delta_weight = np.zeros(no_paths)
     gamma_weight = np.zeros(no_paths)
     var_weight = np.zeros(no_paths)
     inv_variance = np.zeros(no_paths)
 
-    ln_x_t_paths = np.zeros(shape=(no_paths, no_time_steps))
-    int_v_t_paths = np.zeros(shape=(no_paths, no_time_steps - 1))
-    v_t_paths = np.zeros(shape=(no_paths, no_time_steps))
+    # With a path observer, we only keep the last values of each path and the observer gets the running aggregates.
+    store_paths = path_observer is None
+
+    if store_paths:
+        ln_x_t_paths = np.zeros(shape=(no_paths, no_time_steps))
+        int_v_t_paths = np.zeros(shape=(no_paths, no_time_steps - 1))
+        v_t_paths = np.zeros(shape=(no_paths, no_time_steps))
+        ln_x_t_paths[:, 0] = np.log(f0)
+        v_t_paths[:, 0] = v0
+    else:
+        int_v_t_paths = np.zeros(shape=(no_paths, 1))
+        path_observer.initialize(no_paths)
+        path_observer.update(np.full(no_paths, f0))
 
-    ln_x_t_paths[:, 0] = np.log(f0)
-    v_t_paths[:, 0] = v0
+    ln_x_t_i_1 = np.full(no_paths, np.log(f0))
+    v_t_i_1 = np.full(no_paths, v0)
 
     map_out_put = {}
 
@@ -74,30 +101,34 @@ def get_path_multi_step(t0: float,
         u_variance = rnd_generator.uniform(0.0, 1.0, no_paths)
         z_f = rnd_generator.normal(0.0, 1.0, no_paths, type_random_numbers)
 
-        np.copyto(v_t_paths[:, i],
-                  VarianceMC.get_variance(k, theta, epsilon, 1.5, t_i[i - 1], t_i[i], v_t_paths[:, i - 1],
-                                          u_variance, no_paths))
-        np.copyto(int_v_t_paths[:, i - 1], HestonTools.get_integral_variance(t_i[i - 1], t_i[i], v_t_paths[:, i - 1],
-                                                                             v_t_paths[:, i], 0.5, 0.5))
+        ln_x_t_i, v_t_i, int_v_t_i = get_qe_step(k, theta, epsilon, rho, t_i[i - 1], t_i[i], ln_x_t_i_1, v_t_i_1,
+                                                 u_variance, z_f, no_paths)
 
-        HestonTools.get_delta_weight(t_i[i - 1], t_i[i], v_t_paths[:, i - 1], v_t_paths[:, i], z_f, delta_weight)
-        HestonTools.get_var_weight(t_i[i - 1], t_i[i], v_t_paths[:, i - 1], v_t_paths[:, i], z_f, var_weight)
+        HestonTools.get_delta_weight(t_i[i - 1], t_i[i], v_t_i_1, v_t_i, z_f, delta_weight)
+        HestonTools.get_var_weight(t_i[i - 1], t_i[i], v_t_i_1, v_t_i, z_f, var_weight)
 
-        inv_variance += HestonTools.get_integral_variance(t_i[i - 1], t_i[i], 1.0 / v_t_paths[:, i - 1],
-                                                          1.0 / v_t_paths[:, i], 0.5, 0.5)
+        inv_variance += HestonTools.get_integral_variance(t_i[i - 1], t_i[i], 1.0 / v_t_i_1, 1.0 / v_t_i, 0.5, 0.5)
 
-        k0 = - delta_t_i[i - 1] * (rho * k * theta) / epsilon
-        k1 = 0.5 * delta_t_i[i - 1] * ((k * rho) / epsilon - 0.5) - rho / epsilon
-        k2 = 0.5 * delta_t_i[i - 1] * ((k * rho) / epsilon - 0.5) + rho / epsilon
-        k3 = 0.5 * delta_t_i[i - 1] * (1.0 - rho * rho)
+        if store_paths:
+            np.copyto(v_t_paths[:, i], v_t_i)
+            np.copyto(int_v_t_paths[:, i - 1], int_v_t_i)
+            np.copyto(ln_x_t_paths[:, i], ln_x_t_i)
+        else:
+            int_v_t_paths[:, 0] += int_v_t_i
+            path_observer.update_log(ln_x_t_i)
 
-        np.copyto(ln_x_t_paths[:, i], ln_x_t_paths[:, i - 1] + k0 + k1 * v_t_paths[:, i - 1] + k2 * v_t_paths[:, i] +
-                  np.sqrt(k3) * AnalyticTools.dot_wise(np.sqrt(v_t_paths[:, i - 1] + v_t_paths[:, i]), z_f))
+        ln_x_t_i_1 = ln_x_t_i
+        v_t_i_1 = v_t_i
+
+    if store_paths:
+        map_out_put[HESTON_OUTPUT.PATHS] = np.exp(ln_x_t_paths)
+        map_out_put[HESTON_OUTPUT.SPOT_VARIANCE_PATHS] = v_t_paths
+    else:
+        map_out_put[HESTON_OUTPUT.PATHS] = np.exp(ln_x_t_i_1).reshape(no_paths, 1)
+        map_out_put[HESTON_OUTPUT.SPOT_VARIANCE_PATHS] = v_t_i_1.reshape(no_paths, 1)
 
-    map_out_put[HESTON_OUTPUT.PATHS] = np.exp(ln_x_t_paths)
     map_out_put[HESTON_OUTPUT.INTEGRAL_VARIANCE_PATHS] = int_v_t_paths
     map_out_put[HESTON_OUTPUT.DELTA_MALLIAVIN_WEIGHTS_PATHS_TERMINAL] = np.multiply(delta_weight, 1.0 / (np.sqrt(1.0 - rho * rho) * t1 * f0))
-    map_out_put[HESTON_OUTPUT.SPOT_VARIANCE_PATHS] = v_t_paths
     map_out_put[HESTON_OUTPUT.TIMES] = t_i
 
     HestonTools.get_gamma_weight(delta_weight, var_weight, inv_variance, rho, t1, gamma_weight)
@@ -0,0 +1,109 @@
+__author__ = 'David Garcia Lorite'
+
+#
+# Copyright 2020 David Garcia Lorite
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+import numpy as np
+
+from Tools.Types import Vector, ndarray, JUMP_DIFFUSION_OUTPUT
+from MC_Engines.MC_Heston.Heston_Engine import get_time_steps, get_qe_step
+from MC_Engines.MC_JumpDiffusion import JumpDiffusionTools
+from Tools import Types
+from MCPricers.PathObservers import PathObserver
+
+
+def get_path_multi_step(t0: float,
+                        t1: float,
+                        parameters: Vector,
+                        f0: float,
+                        v0: float,
+                        no_paths: int,
+                        no_time_steps: int,
+                        type_random_numbers: Types.TYPE_STANDARD_NORMAL_SAMPLING,
+                        rnd_generator,
+                        path_observer: PathObserver = None,
+                        **kwargs) -> ndarray:
+    # Heston with log-normal jumps, the parameters are [k, theta, epsilon, rho, jump_mean, jump_std, jump_intensity]
+    # with the same meaning that in get_bates_cf. The variance and the diffusion part of log(S_t) are the step
+    # get_qe_step of Heston_Engine and the compensated jumps are added to log(S_t) at each step.
+    k = parameters[0]
+    theta = parameters[1]
+    epsilon = parameters[2]
+    rho = parameters[3]
+    jump_mean = parameters[4]
+    jump_std = parameters[5]
+    jump_intensity = parameters[6]
+
+    no_paths = 2 * no_paths if type_random_numbers == Types.TYPE_STANDARD_NORMAL_SAMPLING.ANTITHETIC else no_paths
+
+    t_i = np.array(get_time_steps(t0, t1, no_time_steps, **kwargs))
+    no_time_steps = len(t_i)
+    delta_t_i = np.diff(t_i)
+
+    compensator = jump_intensity * (np.exp(jump_mean + 0.5 * jump_std * jump_std) - 1.0)
+
+    # With a path observer, we only keep the last values of each path and the observer gets the running aggregates.
+    store_paths = path_observer is None
+
+    if store_paths:
+        ln_x_t_paths = np.zeros(shape=(no_paths, no_time_steps))
+        int_v_t_paths = np.zeros(shape=(no_paths, no_time_steps - 1))
+        v_t_paths = np.zeros(shape=(no_paths, no_time_steps))
+        ln_x_t_paths[:, 0] = np.log(f0)
+        v_t_paths[:, 0] = v0
+    else:
+        int_v_t_paths = np.zeros(shape=(no_paths, 1))
+        path_observer.initialize(no_paths)
+        path_observer.update(np.full(no_paths, f0))
+
+    ln_x_t_i_1 = np.full(no_paths, np.log(f0))
+    v_t_i_1 = np.full(no_paths, v0)
+    jumps = np.zeros(no_paths)
+    no_jumps = np.zeros(no_paths)
+
+    map_out_put = {}
+
+    for i in range(1, no_time_steps):
+        u_variance = rnd_generator.uniform(0.0, 1.0, no_paths)
+        z_f = rnd_generator.normal(0.0, 1.0, no_paths, type_random_numbers)
+        u_jumps = rnd_generator.uniform(0.0, 1.0, no_paths)
+        z_jumps = rnd_generator.normal(0.0, 1.0, no_paths, type_random_numbers)
+
+        ln_x_t_i, v_t_i, int_v_t_i = get_qe_step(k, theta, epsilon, rho, t_i[i - 1], t_i[i], ln_x_t_i_1, v_t_i_1,
+                                                 u_variance, z_f, no_paths)
+        JumpDiffusionTools.get_jumps(u_jumps, z_jumps, jump_mean, jump_std, jump_intensity * delta_t_i[i - 1], jumps,
+                                     no_jumps)
+        ln_x_t_i += jumps - compensator * delta_t_i[i - 1]
+
+        if store_paths:
+            np.copyto(v_t_paths[:, i], v_t_i)
+            np.copyto(int_v_t_paths[:, i - 1], int_v_t_i)
+            np.copyto(ln_x_t_paths[:, i], ln_x_t_i)
+        else:
+            int_v_t_paths[:, 0] += int_v_t_i
+            path_observer.update_log(ln_x_t_i)
+
+        ln_x_t_i_1 = ln_x_t_i
+        v_t_i_1 = v_t_i
+
+    if store_paths:
+        map_out_put[JUMP_DIFFUSION_OUTPUT.PATHS] = np.exp(ln_x_t_paths)
+        map_out_put[JUMP_DIFFUSION_OUTPUT.SPOT_VARIANCE_PATHS] = v_t_paths
+    else:
+        map_out_put[JUMP_DIFFUSION_OUTPUT.PATHS] = np.exp(ln_x_t_i_1).reshape(no_paths, 1)
+        map_out_put[JUMP_DIFFUSION_OUTPUT.SPOT_VARIANCE_PATHS] = v_t_i_1.reshape(no_paths, 1)
+
+    map_out_put[JUMP_DIFFUSION_OUTPUT.INTEGRAL_VARIANCE_PATHS] = int_v_t_paths
+    map_out_put[JUMP_DIFFUSION_OUTPUT.NO_JUMPS_PATHS] = no_jumps
+    map_out_put[JUMP_DIFFUSION_OUTPUT.TIMES] = t_i
+
+    return map_out_put
@@ -0,0 +1,72 @@
+__author__ = 'David Garcia Lorite'
+
+#
+# Copyright 2020 David Garcia Lorite
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+import numpy as np
+
+from functools import partial
+from MC_Engines.MC_JumpDiffusion import Bates_Engine, Merton_Engine
+from AnalyticEngines.FourierMethod.CharesticFunctions import JumpDiffusionCharesticFunction
+from AnalyticEngines.FourierMethod.COSMethod import COSRepresentation
+from Instruments.EuropeanInstruments import EuropeanOption, TypeSellBuy, TypeEuropeanOption
+from Tools.Types import TYPE_STANDARD_NORMAL_SAMPLING, JUMP_DIFFUSION_OUTPUT
+from Tools import RNG
+
+# option info
+f0 = 100.0
+x0 = np.log(f0)
+t = 1.0
+strikes = np.array([70.0, 80.0, 90.0, 100.0, 110.0, 120.0, 130.0])
+
+# simulation info
+no_paths = 500000
+no_time_steps = 50
+seed = 123456
+rnd_generator = RNG.RndGenerator(seed)
+
+# Bates parameters
+k = 1.5
+theta = 0.04
+epsilon = 0.5
+rho = -0.7
+v0 = 0.04
+jump_mean = -0.1
+jump_std = 0.15
+jump_intensity = 0.5
+parameters_bates = [k, theta, epsilon, rho, jump_mean, jump_std, jump_intensity]
+
+# Merton parameters
+sigma = 0.2
+parameters_merton = [sigma, jump_mean, jump_std, jump_intensity]
+
+output_bates = Bates_Engine.get_path_multi_step(0.0, t, parameters_bates, f0, v0, no_paths, no_time_steps,
+                                                TYPE_STANDARD_NORMAL_SAMPLING.ANTITHETIC, rnd_generator)
+
+output_merton = Merton_Engine.get_path_multi_step(0.0, t, parameters_merton, f0, no_paths, no_time_steps,
+                                                  TYPE_STANDARD_NORMAL_SAMPLING.ANTITHETIC, rnd_generator)
+
+cf_bates = partial(JumpDiffusionCharesticFunction.get_bates_cf, t=t, x=x0, v=v0, r_t=0.0, theta=theta, rho=rho, k=k,
+                   epsilon=epsilon, jump_mean=jump_mean, jump_std=jump_std, jump_intensity=jump_intensity, b=k, u=-0.5)
+
+cf_merton = partial(JumpDiffusionCharesticFunction.get_merton_cf, t=t, x=x0, sigma=sigma, jumpmean=jump_mean,
+                    jumpstd=jump_std, lambda_t=jump_intensity)
+
+cos_bates = COSRepresentation.get_european_option_price_adaptive(TypeEuropeanOption.CALL, strikes, cf_bates)
+cos_merton = COSRepresentation.get_european_option_price_adaptive(TypeEuropeanOption.CALL, strikes, cf_merton)
+
+for i in range(0, len(strikes)):
+    option = EuropeanOption(strikes[i], 1.0, TypeSellBuy.BUY, TypeEuropeanOption.CALL, f0, t)
+    mc_bates = option.get_price(output_bates[JUMP_DIFFUSION_OUTPUT.PATHS])
+    mc_merton = option.get_price(output_merton[JUMP_DIFFUSION_OUTPUT.PATHS])
+    print("K=%.1f Bates MC %.5f (%.5f) COS %.5f | Merton MC %.5f (%.5f) COS %.5f" %
+          (strikes[i], mc_bates[0], mc_bates[1], cos_bates[i], mc_merton[0], mc_merton[1], cos_merton[i]))
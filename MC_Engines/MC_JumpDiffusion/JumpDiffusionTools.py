@@ -0,0 +1,37 @@
+__author__ = 'David Garcia Lorite'
+
+#
+# Copyright 2020 David Garcia Lorite
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+import numba as nb
+import numpy as np
+
+
+@nb.jit("(f8[:],f8[:],f8,f8,f8,f8[:],f8[:])", nopython=True, nogil=True, parallel=True)
+def get_jumps(u_jumps, z_jumps, log_jump_mean, log_jump_std, intensity_dt, jumps, no_jumps):
+    # Compound Poisson increment of one step with log-jumps N(log_jump_mean, log_jump_std^2). The number of jumps n is
+    # the inverse of the Poisson cdf at u_jumps and the sum of the n log-jumps is sampled exactly as
+    # n * log_jump_mean + sqrt(n) * log_jump_std * z_jumps, so we need two random numbers by path and step.
+    no_paths = len(u_jumps)
+    p_0 = np.exp(- intensity_dt)
+
+    for i in nb.prange(0, no_paths):
+        n = 0
+        p_n = p_0
+        cdf = p_0
+        while u_jumps[i] > cdf and p_n > 0.0:
+            n += 1
+            p_n *= intensity_dt / n
+            cdf += p_n
+
+        jumps[i] = n * log_jump_mean + np.sqrt(n) * log_jump_std * z_jumps[i]
+        no_jumps[i] += n
@@ -0,0 +1,90 @@
+__author__ = 'David Garcia Lorite'
+
+#
+# Copyright 2020 David Garcia Lorite
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+import numpy as np
+
+from Tools.Types import Vector, ndarray, JUMP_DIFFUSION_OUTPUT
+from MC_Engines.MC_Heston.Heston_Engine import get_time_steps
+from MC_Engines.MC_JumpDiffusion import JumpDiffusionTools
+from Tools import Types
+from MCPricers.PathObservers import PathObserver
+
+
+def get_path_multi_step(t0: float,
+                        t1: float,
+                        parameters: Vector,
+                        f0: float,
+                        no_paths: int,
+                        no_time_steps: int,
+                        type_random_numbers: Types.TYPE_STANDARD_NORMAL_SAMPLING,
+                        rnd_generator,
+                        path_observer: PathObserver = None,
+                        **kwargs) -> ndarray:
+    # Merton's model with parameters [sigma, jump_mean, jump_std, jump_intensity] as in get_merton_cf, the log-jumps
+    # are N(jump_mean - 0.5 * jump_std^2, jump_std^2). The scheme is exact at the sampling dates.
+    sigma = parameters[0]
+    jump_mean = parameters[1]
+    jump_std = parameters[2]
+    jump_intensity = parameters[3]
+
+    no_paths = 2 * no_paths if type_random_numbers == Types.TYPE_STANDARD_NORMAL_SAMPLING.ANTITHETIC else no_paths
+
+    t_i = np.array(get_time_steps(t0, t1, no_time_steps, **kwargs))
+    no_time_steps = len(t_i)
+    delta_t_i = np.diff(t_i)
+
+    log_jump_mean = jump_mean - 0.5 * jump_std * jump_std
+    drift = - 0.5 * sigma * sigma - jump_intensity * (np.exp(jump_mean) - 1.0)
+
+    store_paths = path_observer is None
+
+    if store_paths:
+        ln_x_t_paths = np.zeros(shape=(no_paths, no_time_steps))
+        ln_x_t_paths[:, 0] = np.log(f0)
+    else:
+        path_observer.initialize(no_paths)
+        path_observer.update(np.full(no_paths, f0))
+
+    ln_x_t_i_1 = np.full(no_paths, np.log(f0))
+    jumps = np.zeros(no_paths)
+    no_jumps = np.zeros(no_paths)
+
+    map_out_put = {}
+
+    for i in range(1, no_time_steps):
+        z_f = rnd_generator.normal(0.0, 1.0, no_paths, type_random_numbers)
+        u_jumps = rnd_generator.uniform(0.0, 1.0, no_paths)
+        z_jumps = rnd_generator.normal(0.0, 1.0, no_paths, type_random_numbers)
+
+        JumpDiffusionTools.get_jumps(u_jumps, z_jumps, log_jump_mean, jump_std, jump_intensity * delta_t_i[i - 1],
+                                     jumps, no_jumps)
+
+        ln_x_t_i = ln_x_t_i_1 + drift * delta_t_i[i - 1] + sigma * np.sqrt(delta_t_i[i - 1]) * z_f + jumps
+
+        if store_paths:
+            np.copyto(ln_x_t_paths[:, i], ln_x_t_i)
+        else:
+            path_observer.update_log(ln_x_t_i)
+
+        ln_x_t_i_1 = ln_x_t_i
+
+    if store_paths:
+        map_out_put[JUMP_DIFFUSION_OUTPUT.PATHS] = np.exp(ln_x_t_paths)
+    else:
+        map_out_put[JUMP_DIFFUSION_OUTPUT.PATHS] = np.exp(ln_x_t_i_1).reshape(no_paths, 1)
+
+    map_out_put[JUMP_DIFFUSION_OUTPUT.NO_JUMPS_PATHS] = no_jumps
+    map_out_put[JUMP_DIFFUSION_OUTPUT.TIMES] = t_i
+
+    return map_out_put
@@ -0,0 +1,52 @@
+__author__ = 'David Garcia Lorite'
+
+#
+# Copyright 2020 David Garcia Lorite
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+import numpy as np
+
+from scipy.special import gamma
+from Tools.Types import Vector, ndarray
+from MC_Engines.MC_Levy import LevyTools
+from Tools import Types
+from MCPricers.PathObservers import PathObserver
+
+
+def get_path_multi_step(t0: float,
+                        t1: float,
+                        parameters: Vector,
+                        f0: float,
+                        no_paths: int,
+                        no_time_steps: int,
+                        type_random_numbers: Types.TYPE_STANDARD_NORMAL_SAMPLING,
+                        rnd_generator,
+                        path_observer: PathObserver = None,
+                        **kwargs) -> ndarray:
+    # CGMY plus a brownian part with parameters [sigma, C, G, M, Y] as in get_CGMYB_cf (r = 0). The jumps are sampled
+    # exactly by rejection from the stable law (see LevyTools.get_tempered_stable), so 0 < Y < 1.
+    sigma = parameters[0]
+    C = parameters[1]
+    G = parameters[2]
+    M = parameters[3]
+    Y = parameters[4]
+
+    no_paths = 2 * no_paths if type_random_numbers == Types.TYPE_STANDARD_NORMAL_SAMPLING.ANTITHETIC else no_paths
+    aux = np.power(M - 1.0, Y) - np.power(M, Y) + np.power(G + 1.0, Y) - np.power(G, Y)
+    wbar = - C * gamma(-Y) * aux
+    drift = - 0.5 * sigma * sigma + wbar
+
+    def get_increments(dt: float, n: int):
+        z_t = rnd_generator.normal(0.0, 1.0, n, type_random_numbers)
+        return drift * dt + sigma * np.sqrt(dt) * z_t + LevyTools.get_cgmy_increments(rnd_generator, n, dt, C, G, M, Y)
+
+    return LevyTools.get_path_multi_step(t0, t1, f0, no_paths, no_time_steps, get_increments, path_observer,
+                                         **kwargs)
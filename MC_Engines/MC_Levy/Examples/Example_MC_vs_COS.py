@@ -0,0 +1,60 @@
+__author__ = 'David Garcia Lorite'
+
+#
+# Copyright 2020 David Garcia Lorite
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+import numpy as np
+
+from functools import partial
+from MC_Engines.MC_Levy import VG_Engine, NIG_Engine, CGMY_Engine
+from AnalyticEngines.FourierMethod.CharesticFunctions import JumpDiffusionCharesticFunction
+from AnalyticEngines.FourierMethod.COSMethod import COSRepresentation
+from Instruments.EuropeanInstruments import EuropeanOption, TypeSellBuy, TypeEuropeanOption
+from Tools.Types import TYPE_STANDARD_NORMAL_SAMPLING, LEVY_OUTPUT
+from Tools import RNG
+
+# option info
+f0 = 100.0
+x0 = np.log(f0)
+t = 1.0
+strikes = np.array([70.0, 80.0, 90.0, 100.0, 110.0, 120.0, 130.0])
+
+# simulation info
+no_paths = 250000
+no_time_steps = 12
+seed = 123456
+rnd_generator = RNG.RndGenerator(seed)
+
+# VG, NIG and CGMY parameters
+parameters_vg = [0.18, 0.25, -0.13]
+parameters_nig = [0.1, 15.0, -5.0, 0.5]
+parameters_cgmy = [0.1, 1.0, 5.0, 5.0, 0.5]
+
+engines = [("VG", VG_Engine, parameters_vg,
+            partial(JumpDiffusionCharesticFunction.get_VG_cf, t=t, x=x0, r=0.0, sigma=parameters_vg[0],
+                    beta=parameters_vg[1], theta=parameters_vg[2])),
+           ("NIG", NIG_Engine, parameters_nig,
+            partial(JumpDiffusionCharesticFunction.get_NIGB_cf, t=t, x=x0, r=0.0, sigma=parameters_nig[0],
+                    alpha=parameters_nig[1], beta=parameters_nig[2], delta=parameters_nig[3])),
+           ("CGMY", CGMY_Engine, parameters_cgmy,
+            partial(JumpDiffusionCharesticFunction.get_CGMYB_cf, t=t, x=x0, r=0.0, sigma=parameters_cgmy[0],
+                    C=parameters_cgmy[1], G=parameters_cgmy[2], M=parameters_cgmy[3], Y=parameters_cgmy[4]))]
+
+for name, engine, parameters, cf in engines:
+    output = engine.get_path_multi_step(0.0, t, parameters, f0, no_paths, no_time_steps,
+                                        TYPE_STANDARD_NORMAL_SAMPLING.ANTITHETIC, rnd_generator)
+    cos_prices = COSRepresentation.get_european_option_price_adaptive(TypeEuropeanOption.CALL, strikes, cf)
+
+    for i in range(0, len(strikes)):
+        option = EuropeanOption(strikes[i], 1.0, TypeSellBuy.BUY, TypeEuropeanOption.CALL, f0, t)
+        mc_price = option.get_price(output[LEVY_OUTPUT.PATHS])
+        print("%s K=%.1f MC %.5f (%.5f) COS %.5f" % (name, strikes[i], mc_price[0], mc_price[1], cos_prices[i]))
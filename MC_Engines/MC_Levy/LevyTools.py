@@ -0,0 +1,127 @@
+__author__ = 'David Garcia Lorite'
+
+#
+# Copyright 2020 David Garcia Lorite
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+import numba as nb
+import numpy as np
+
+from typing import Callable
+from scipy.special import gamma
+from Tools.Types import ndarray, LEVY_OUTPUT
+from MC_Engines.MC_Heston.Heston_Engine import get_time_steps
+from MCPricers.PathObservers import PathObserver
+
+
+@nb.jit("f8[:](f8[:],f8[:],f8[:],f8,f8,f8,f8)", nopython=True, nogil=True, parallel=True)
+def get_subordinated_increments(tau, z_tau, z_t, drift_dt, theta, sigma_tau, sigma_dt):
+    # drift_dt + theta * tau + sigma_tau * W(tau) + sigma_dt * z_t, with tau the increment of the subordinator and
+    # W(tau) = sqrt(tau) * z_tau.
+    no_paths = len(tau)
+    output = np.empty(no_paths)
+    for i in nb.prange(0, no_paths):
+        output[i] = drift_dt + theta * tau[i] + sigma_tau * np.sqrt(tau[i]) * z_tau[i] + sigma_dt * z_t[i]
+
+    return output
+
+
+@nb.jit("f8[:](f8[:],f8[:],f8,f8)", nopython=True, nogil=True, parallel=True)
+def get_positive_stable(u, u_exp, c, y):
+    # Kanter's representation of the positive stable law with Laplace transform exp(- c * s^y), 0 < y < 1.
+    no_paths = len(u)
+    output = np.empty(no_paths)
+    scale = np.power(c, 1.0 / y)
+    for i in nb.prange(0, no_paths):
+        v = np.pi * u[i]
+        a_v = np.power(np.power(np.sin(y * v), y) * np.power(np.sin((1.0 - y) * v), 1.0 - y) / np.sin(v),
+                       1.0 / (1.0 - y))
+        output[i] = scale * np.power(a_v / (- np.log(u_exp[i])), (1.0 - y) / y)
+
+    return output
+
+
+def get_tempered_stable(rnd_generator, no_paths: int, c: float, lambda_t: float, y: float) -> ndarray:
+    # Increments with Levy measure c_0 * exp(- lambda_t * x) * x^(-1-y) on x > 0, where c = - c_0 * gamma(-y) * dt.
+    # A stable sample S is accepted with probability exp(- lambda_t * S), the step is split in sub-steps so the
+    # acceptance rate exp(- c * lambda_t^y / no_sub_steps) is at least exp(-1). The rejected paths are sampled again
+    # in bulk.
+    no_sub_steps = max(1, int(np.ceil(c * np.power(lambda_t, y))))
+    c_sub_step = c / no_sub_steps
+    output = np.zeros(no_paths)
+
+    for _ in range(0, no_sub_steps):
+        pending = np.arange(0, no_paths)
+        while len(pending) > 0:
+            no_pending = len(pending)
+            s = get_positive_stable(rnd_generator.uniform(0.0, 1.0, no_pending),
+                                    rnd_generator.uniform(0.0, 1.0, no_pending), c_sub_step, y)
+            accepted = rnd_generator.uniform(0.0, 1.0, no_pending) <= np.exp(- lambda_t * s)
+            output[pending[accepted]] += s[accepted]
+            pending = pending[~accepted]
+
+    return output
+
+
+def get_cgmy_increments(rnd_generator, no_paths: int, dt: float, C: float, G: float, M: float, Y: float) -> ndarray:
+    # Pure jump part of get_CGMYB_cf, the difference of two independent tempered stable subordinators.
+    if Y <= 0.0 or Y >= 1.0:
+        raise Exception("The CGMY sampler needs 0 < Y < 1, Y = " + str(Y) + ".")
+
+    c = - C * gamma(-Y) * dt
+    return get_tempered_stable(rnd_generator, no_paths, c, M, Y) - get_tempered_stable(rnd_generator, no_paths, c, G, Y)
+
+
+def get_path_multi_step(t0: float,
+                        t1: float,
+                        f0: float,
+                        no_paths: int,
+                        no_time_steps: int,
+                        get_increments: Callable[[float, int], ndarray],
+                        path_observer: PathObserver = None,
+                        **kwargs):
+    # Paths of f0 * exp(X_t) where get_increments(dt, no_paths) samples the increments of the Levy process X. The
+    # output is the matrix (paths, fixings) or only the last fixing if there is a path observer.
+    t_i = np.array(get_time_steps(t0, t1, no_time_steps, **kwargs))
+    no_time_steps = len(t_i)
+    delta_t_i = np.diff(t_i)
+
+    store_paths = path_observer is None
+
+    if store_paths:
+        ln_x_t_paths = np.zeros(shape=(no_paths, no_time_steps))
+        ln_x_t_paths[:, 0] = np.log(f0)
+    else:
+        path_observer.initialize(no_paths)
+        path_observer.update(np.full(no_paths, f0))
+
+    ln_x_t_i_1 = np.full(no_paths, np.log(f0))
+
+    map_out_put = {}
+
+    for i in range(1, no_time_steps):
+        ln_x_t_i = ln_x_t_i_1 + get_increments(delta_t_i[i - 1], no_paths)
+
+        if store_paths:
+            np.copyto(ln_x_t_paths[:, i], ln_x_t_i)
+        else:
+            path_observer.update_log(ln_x_t_i)
+
+        ln_x_t_i_1 = ln_x_t_i
+
+    if store_paths:
+        map_out_put[LEVY_OUTPUT.PATHS] = np.exp(ln_x_t_paths)
+    else:
+        map_out_put[LEVY_OUTPUT.PATHS] = np.exp(ln_x_t_i_1).reshape(no_paths, 1)
+
+    map_out_put[LEVY_OUTPUT.TIMES] = t_i
+
+    return map_out_put
@@ -0,0 +1,48 @@
+__author__ = 'David Garcia Lorite'
+
+#
+# Copyright 2020 David Garcia Lorite
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and limitations under the License.
+#
+
+import numpy as np
+
+from Tools.Types import Vector, ndarray
+from MC_Engines.MC_Levy import LevyTools
+from Tools import Types
+from MCPricers.PathObservers import PathObserver
+
+
+def get_path_multi_step(t0: float,
+                        t1: float,
+                        parameters: Vector,
+                        f0: float,
+                        no_paths: int,
+                        no_time_steps: int,
+                        type_random_numbers: Types.TYPE_STANDARD_NORMAL_SAMPLING,
+                        rnd_generator,
+                        path_observer: PathObserver = None,
+                        **kwargs) -> ndarray:
+    # Variance gamma with parameters [sigma, beta, theta] as in get_VG_cf (r = 0). X_t = wbar * t + theta * G_t +
+    # sigma * W(G_t) where G_t is a gamma subordinator with mean t and variance beta * t.
+    sigma = parameters[0]
+    beta = parameters[1]
+    theta = parameters[2]
+
+    no_paths = 2 * no_paths if type_random_numbers == Types.TYPE_STANDARD_NORMAL_SAMPLING.ANTITHETIC else no_paths
+    wbar = (1.0 / beta) * np.log(1.0 - beta * (theta + 0.5 * sigma * sigma))
+
+    def get_increments(dt: float, n: int):
+        tau = rnd_generator.gamma(dt / beta, beta, n)
+        z_tau = rnd_generator.normal(0.0, 1.0, n, type_random_numbers)
+        return LevyTools.get_subordinated_increments(tau, z_tau, z_tau, wbar * dt, theta, sigma, 0.0)
+
+    return LevyTools.get_path_multi_step(t0, t1, f0, no_paths, no_time_steps, get_increments, path_observer,
+                                         **kwargs)
@@ -16,6 +16,7 @@ import numpy as np
 
 from Tools import Types, AnalyticTools
 from typing import Callable
+from MCPricers.PathObservers import PathObserver
 
 
 def get_path_multi_step(t0: float,
@@ -26,6 +27,7 @@ def get_path_multi_step(t0: float,
                         type_random_number: Types.TYPE_STANDARD_NORMAL_SAMPLING,
                         local_vol: Callable[[float, Types.ndarray], Types.ndarray],
                         rnd_generator,
+                        path_observer: PathObserver = None,
                         **kwargs) -> map:
 
     no_paths = 2 * no_paths if type_random_number == Types.TYPE_STANDARD_NORMAL_SAMPLING.ANTITHETIC else no_paths
@@ -36,12 +38,22 @@ def get_path_multi_step(t0: float,
     t_i = np.linspace(t0, t1, no_time_steps)
     delta_t_i = np.diff(t_i)
 
-    x_t = np.empty((no_paths, no_time_steps))
-    int_v_t = np.empty((no_paths, no_time_steps - 1))
-    v_t = np.empty((no_paths, no_time_steps))
+    # With a path observer, we only keep the last values of each path and the observer gets the running aggregates.
+    store_paths = path_observer is None
 
-    x_t[:, 0] = np.log(f0)
-    v_t[:, 0] = local_vol(t0, x_t[:, 0])
+    x_t_i_1 = np.full(no_paths, np.log(f0))
+    v_t_i = local_vol(t0, x_t_i_1)
+
+    if store_paths:
+        x_t = np.empty((no_paths, no_time_steps))
+        int_v_t = np.empty((no_paths, no_time_steps - 1))
+        v_t = np.empty((no_paths, no_time_steps))
+        x_t[:, 0] = x_t_i_1
+        v_t[:, 0] = v_t_i
+    else:
+        int_v_t = np.zeros((no_paths, 1))
+        path_observer.initialize(no_paths)
+        path_observer.update(np.full(no_paths, f0))
 
     sigma_i_1 = np.zeros(no_paths)
     sigma_i = np.zeros(no_paths)
@@ -52,15 +64,27 @@ def get_path_multi_step(t0: float,
 
     for i_step in range(1, no_time_steps):
         z_i = rnd_generator.normal(0.0, 1.0, no_paths, type_random_number)
-        np.copyto(sigma_i_1, local_vol(t_i[i_step - 1], x_t[:, i_step - 1]))
-        np.copyto(x_t_i_mean, x_t[:, i_step - 1]-0.5 * np.power(sigma_i_1, 2.0))
+        np.copyto(sigma_i_1, local_vol(t_i[i_step - 1], x_t_i_1))
+        np.copyto(x_t_i_mean, x_t_i_1 - 0.5 * np.power(sigma_i_1, 2.0))
         np.copyto(sigma_i, local_vol(t_i[i_step], x_t_i_mean))
         np.copyto(sigma_t, 0.5 * (sigma_i_1 + sigma_i))
-        v_t[:, i_step] = np.power(sigma_t, 2.0)
-        int_v_t[:, i_step - 1] = v_t[:, i_step] * delta_t_i[i_step - 1]
-        x_t[:, i_step] = np.add(x_t[:, i_step - 1],
-                                - 0.5 * v_t[:, i_step] * delta_t_i[i_step - 1] +
-                                np.sqrt(delta_t_i[i_step - 1]) * AnalyticTools.dot_wise(sigma_t, z_i))
+        v_t_i = np.power(sigma_t, 2.0)
+        x_t_i = np.add(x_t_i_1, - 0.5 * v_t_i * delta_t_i[i_step - 1] +
+                       np.sqrt(delta_t_i[i_step - 1]) * AnalyticTools.dot_wise(sigma_t, z_i))
+
+        if store_paths:
+            v_t[:, i_step] = v_t_i
+            int_v_t[:, i_step - 1] = v_t_i * delta_t_i[i_step - 1]
+            x_t[:, i_step] = x_t_i
+        else:
+            int_v_t[:, 0] += v_t_i * delta_t_i[i_step - 1]
+            path_observer.update_log(x_t_i)
+
+        x_t_i_1 = x_t_i
+
+    if not store_paths:
+        x_t = x_t_i_1.reshape(no_paths, 1)
+        v_t = v_t_i.reshape(no_paths, 1)
 
     map_output[Types.LOCAL_VOL_OUTPUT.TIMES] = t_i
 
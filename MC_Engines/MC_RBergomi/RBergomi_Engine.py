@@ -17,6 +17,10 @@ import numpy as np
 
 from MC_Engines.MC_RBergomi import ToolsVariance
 from Tools.Types import Vector, ndarray, TYPE_STANDARD_NORMAL_SAMPLING, RBERGOMI_OUTPUT
+from MCPricers.PathObservers import PathObserver
+
+# Number of paths of each block of noise when the paths are observed on the fly.
+NOISE_BLOCK_SIZE = 10000
 
 
 def get_v_t_sampling(t: float,
@@ -35,6 +39,7 @@ def get_path_multi_step(t0: float,
                         no_time_steps: int,
                         type_random_number: TYPE_STANDARD_NORMAL_SAMPLING,
                         rnd_generator,
+                        path_observer: PathObserver = None,
                         **kwargs) -> map:
     nu = parameters[0]
     rho = parameters[1]
@@ -45,21 +50,44 @@ def get_path_multi_step(t0: float,
     t_i_s = np.array(get_time_steps(t0, t1, no_time_steps, **kwargs))
     no_time_steps = len(t_i_s)
 
-    s_t = np.empty((no_paths, no_time_steps))
-    s_t[:, 0] = f0
-
-    z_i_s = rnd_generator.normal(mu=0.0, sigma=1.0, size=(2 * (no_time_steps - 1), no_paths),
-                                 sampling_type=type_random_number)
     map_out_put = {}
-    outputs = ToolsVariance.generate_paths_rbergomi(f0,
-                                                    sigma_0,
-                                                    nu,
-                                                    rho,
-                                                    h,
-                                                    z_i_s,
-                                                    np.linalg.cholesky(ToolsVariance.get_covariance_matrix(t_i_s[1:], h, rho)),
-                                                    t_i_s,
-                                                    no_paths)
+    cholk_cov = np.linalg.cholesky(ToolsVariance.get_covariance_matrix(t_i_s[1:], h, rho))
+
+    if path_observer is None:
+        z_i_s = rnd_generator.normal(mu=0.0, sigma=1.0, size=(2 * (no_time_steps - 1), no_paths),
+                                     sampling_type=type_random_number)
+        outputs = ToolsVariance.generate_paths_rbergomi(f0,
+                                                        sigma_0,
+                                                        nu,
+                                                        rho,
+                                                        h,
+                                                        z_i_s,
+                                                        cholk_cov,
+                                                        t_i_s,
+                                                        no_paths)
+    else:
+        # The running aggregates are updated inside the kernel and only the terminal values are kept, so the noise is
+        # drawn by blocks of NOISE_BLOCK_SIZE paths and the memory does not grow with the number of paths.
+        path_observer.initialize(no_paths)
+        outputs = (np.empty((no_paths, 1)), np.empty((no_paths, 1)), np.empty((no_paths, 1)))
+        for start in range(0, no_paths, NOISE_BLOCK_SIZE):
+            end = min(start + NOISE_BLOCK_SIZE, no_paths)
+            z_i_s = rnd_generator.normal(mu=0.0, sigma=1.0, size=(2 * (no_time_steps - 1), end - start),
+                                         sampling_type=type_random_number)
+            outputs_block = ToolsVariance.generate_paths_rbergomi_observed(f0,
+                                                                           sigma_0,
+                                                                           nu,
+                                                                           rho,
+                                                                           h,
+                                                                           z_i_s,
+                                                                           cholk_cov,
+                                                                           t_i_s,
+                                                                           end - start,
+                                                                           path_observer.state[start:end],
+                                                                           path_observer.lower_barrier,
+                                                                           path_observer.upper_barrier)
+            for output, output_block in zip(outputs, outputs_block):
+                output[start:end, 0] = output_block
 
     map_out_put[RBERGOMI_OUTPUT.PATHS] = outputs[0]
     map_out_put[RBERGOMI_OUTPUT.SPOT_VOLATILITY_PATHS] = outputs[1]
@@ -18,6 +18,7 @@ from Tools.Types import ndarray
 from scipy.special import hyp2f1
 from Tools import AnalyticTools
 from math import gamma
+from MCPricers.PathObservers import observe_value
 
 
 @nb.jit("f8(f8, f8)", nopython=True, nogil=True)
@@ -230,6 +231,67 @@ def generate_paths_rbergomi(s0: float,
     return paths, sigma_i_1, int_v_t, int_sigma_rho
 
 
+@nb.jit("(f8, f8, f8, f8, f8, f8[:,:], f8[:,:], f8[:], i8, f8[:,:], f8, f8)", nopython=True, nogil=True)
+def generate_paths_rbergomi_observed(s0: float,
+                                     sigma_0: float,
+                                     nu: float,
+                                     rho: float,
+                                     h: float,
+                                     noise: ndarray,
+                                     cholk_cov: ndarray,
+                                     t_i_s: ndarray,
+                                     no_paths: int,
+                                     observer_state: ndarray,
+                                     lower_barrier: float,
+                                     upper_barrier: float):
+    # Same scheme that generate_paths_rbergomi, but only the terminal values are kept and the running aggregates of
+    # each path are updated in the observer state.
+    no_time_steps = len(t_i_s)
+
+    paths = np.zeros(no_paths)
+    int_v_t = np.zeros(no_paths)
+    sigma_t = np.zeros(no_paths)
+
+    # we compute before a loop of variance of the variance process
+    var_w_t = get_volterra_variance(t_i_s[1:], h)
+
+    for k in range(0, no_paths):
+        w_t_k = AnalyticTools.apply_lower_tridiagonal_matrix(cholk_cov, noise[:, k])
+
+        w_i_s_1 = 0.0
+        w_i_h_1 = 0.0
+        var_w_t_i_1 = 0.0
+
+        s_i_1 = s0
+        sigma_i_1 = sigma_0
+        observe_value(observer_state, k, s_i_1, lower_barrier, upper_barrier)
+
+        for j in range(1, no_time_steps):
+            delta_i_s = t_i_s[j] - t_i_s[j - 1]
+
+            # Brownian and Gaussian increments
+            d_w_i_s = w_t_k[j - 1] - w_i_s_1
+            d_w_i_h = w_t_k[j + no_time_steps - 2] - w_i_h_1
+
+            sigma_i = sigma_i_1 * np.exp(- 0.5 * nu * nu * (var_w_t[j - 1] - var_w_t_i_1) + nu * d_w_i_h)
+            int_v_t_i = delta_i_s * 0.5 * (sigma_i_1 * sigma_i_1 + sigma_i * sigma_i)
+            int_v_t[k] += int_v_t_i
+
+            s_i_1 = s_i_1 * np.exp(- 0.5 * int_v_t_i + sigma_i_1 * d_w_i_s)
+            observe_value(observer_state, k, s_i_1, lower_barrier, upper_barrier)
+
+            # Keep the last brownians and variance of the RL process
+            sigma_i_1 = sigma_i
+            w_i_s_1 = w_t_k[j - 1]
+            w_i_h_1 = w_t_k[j + no_time_steps - 2]
+            var_w_t_i_1 = var_w_t[j - 1]
+
+        paths[k] = s_i_1
+        sigma_t[k] = sigma_i_1
+
+    return paths, sigma_t, int_v_t
+
+
 @nb.jit("(f8, f8, f8, f8, f8, f8[:,:], f8[:,:],f8[:,:], f8[:], i8)", nopython=True, nogil=True)
 def generate_paths_compose_rbergomi(s0: float,
                                     sigma_0: float,
@@ -19,6 +19,7 @@ from MC_Engines.MC_SABR import VarianceSamplingMatchingMoment
 from Tools import AnalyticTools
 from Tools.Types import Vector, ndarray, SABR_OUTPUT, TYPE_STANDARD_NORMAL_SAMPLING
 from MC_Engines.MC_SABR import SABRTools
+from MCPricers.PathObservers import PathObserver
 
 
 def get_path_one_step(t0: float,
@@ -112,6 +113,7 @@ def get_path_multi_step(t0: float,
                         no_time_steps: int,
                         type_random_number: TYPE_STANDARD_NORMAL_SAMPLING,
                         rnd_generator,
+                        path_observer: PathObserver = None,
                         **kwargs) -> map:
     alpha = parameters[0]
     nu = parameters[1]
@@ -125,15 +127,27 @@ def get_path_multi_step(t0: float,
 
     delta_t_i = np.diff(t_i)
 
-    s_t = np.empty((no_paths, no_time_steps))
-    sigma_t = np.empty((no_paths, no_time_steps))
-    int_v_t_paths = np.zeros(shape=(no_paths, no_time_steps - 1))
-    int_sigma_w_t_paths = np.zeros(shape=(no_paths, no_time_steps - 1))
+    # With a path observer, we only keep the last values of each path and the observer gets the running aggregates.
+    store_paths = path_observer is None
 
-    s_t[:, 0] = f0
-    sigma_t[:, 0] = alpha
+    if store_paths:
+        s_t = np.empty((no_paths, no_time_steps))
+        sigma_t = np.empty((no_paths, no_time_steps))
+        int_v_t_paths = np.zeros(shape=(no_paths, no_time_steps - 1))
+        int_sigma_w_t_paths = np.zeros(shape=(no_paths, no_time_steps - 1))
+        int_sigma_t_i = np.empty((no_paths, no_time_steps - 1))
 
-    int_sigma_t_i = np.empty((no_paths, no_time_steps - 1))
+        s_t[:, 0] = f0
+        sigma_t[:, 0] = alpha
+    else:
+        int_v_t_paths = np.zeros(shape=(no_paths, 1))
+        int_sigma_w_t_paths = np.zeros(shape=(no_paths, 1))
+        int_sigma_t_i = np.zeros(shape=(no_paths, 1))
+        path_observer.initialize(no_paths)
+        path_observer.update(np.full(no_paths, f0))
+
+    s_t_i_1 = np.full(no_paths, f0)
+    sigma_t_i_1 = np.full(no_paths, alpha)
 
     delta_weight = np.zeros(no_paths)
     gamma_weight = np.zeros(no_paths)
@@ -145,32 +159,44 @@ def get_path_multi_step(t0: float,
     for i_step in range(1, no_time_steps):
         z_i = rnd_generator.normal(0.0, 1.0, no_paths, type_random_number)
         z_sigma = rnd_generator.normal(0.0, 1.0, no_paths, type_random_number)
-        sigma_t_i = get_vol_sampling(t_i[i_step - 1], t_i[i_step], sigma_t[:, i_step - 1], nu, z_sigma)
-        sigma_t[:, i_step] = sigma_t_i
+        sigma_t_i = get_vol_sampling(t_i[i_step - 1], t_i[i_step], sigma_t_i_1, nu, z_sigma)
 
         sqrt_delta_time = np.sqrt(t_i[i_step] - t_i[i_step - 1])
 
-        int_sigma_t_i[:, i_step - 1] = sigma_t[:, i_step - 1] * sigma_t[:, i_step - 1] * delta_t_i[i_step - 1]
+        int_sigma_t = sigma_t_i_1 * sigma_t_i_1 * delta_t_i[i_step - 1]
 
-        diff_sigma = (rho / nu) * (sigma_t_i - sigma_t[:, i_step - 1])
-        noise_sigma = AnalyticTools.dot_wise(np.sqrt(int_sigma_t_i[:, i_step - 1]), z_i)
+        diff_sigma = (rho / nu) * (sigma_t_i - sigma_t_i_1)
+        noise_sigma = AnalyticTools.dot_wise(np.sqrt(int_sigma_t), z_i)
 
-        SABRTools.get_delta_weight(t_i[i_step - 1], t_i[i_step], sigma_t[:, i_step - 1], sigma_t_i, z_sigma, delta_weight)
-        SABRTools.get_var_weight(t_i[i_step - 1], t_i[i_step], sigma_t[:, i_step - 1], sigma_t_i, z_sigma, var_weight)
+        SABRTools.get_delta_weight(t_i[i_step - 1], t_i[i_step], sigma_t_i_1, sigma_t_i, z_sigma, delta_weight)
+        SABRTools.get_var_weight(t_i[i_step - 1], t_i[i_step], sigma_t_i_1, sigma_t_i, z_sigma, var_weight)
 
-        inv_variance += SABRTools.get_integral_variance(t_i[i_step - 1], t_i[i_step], 1.0 / sigma_t[:, i_step - 1],
+        inv_variance += SABRTools.get_integral_variance(t_i[i_step - 1], t_i[i_step], 1.0 / sigma_t_i_1,
                                                         1.0 / sigma_t_i, 0.5, 0.5)
 
-        np.copyto(int_sigma_w_t_paths[:, i_step - 1], SABRTools.get_integral_sigma_w_t(sqrt_delta_time * z_sigma,
-                                                                                       sigma_t[:, i_step - 1], sigma_t_i, 1.0,
-                                                                                       0.0))
-
-        np.copyto(int_v_t_paths[:, i_step - 1], SABRTools.get_integral_variance(t_i[i_step - 1], t_i[i_step],
-                                                                                sigma_t[:, i_step - 1], sigma_t_i, 0.5, 0.5))
-
-        s_t[:, i_step] = AnalyticTools.dot_wise(s_t[:, i_step - 1],
-                                                np.exp(- 0.5 * int_sigma_t_i[:, i_step - 1] +
-                                                       diff_sigma + rho_inv * noise_sigma))
+        int_sigma_w_t = SABRTools.get_integral_sigma_w_t(sqrt_delta_time * z_sigma, sigma_t_i_1, sigma_t_i, 1.0, 0.0)
+        int_v_t = SABRTools.get_integral_variance(t_i[i_step - 1], t_i[i_step], sigma_t_i_1, sigma_t_i, 0.5, 0.5)
+
+        s_t_i = AnalyticTools.dot_wise(s_t_i_1, np.exp(- 0.5 * int_sigma_t + diff_sigma + rho_inv * noise_sigma))
+
+        if store_paths:
+            sigma_t[:, i_step] = sigma_t_i
+            int_sigma_t_i[:, i_step - 1] = int_sigma_t
+            np.copyto(int_sigma_w_t_paths[:, i_step - 1], int_sigma_w_t)
+            np.copyto(int_v_t_paths[:, i_step - 1], int_v_t)
+            s_t[:, i_step] = s_t_i
+        else:
+            int_sigma_t_i[:, 0] += int_sigma_t
+            int_sigma_w_t_paths[:, 0] += int_sigma_w_t
+            int_v_t_paths[:, 0] += int_v_t
+            path_observer.update(s_t_i)
+
+        s_t_i_1 = s_t_i
+        sigma_t_i_1 = sigma_t_i
+
+    if not store_paths:
+        s_t = s_t_i_1.reshape(no_paths, 1)
+        sigma_t = sigma_t_i_1.reshape(no_paths, 1)
 
     map_output[SABR_OUTPUT.DELTA_MALLIAVIN_WEIGHTS_PATHS_TERMINAL] = delta_weight
     map_output[SABR_OUTPUT.PATHS] = s_t
@@ -0,0 +1,190 @@
+import numpy as np
+
+from Solvers.PDE_Solver.PDEs import PDE2D
+from Solvers.PDE_Solver.Operators import Gradient, Laplacian, get_stencil
+from Solvers.PDE_Solver.BoundariesConditions import BoundaryCondition, Zero_Laplacian_BC
+from Solvers.PDE_Solver.TerminalConditions import TerminalCondition
+from Solvers.PDE_Solver.Types import ADISchemeType
+from Solvers.PDE_Solver.Meshes import Mesh
+from Solvers.PDE_Solver import Tools
+
+
+def get_default_theta(adi_scheme: ADISchemeType):
+    if adi_scheme == ADISchemeType.MODIFIED_CRAIG_SNEYD:
+        return 1.0 / 3.0
+    elif adi_scheme == ADISchemeType.HUNDSDORFER_VERWER:
+        return 0.5 + np.sqrt(3.0) / 6.0
+    else:
+        return 0.5
+
+
+class ADISolver(object):
+    # Backward solver of the 2-D PDE u_t + A_0 u + A_1 u + A_2 u = 0, where A_0 is the mixed derivative term (always
+    # explicit) and A_1, A_2 are the terms in x and y (implicit in its own direction). The source is split between
+    # A_1 and A_2. The derivatives are the 1-D Gradient and Laplacian stencils of each mesh and the boundary nodes of
+    # both directions are extrapolated with the zero laplacian condition after each sweep.
+    def __init__(self,
+                 mesh_t: Mesh,
+                 mesh_x: Mesh,
+                 mesh_y: Mesh,
+                 pde: PDE2D,
+                 adi_scheme: ADISchemeType,
+                 bc_x: BoundaryCondition,
+                 bc_y: BoundaryCondition,
+                 tc: TerminalCondition,
+                 theta: float = None):
+
+        if not isinstance(bc_x, Zero_Laplacian_BC) or not isinstance(bc_y, Zero_Laplacian_BC):
+            raise Exception("The ADI solver only supports the zero laplacian boundary condition.")
+
+        if adi_scheme == ADISchemeType.UNKNOWN:
+            raise Exception("The ADI scheme " + str(adi_scheme) + " is not implemented.")
+
+        self._mesh_t = mesh_t
+        self._mesh_x = mesh_x
+        self._mesh_y = mesh_y
+        self._pde = pde
+        self._adi_scheme = adi_scheme
+        self._theta = get_default_theta(adi_scheme) if theta is None else theta
+        self._bc_x = bc_x
+        self._bc_y = bc_y
+        self._tc = tc
+
+        self._x, self._y = np.meshgrid(mesh_x.get_points(), mesh_y.get_points(), indexing='ij')
+        self._gradient_x = get_stencil(Gradient(mesh_x, bc_x), mesh_x)
+        self._laplacian_x = get_stencil(Laplacian(mesh_x, bc_x), mesh_x)
+        self._gradient_y = get_stencil(Gradient(mesh_y, bc_y), mesh_y)
+        self._laplacian_y = get_stencil(Laplacian(mesh_y, bc_y), mesh_y)
+        self._w_x = Zero_Laplacian_BC.get_extrapolation_weights(mesh_x)
+        self._w_y = Zero_Laplacian_BC.get_extrapolation_weights(mesh_y)
+
+        self._operator_x = None
+        self._operator_y = None
+        self._mixed = None
+        self._u = None
+
+        # Matrices of I - alpha A_x and I - alpha A_y with the layout of Tools.tdr_batch_solver (the systems of the y
+        # direction are the rows of u, so they are stored transposed) and its work buffers. The operators keep the
+        # coefficients of the node i in the position i, so the off-diagonals of the systems drop the boundary row.
+        self._alpha = None
+        self._system_x = None
+        self._system_y = None
+        self._gamma_x = np.empty((mesh_x.get_size(), mesh_y.get_size()))
+        self._gamma_y = np.empty((mesh_y.get_size(), mesh_x.get_size()))
+
+    def get_solution(self):
+        # Matrix (nodes_x x nodes_y) with the solution at the first point of mesh_t.
+        return self._u
+
+    def get_theta(self):
+        return self._theta
+
+    def update_operators(self, t: float):
+        source = 0.5 * self._pde.source(t, self._x, self._y)
+        diffusion_x = self._pde.diffusion_x(t, self._x, self._y)
+        convection_x = self._pde.convection_x(t, self._x, self._y)
+        diffusion_y = self._pde.diffusion_y(t, self._x, self._y)
+        convection_y = self._pde.convection_y(t, self._x, self._y)
+
+        self._operator_x = []
+        for j in range(0, 3):
+            self._operator_x.append(diffusion_x * self._laplacian_x[j][:, None] +
+                                    convection_x * self._gradient_x[j][:, None])
+
+        self._operator_y = []
+        for j in range(0, 3):
+            self._operator_y.append(diffusion_y * self._laplacian_y[j][None, :] +
+                                    convection_y * self._gradient_y[j][None, :])
+
+        self._operator_x[1][1:-1, :] += source[1:-1, :]
+        self._operator_y[1][:, 1:-1] += source[:, 1:-1]
+        self._mixed = np.ascontiguousarray(self._pde.mixed(t, self._x, self._y), dtype=float)
+        self._alpha = None
+
+    def update_systems(self, alpha: float):
+        # The systems only change with alpha or with the operators.
+        if alpha != self._alpha:
+            self._system_x = [- alpha * self._operator_x[0][1:, :],
+                              1.0 - alpha * self._operator_x[1],
+                              - alpha * self._operator_x[2][:-1, :]]
+            self._system_y = [np.ascontiguousarray(- alpha * self._operator_y[0][:, 1:].T),
+                              np.ascontiguousarray(1.0 - alpha * self._operator_y[1].T),
+                              np.ascontiguousarray(- alpha * self._operator_y[2][:, :-1].T)]
+            self._alpha = alpha
+
+    def apply_f_0(self, u: np.ndarray):
+        return Tools.apply_mixed_operator(self._mixed, *self._gradient_x, *self._gradient_y, u)
+
+    def apply_f_1(self, u: np.ndarray):
+        return Tools.apply_operator_x(self._operator_x[1], self._operator_x[0], self._operator_x[2], u)
+
+    def apply_f_2(self, u: np.ndarray):
+        return Tools.apply_operator_y(self._operator_y[1], self._operator_y[0], self._operator_y[2], u)
+
+    # Solution of (I - alpha A_x) u = b and (I - alpha A_y) u = b, b is overwritten with u.
+    def solve_1(self, alpha: float, b: np.ndarray):
+        self.update_systems(alpha)
+        Tools.tdr_batch_solver(self._system_x[1], self._system_x[0], self._system_x[2], b, self._gamma_x, b)
+        return b
+
+    def solve_2(self, alpha: float, b: np.ndarray):
+        self.update_systems(alpha)
+        Tools.tdr_batch_solver(self._system_y[1], self._system_y[0], self._system_y[2], b.T, self._gamma_y, b.T)
+        return b
+
+    def apply_boundary_condition(self, u: np.ndarray):
+        u[0, :] = self._w_x[0] * u[1, :] + self._w_x[1] * u[2, :]
+        u[-1, :] = self._w_x[2] * u[-3, :] + self._w_x[3] * u[-2, :]
+        u[:, 0] = self._w_y[0] * u[:, 1] + self._w_y[1] * u[:, 2]
+        u[:, -1] = self._w_y[2] * u[:, -3] + self._w_y[3] * u[:, -2]
+        return u
+
+    def step_solver(self, delta_t: float, u: np.ndarray):
+        # One step of the ADI scheme from u at t_{i+1} to t_i (in 't Hout and Foulon notation with the time to
+        # maturity as time variable).
+        theta_dt = self._theta * delta_t
+        f_0 = self.apply_f_0(u)
+        f_1 = self.apply_f_1(u)
+        f_2 = self.apply_f_2(u)
+
+        y_0 = u + delta_t * (f_0 + f_1 + f_2)
+        y_1 = self.apply_boundary_condition(self.solve_1(theta_dt, y_0 - theta_dt * f_1))
+        y_2 = self.apply_boundary_condition(self.solve_2(theta_dt, y_1 - theta_dt * f_2))
+
+        if self._adi_scheme == ADISchemeType.DOUGLAS:
+            return y_2
+
+        if self._adi_scheme == ADISchemeType.CRAIG_SNEYD:
+            y_0_tilde = y_0 + 0.5 * delta_t * (self.apply_f_0(y_2) - f_0)
+        elif self._adi_scheme == ADISchemeType.MODIFIED_CRAIG_SNEYD:
+            f_0_y_2 = self.apply_f_0(y_2)
+            y_0_tilde = y_0 + theta_dt * (f_0_y_2 - f_0) + \
+                (0.5 - self._theta) * delta_t * (f_0_y_2 + self.apply_f_1(y_2) + self.apply_f_2(y_2) - f_0 - f_1 - f_2)
+        else:
+            f_1_y_2 = self.apply_f_1(y_2)
+            f_2_y_2 = self.apply_f_2(y_2)
+            y_0_tilde = y_0 + 0.5 * delta_t * (self.apply_f_0(y_2) + f_1_y_2 + f_2_y_2 - f_0 - f_1 - f_2)
+            # Hundsdorfer-Verwer corrects with the operators applied to y_2 instead of u.
+            f_1 = f_1_y_2
+            f_2 = f_2_y_2
+
+        y_1_tilde = self.apply_boundary_condition(self.solve_1(theta_dt, y_0_tilde - theta_dt * f_1))
+        return self.apply_boundary_condition(self.solve_2(theta_dt, y_1_tilde - theta_dt * f_2))
+
+    def solver(self):
+        # The terminal condition is the functional of mesh_x and it is broadcast in the y direction.
+        u = np.array(self._tc.get_value(self._mesh_x), dtype=float)
+        if u.ndim == 1:
+            u = np.repeat(u[:, None], self._mesh_y.get_size(), axis=1)
+
+        no_t_i = self._mesh_t.get_size()
+        is_updated = False
+        for i in range(no_t_i - 2, -1, -1):
+            if not self._pde.time_homogeneous or not is_updated:
+                self.update_operators(self._mesh_t.get_point(i))
+                is_updated = True
+
+            u = self.step_solver(self._mesh_t.get_point(i + 1) - self._mesh_t.get_point(i), u)
+
+        self._u = u
+        return u
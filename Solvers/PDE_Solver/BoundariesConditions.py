@@ -1,3 +1,5 @@
+import numpy as np
+
 from abc import abstractmethod
 from Solvers.PDE_Solver.Types import BoundaryConditionType
 
@@ -27,16 +29,15 @@ class Zero_Laplacian_BC(BoundaryCondition):
         operator.diagonal()[0] = 0.0
         operator.diagonal()[-1] = 0.0
 
-    def apply_boundary_condition_after_update(self, **kwargs):
-        operator = kwargs['operator']
-        mesh = operator.get_mesh()
-        no_nodes = mesh.get_size()
-
-        delta_r_0 = mesh.get_shift()[0]
-        delta_l_0 = mesh.get_shift()[1]
+    @staticmethod
+    def get_extrapolation_weights(mesh):
+        # The values at the boundary nodes are w_0 * u_1 + w_1 * u_2 and w_2 * u_{N-2} + w_3 * u_{N-1}, from the zero
+        # laplacian at the nodes 1 and N-2 with the left and right spacings of each node (non-uniform meshes).
+        delta_l_0 = mesh.get_shift()[0]
+        delta_r_0 = mesh.get_shift()[1]
 
-        delta_r_N = mesh.get_shift()[-2]
-        delta_l_N = mesh.get_shift()[-1]
+        delta_l_N = mesh.get_shift()[-2]
+        delta_r_N = mesh.get_shift()[-1]
 
         w_l_0 = 2.0 / (delta_l_0 * (delta_r_0 + delta_l_0))
         w_c_0 = - 2.0 / (delta_l_0 * delta_r_0)
@@ -46,9 +47,16 @@ class Zero_Laplacian_BC(BoundaryCondition):
         w_c_N = - 2.0 / (delta_l_N * delta_r_N)
         w_u_N = 2.0 / (delta_r_N * (delta_r_N + delta_l_N))
 
-        kwargs['u_t'][0] = - (w_c_0 / w_l_0) * kwargs['u_t'][1] - (w_u_0 / w_l_0) * kwargs['u_t'][2]
-        kwargs['u_t'][no_nodes - 1] = - (w_l_N / w_u_N) * kwargs['u_t'][no_nodes - 3] - \
-                                      (w_c_N / w_u_N) * kwargs['u_t'][no_nodes - 2]
+        return np.array([- (w_c_0 / w_l_0), - (w_u_0 / w_l_0), - (w_l_N / w_u_N), - (w_c_N / w_u_N)])
+
+    def apply_boundary_condition_after_update(self, **kwargs):
+        operator = kwargs['operator']
+        mesh = operator.get_mesh()
+        no_nodes = mesh.get_size()
+        w = self.get_extrapolation_weights(mesh)
+
+        kwargs['u_t'][0] = w[0] * kwargs['u_t'][1] + w[1] * kwargs['u_t'][2]
+        kwargs['u_t'][no_nodes - 1] = w[2] * kwargs['u_t'][no_nodes - 3] + w[3] * kwargs['u_t'][no_nodes - 2]
 
 
 class RobinCondition(BoundaryCondition):
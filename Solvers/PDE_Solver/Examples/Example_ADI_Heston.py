@@ -0,0 +1,52 @@
+import numpy as np
+import time
+
+from scipy.interpolate import RectBivariateSpline
+from Solvers.PDE_Solver.ADISolvers import ADISolver
+from Solvers.PDE_Solver.Meshes import uniform_mesh, Mesh
+from Solvers.PDE_Solver.PDEs import LN_HESTON_PDE, PDE2D
+from Solvers.PDE_Solver.Types import ADISchemeType, np_ndarray
+from Solvers.PDE_Solver.TerminalConditions import TerminalCondition
+from Solvers.PDE_Solver.BoundariesConditions import Zero_Laplacian_BC
+from AnalyticEngines.FourierMethod.QuadratureMethod.HestonQuadrature import get_heston_price_surface
+from Instruments.EuropeanInstruments import TypeEuropeanOption
+
+T = 1.0
+r = 0.02
+S0 = 100.0
+K = 110.0
+
+k = 1.5
+theta = 0.04
+epsilon = 0.3
+rho = -0.7
+v0 = 0.04
+
+start_time = time.time()
+analytic_price = get_heston_price_surface(TypeEuropeanOption.CALL, S0, np.array([K]), np.array([T]), r, theta, rho,
+                                          k, epsilon, v0)[0, 0]
+end_time = time.time()
+print(end_time - start_time)
+print(analytic_price)
+
+mesh_t = Mesh(uniform_mesh, 101, 0.0, T)
+mesh_x = Mesh(uniform_mesh, 321, np.log(S0) - 2.0, np.log(S0) + 2.0)
+mesh_v = Mesh(uniform_mesh, 121, 0.0, 1.0)
+
+heston_pde = PDE2D.from_ipde_terms(LN_HESTON_PDE(r, 0.0, k, theta, epsilon, rho))
+
+
+def f_ln_payoff(mesh: Mesh) -> np_ndarray:
+    return np.maximum(np.exp(mesh.get_points()) - K, 0.0)
+
+
+tc = TerminalCondition(f_ln_payoff)
+
+for adi_scheme in [ADISchemeType.DOUGLAS, ADISchemeType.CRAIG_SNEYD, ADISchemeType.MODIFIED_CRAIG_SNEYD,
+                   ADISchemeType.HUNDSDORFER_VERWER]:
+    adi_solver = ADISolver(mesh_t, mesh_x, mesh_v, heston_pde, adi_scheme, Zero_Laplacian_BC(), Zero_Laplacian_BC(), tc)
+    start_time = time.time()
+    u = adi_solver.solver()
+    end_time = time.time()
+    f = RectBivariateSpline(mesh_x.get_points(), mesh_v.get_points(), u)
+    print(adi_scheme.name, end_time - start_time, f(np.log(S0), v0)[0, 0])
@@ -0,0 +1,56 @@
+import numpy as np
+
+from Solvers.PDE_Solver import PDESolvers
+from Solvers.PDE_Solver import PDEOperators
+from scipy.interpolate import interp1d
+from Solvers.PDE_Solver.Meshes import uniform_mesh, get_concentrated_mesh_generator, Mesh, LnUnderlyingMesh
+from Solvers.PDE_Solver.PDEs import LN_BS_PDE, PDE
+from Solvers.PDE_Solver.Types import BoundaryConditionType, np_ndarray, SchemeType
+from Solvers.PDE_Solver.TerminalConditions import TerminalCondition
+from Solvers.PDE_Solver.BoundariesConditions import Zero_Laplacian_BC
+from MCPricers.EuropeanPricers import black_scholes
+
+T = 1.0
+mesh_t = Mesh(uniform_mesh, 400, 0.0, T)
+
+r = 0.02
+q = 0.0
+sigma = 0.3
+
+S0 = 100.0
+K = 110.0
+
+f = np.exp((r - q) * T) * S0
+df = np.exp(-r * T)
+analytic_price = df * (black_scholes(f, K, sigma, T, 1) - f + K)
+
+bs_pde = PDE.from_ipde_terms(LN_BS_PDE(r, q, sigma))
+bc = Zero_Laplacian_BC()
+
+
+def f_ln_payoff(mesh: Mesh) -> np_ndarray:
+    return np.maximum(K - np.exp(mesh.get_points()), 0.0)
+
+
+tc = TerminalCondition(f_ln_payoff)
+
+# The concentrated mesh has the strike in the middle of a cell and more nodes around the strike and the spot.
+concentrated_mesh = get_concentrated_mesh_generator([np.log(K), np.log(S0)], 0.4, np.log(K), True)
+
+for no_nodes in [41, 81, 161]:
+    errors = []
+    for generator in [uniform_mesh, concentrated_mesh]:
+        mesh_x = LnUnderlyingMesh(r, q, sigma, S0, T, 1.0 - 1e-12, generator, no_nodes)
+        operators = [PDEOperators.LinearPDEOperator(mesh_x, bs_pde, bc),
+                     PDEOperators.LinearPDEOperator(mesh_x, bs_pde, bc)]
+        pd_solver = PDESolvers.FDSolver(mesh_t,
+                                        mesh_x,
+                                        operators,
+                                        SchemeType.CRANK_NICOLSON,
+                                        BoundaryConditionType.ZERO_LAPLACIAN,
+                                        tc)
+        pd_solver.solver()
+        f_u = interp1d(mesh_x.get_points(), pd_solver.get_solution_grid()[:, 0], kind='cubic')
+        errors.append(float(f_u(np.log(S0))) - analytic_price)
+
+    print(no_nodes, errors)
@@ -0,0 +1,37 @@
+import numpy as np
+import time
+
+from AnalyticEngines.LocalVolatility.Dupire.ForwardPDEPricer import DupireForwardPDEPricer
+from Solvers.PDE_Solver.Meshes import uniform_mesh, Mesh
+from MCPricers.EuropeanPricers import black_scholes
+
+# Local vol sigma(T) = 0.2 + 0.1 T, the call prices are Black-Scholes prices with the mean variance. With a SVILocalVol
+# or SABRLocalVol the pricer is built with DupireForwardPDEPricer.from_local_vol.
+sigma_0 = 0.2
+sigma_1 = 0.1
+
+
+def f_local_vol(t: float, y: np.ndarray):
+    return (sigma_0 + sigma_1 * t) * np.ones(len(y))
+
+
+f0 = 100.0
+r = 0.03
+maturities = np.array([0.25, 0.5, 1.0, 2.0])
+strikes = np.array([70.0, 90.0, 100.0, 110.0, 130.0])
+forwards = f0 * np.exp(r * maturities)
+discount_factors = np.exp(- r * maturities)
+
+mesh_y = Mesh(uniform_mesh, 801, -3.0, 3.0)
+pricer = DupireForwardPDEPricer(f_local_vol, maturities[-1], 200, mesh_y)
+
+start_time = time.time()
+pde_prices = pricer.get_call_prices(maturities, strikes, forwards, discount_factors)
+end_time = time.time()
+print(end_time - start_time)
+
+for i in range(0, len(maturities)):
+    t = maturities[i]
+    vol = np.sqrt((np.power(sigma_0 + sigma_1 * t, 3.0) - np.power(sigma_0, 3.0)) / (3.0 * sigma_1 * t))
+    analytic_prices = [discount_factors[i] * black_scholes(forwards[i], k, vol, t, 1) for k in strikes]
+    print(t, pde_prices[i] - analytic_prices)
@@ -0,0 +1,55 @@
+import numpy as np
+import time
+
+from Solvers.PDE_Solver.SweepSolvers import ParameterSweepSolver
+from scipy.interpolate import interp1d
+from Solvers.PDE_Solver.Meshes import uniform_mesh, Mesh
+from Solvers.PDE_Solver.PDEs import LN_BS_PDE, PDE
+from Solvers.PDE_Solver.Types import np_ndarray, SchemeType
+from Solvers.PDE_Solver.TerminalConditions import TerminalCondition
+from Solvers.PDE_Solver.BoundariesConditions import Zero_Laplacian_BC
+from MCPricers.EuropeanPricers import black_scholes
+
+T = 1.0
+r = 0.02
+q = 0.0
+
+S0 = 100.0
+K = 110.0
+
+f = np.exp((r - q) * T) * S0
+df = np.exp(-r * T)
+
+# Grid of sigmas with the bumps of each sigma for the vega by central differences.
+sigmas = np.linspace(0.1, 0.5, 9)
+shift = 1e-4
+parameters = np.concatenate((sigmas - shift, sigmas + shift))
+
+
+def f_ln_payoff(mesh: Mesh) -> np_ndarray:
+    return np.maximum(np.exp(mesh.get_points()) - K, 0.0)
+
+
+def f_pde(sigma: float):
+    return PDE.from_ipde_terms(LN_BS_PDE(r, q, sigma))
+
+
+mesh_t = Mesh(uniform_mesh, 101, 0.0, T)
+mesh_x = Mesh(uniform_mesh, 401, np.log(K) - 3.0, np.log(K) + 3.0)
+
+start = time.time()
+sweep_solver = ParameterSweepSolver.from_parameters(mesh_t, mesh_x, f_pde, parameters, SchemeType.CRANK_NICOLSON,
+                                                    Zero_Laplacian_BC(), TerminalCondition(f_ln_payoff),
+                                                    rannacher_steps=2)
+u = sweep_solver.solver()
+end = time.time()
+
+prices = interp1d(mesh_x.get_points(), u, kind='cubic', axis=1)(np.log(S0))
+no_sigmas = len(sigmas)
+pde_vega = (prices[no_sigmas:] - prices[0: no_sigmas]) / (2.0 * shift)
+
+print(end - start)
+for i in range(0, no_sigmas):
+    analytic_vega = df * (black_scholes(f, K, sigmas[i] + shift, T, 1) -
+                          black_scholes(f, K, sigmas[i] - shift, T, 1)) / (2.0 * shift)
+    print(sigmas[i], pde_vega[i], analytic_vega)
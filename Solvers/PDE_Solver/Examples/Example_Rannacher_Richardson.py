@@ -0,0 +1,57 @@
+import numpy as np
+
+from Solvers.PDE_Solver import PDESolvers
+from Solvers.PDE_Solver import PDEOperators
+from scipy.interpolate import interp1d
+from Solvers.PDE_Solver.Meshes import uniform_mesh, Mesh
+from Solvers.PDE_Solver.PDEs import LN_BS_PDE, PDE
+from Solvers.PDE_Solver.Types import BoundaryConditionType, np_ndarray, SchemeType
+from Solvers.PDE_Solver.TerminalConditions import TerminalCondition
+from Solvers.PDE_Solver.BoundariesConditions import Zero_Laplacian_BC
+from MCPricers.EuropeanPricers import black_scholes
+
+T = 1.0
+r = 0.02
+q = 0.0
+sigma = 0.3
+
+S0 = 100.0
+K = 110.0
+
+f = np.exp((r - q) * T) * S0
+df = np.exp(-r * T)
+analytic_price = df * (black_scholes(f, K, sigma, T, 1) - f + K)
+
+bs_pde = PDE.from_ipde_terms(LN_BS_PDE(r, q, sigma))
+bc = Zero_Laplacian_BC()
+
+
+def f_ln_payoff(mesh: Mesh) -> np_ndarray:
+    return np.maximum(K - np.exp(mesh.get_points()), 0.0)
+
+
+tc = TerminalCondition(f_ln_payoff)
+
+for no_t, no_x in [(11, 81), (21, 161), (41, 321)]:
+    mesh_t = Mesh(uniform_mesh, no_t, 0.0, T)
+    mesh_x = Mesh(uniform_mesh, no_x, np.log(K) - 2.0, np.log(K) + 2.0)
+    operators = [PDEOperators.LinearPDEOperator(mesh_x, bs_pde, bc),
+                 PDEOperators.LinearPDEOperator(mesh_x, bs_pde, bc)]
+
+    # Crank-Nicolson with 2 intervals of Rannacher smoothing.
+    pd_solver = PDESolvers.FDSolver(mesh_t,
+                                    mesh_x,
+                                    operators,
+                                    SchemeType.CRANK_NICOLSON,
+                                    BoundaryConditionType.ZERO_LAPLACIAN,
+                                    tc,
+                                    rannacher_steps=2)
+    pd_solver.solver()
+    u_cn = pd_solver.get_solution_grid()[:, 0]
+    u_richardson = pd_solver.solver_richardson()
+
+    def f_spot(u):
+        return float(interp1d(mesh_x.get_points(), u, kind='cubic')(np.log(S0)))
+
+    print(no_t, no_x, f_spot(u_cn) - analytic_price, f_spot(u_richardson) - analytic_price,
+          f_spot(pd_solver.get_error_estimate()))
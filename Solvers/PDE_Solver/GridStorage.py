@@ -0,0 +1,62 @@
+import numpy as np
+
+from Solvers.PDE_Solver.Meshes import Mesh
+from Solvers.PDE_Solver.Types import GridStorageType
+from Tools.Types import ndarray
+
+
+class GridStorage(object):
+    # Policy of the slices of the solution that the solver keeps: all the points of mesh_t, only the first one (the
+    # solution at t0), the nearest points of mesh_t to save_times or every k-th point. The first point of mesh_t is
+    # always the first column of the grid. With memmap_file the grid is a .npy file mapped in memory.
+    def __init__(self,
+                 storage_type: GridStorageType = GridStorageType.ALL,
+                 save_times: ndarray = None,
+                 k: int = 1,
+                 memmap_file: str = None):
+        if storage_type == GridStorageType.TIMES and save_times is None:
+            raise Exception("The storage type " + str(storage_type) + " needs the save times.")
+
+        if storage_type == GridStorageType.UNKNOWN:
+            raise Exception("The storage type " + str(storage_type) + " is not implemented.")
+
+        if k < 1:
+            raise Exception("The number of steps between slices must be positive.")
+
+        self._storage_type = storage_type
+        self._save_times = save_times
+        self._k = k
+        self._memmap_file = memmap_file
+
+    def get_type(self):
+        return self._storage_type
+
+    def get_time_indexes(self, mesh_t: Mesh):
+        # Indexes of mesh_t stored in the grid in increasing order.
+        no_t = mesh_t.get_size()
+        if self._storage_type == GridStorageType.ALL:
+            indexes = np.arange(0, no_t)
+        elif self._storage_type == GridStorageType.FINAL:
+            indexes = np.array([0])
+        elif self._storage_type == GridStorageType.TIMES:
+            points = mesh_t.get_points()
+            save_times = np.atleast_1d(np.asarray(self._save_times, dtype=float))
+            indexes = np.argmin(np.abs(points[None, :] - save_times[:, None]), axis=1)
+        else:
+            indexes = np.arange(0, no_t, self._k)
+
+        return np.unique(np.append(indexes, 0)).astype(np.int64)
+
+    def get_grid_columns(self, mesh_t: Mesh):
+        # Column of the grid of each point of mesh_t (-1 if it is not stored).
+        columns = np.full(mesh_t.get_size(), -1, dtype=np.int64)
+        indexes = self.get_time_indexes(mesh_t)
+        columns[indexes] = np.arange(0, len(indexes))
+        return columns
+
+    def allocate(self, no_nodes: int, mesh_t: Mesh):
+        shape = (no_nodes, len(self.get_time_indexes(mesh_t)))
+        if self._memmap_file is None:
+            return np.zeros(shape=shape)
+        else:
+            return np.lib.format.open_memmap(self._memmap_file, mode='w+', dtype=np.float64, shape=shape)
@@ -0,0 +1,90 @@
+import numpy as np
+import numba as nb
+
+from numba.experimental import jitclass
+
+
+# Compiled versions of the IPDETerms. The coefficients are written in the buffer out, so they can be evaluated inside
+# a compiled time-stepping loop (Tools.jit_theta_scheme_backward_march) without allocations or calls to Python.
+@nb.jit("f8(f8[:], f8[:], f8[:,:], f8, f8)", nopython=True, nogil=True)
+def get_bilinear_value(times, nodes, values, t, x):
+    # Bilinear interpolation of values (times x nodes), the value is flat outside the grid.
+    no_times = len(times)
+    no_nodes = len(nodes)
+    t_c = min(max(t, times[0]), times[no_times - 1])
+    x_c = min(max(x, nodes[0]), nodes[no_nodes - 1])
+
+    i = min(max(np.searchsorted(times, t_c) - 1, 0), max(no_times - 2, 0))
+    j = min(max(np.searchsorted(nodes, x_c) - 1, 0), no_nodes - 2)
+    w_t = 0.0 if no_times == 1 else (t_c - times[i]) / (times[i + 1] - times[i])
+    w_x = (x_c - nodes[j]) / (nodes[j + 1] - nodes[j])
+
+    value_i = (1.0 - w_x) * values[i, j] + w_x * values[i, j + 1]
+    if no_times == 1:
+        return value_i
+
+    value_i_1 = (1.0 - w_x) * values[i + 1, j] + w_x * values[i + 1, j + 1]
+    return (1.0 - w_t) * value_i + w_t * value_i_1
+
+
+@jitclass([('r', nb.float64), ('q', nb.float64), ('sigma', nb.float64), ('time_homogeneous', nb.boolean)])
+class LN_BS_PDE_JIT(object):
+    def __init__(self, r, q, sigma):
+        self.r = r
+        self.q = q
+        self.sigma = sigma
+        self.time_homogeneous = True
+
+    def source(self, t, x, out):
+        out[:] = - self.r
+
+    def convection(self, t, x, v, out):
+        out[:] = self.r - self.q - 0.5 * self.sigma * self.sigma
+
+    def diffusion(self, t, x, out):
+        out[:] = 0.5 * self.sigma * self.sigma
+
+
+# The local vol is given in the grid (times x nodes) and interpolated bilinearly (for instance the grid of
+# ForwardPDEPricer.get_local_vol_grid of a SVILocalVol or SABRLocalVol).
+@jitclass([('times', nb.float64[:]), ('nodes', nb.float64[:]), ('loc_vol', nb.float64[:, :]),
+           ('time_homogeneous', nb.boolean)])
+class LN_FORWARD_LOCAL_VOL_PDE_JIT(object):
+    def __init__(self, times, nodes, loc_vol):
+        self.times = times
+        self.nodes = nodes
+        self.loc_vol = loc_vol
+        self.time_homogeneous = False
+
+    def source(self, t, x, out):
+        out[:] = 0.0
+
+    def convection(self, t, x, v, out):
+        for i in range(0, len(x)):
+            out[i] = - v[i]
+
+    def diffusion(self, t, x, out):
+        for i in range(0, len(x)):
+            sigma = get_bilinear_value(self.times, self.nodes, self.loc_vol, t, x[i])
+            out[i] = 0.5 * sigma * sigma
+
+
+@jitclass([('times', nb.float64[:]), ('nodes', nb.float64[:]), ('loc_vol', nb.float64[:, :]),
+           ('time_homogeneous', nb.boolean)])
+class NORMAL_LOCAL_VOL_PDE_JIT(object):
+    def __init__(self, times, nodes, loc_vol):
+        self.times = times
+        self.nodes = nodes
+        self.loc_vol = loc_vol
+        self.time_homogeneous = False
+
+    def source(self, t, x, out):
+        out[:] = 0.0
+
+    def convection(self, t, x, v, out):
+        out[:] = 0.0
+
+    def diffusion(self, t, x, out):
+        for i in range(0, len(x)):
+            sigma = get_bilinear_value(self.times, self.nodes, self.loc_vol, t, x[i])
+            out[i] = 0.5 * sigma * sigma
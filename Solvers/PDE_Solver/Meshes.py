@@ -23,6 +23,77 @@ def finite_volume_mesh(no_points: int, T0: float, T1: float):
     return mesh
 
 
+def get_sinh_coordinate(x: ndarray, concentration_points: ndarray, alphas: ndarray):
+    # xi(x) = sum_k asinh((x - c_k) / alpha_k), so the density of nodes dxi/dx is the sum of the Tavella-Randall sinh
+    # densities of each concentration point. A small alpha_k concentrates more nodes around c_k.
+    xi = np.zeros(np.shape(x))
+    for c_k, alpha_k in zip(concentration_points, alphas):
+        xi = xi + np.arcsinh((x - c_k) / alpha_k)
+    return xi
+
+
+def concentrated_mesh(no_points: int, T0: float, T1: float, concentration_points: ndarray, alphas: ndarray,
+                      alignment_point: float = None, cell_centred: bool = False, no_points_inverse: int = 10000):
+    # Mesh with nodes uniform in xi(x) = sum_k asinh((x - c_k) / alpha_k) (strike, spot, barrier...). If
+    # alignment_point is given the uniform grid in xi is deformed piecewise linearly so the point is a node or, with
+    # cell_centred, the middle of a cell (which removes the oscillations of the kink of the payoff). xi is inverted by
+    # linear interpolation on a fine mesh.
+    concentration_points = np.atleast_1d(np.asarray(concentration_points, dtype=float))
+    alphas = np.broadcast_to(np.asarray(alphas, dtype=float), concentration_points.shape)
+
+    x_fine = np.linspace(T0, T1, no_points_inverse)
+    xi_fine = get_sinh_coordinate(x_fine, concentration_points, alphas)
+    xi_0 = xi_fine[0]
+    xi_1 = xi_fine[-1]
+    index = np.arange(0, no_points, 1.0)
+
+    if alignment_point is None or alignment_point <= T0 or alignment_point >= T1:
+        xi = xi_0 + index * (xi_1 - xi_0) / (no_points - 1)
+    else:
+        xi_a = get_sinh_coordinate(np.array([alignment_point]), concentration_points, alphas)[0]
+        shift = 0.5 if cell_centred else 0.0
+        i_a = np.round((xi_a - xi_0) * (no_points - 1) / (xi_1 - xi_0) - shift) + shift
+        i_a = min(max(i_a, 1.0 + shift), no_points - 2.0 - shift)
+        xi = np.where(index <= i_a,
+                      xi_0 + index * (xi_a - xi_0) / i_a,
+                      xi_a + (index - i_a) * (xi_1 - xi_a) / (no_points - 1 - i_a))
+
+    points = np.interp(xi, xi_fine, x_fine)
+    points[0] = T0
+    points[-1] = T1
+
+    # The inversion is exact up to the fine mesh, so the aligned nodes are set exactly.
+    if alignment_point is not None and T0 < alignment_point < T1:
+        if cell_centred:
+            # The aligned cell keeps its width unless it would cross the middle of its neighbour cells, i_l - 1 and
+            # i_l + 2 are nodes of the mesh because 1.5 <= i_a <= no_points - 2.5.
+            i_l = int(np.floor(i_a))
+            half_width = min(0.5 * (points[i_l + 1] - points[i_l]),
+                             0.5 * (alignment_point - points[i_l - 1]),
+                             0.5 * (points[i_l + 2] - alignment_point))
+            if half_width <= 0.0:
+                raise Exception("The cell centred in " + str(alignment_point) + " does not fit in the mesh.")
+            points[i_l] = alignment_point - half_width
+            points[i_l + 1] = alignment_point + half_width
+        else:
+            points[int(i_a)] = alignment_point
+
+    if np.any(np.diff(points) <= 0.0):
+        raise Exception("The concentrated mesh is not strictly increasing.")
+
+    return points
+
+
+def get_concentrated_mesh_generator(concentration_points: ndarray, alphas: ndarray, alignment_point: float = None,
+                                    cell_centred: bool = False) -> Callable[[int, float, float], ndarray]:
+    # Generator with the signature of uniform_mesh, so it can be used in Mesh, LnUnderlyingMesh and
+    # BachelierUnderlyingMesh (in the log-space meshes the points must be log(K), log(S0), log(barrier)).
+    def generator(no_points: int, T0: float, T1: float):
+        return concentrated_mesh(no_points, T0, T1, concentration_points, alphas, alignment_point, cell_centred)
+
+    return generator
+
+
 class Mesh(object):
     def __init__(self,
                  generator: Callable[[int, float, float], ndarray],
@@ -74,6 +145,9 @@ class Mesh(object):
     def get_shift(self):
         return self._shift
 
+    def get_generator(self):
+        return self._generator
+
     def update_mesh(self, T0: float, T1: float, no_points: int, generator: Callable[[int, float, float], ndarray]):
         self._T0 = T0
         self._T1 = T1
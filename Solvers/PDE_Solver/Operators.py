@@ -25,6 +25,9 @@ class Operator(object):
     def get_mesh(self):
         return self._mesh
 
+    def get_boundary_condition(self):
+        return self._bc
+
     def modify_operator(self, functional: Callable[[np_ndarray], None]):
         functional(self._diagonal)
         functional(self._diagonal_lower)
@@ -53,13 +56,13 @@ class Gradient(Operator):
         super().__init__(mesh, bc)
 
     def update_operator(self, t: float, mesh: Mesh):
-        for i in range(1, self._mesh.get_size() - 1):
-            delta_r = self._mesh.get_shift()[i]
-            delta_l = self._mesh.get_shift()[i - 1]
+        no_nodes = self._mesh.get_size()
+        delta_r = self._mesh.get_shift()[1:]
+        delta_l = self._mesh.get_shift()[:-1]
 
-            self._diagonal_lower[i-1] = - delta_r / (delta_l * (delta_r + delta_l))
-            self._diagonal[i] = - (delta_l - delta_r) / (delta_r * delta_l)
-            self._diagonal_upper[i] = delta_l / (delta_r * (delta_r + delta_l))
+        self._diagonal_lower[0:no_nodes - 2] = - delta_r / (delta_l * (delta_r + delta_l))
+        self._diagonal[1:no_nodes - 1] = - (delta_l - delta_r) / (delta_r * delta_l)
+        self._diagonal_upper[1:no_nodes - 1] = delta_l / (delta_r * (delta_r + delta_l))
 
 
 class Laplacian(Operator):
@@ -67,12 +70,26 @@ class Laplacian(Operator):
         super().__init__(mesh, bc)
 
     def update_operator(self, t: float, mesh: Mesh):
-        for i in range(1, self._mesh.get_size() - 1):
-            delta_r = self._mesh.get_shift()[i]
-            delta_l = self._mesh.get_shift()[i - 1]
-            self._diagonal_lower[i - 1] = 2.0 / (delta_l * (delta_r + delta_l))
-            self._diagonal[i] = - 2.0 / (delta_l * delta_r)
-            self._diagonal_upper[i] = 2.0 / (delta_r * (delta_r + delta_l))
+        no_nodes = self._mesh.get_size()
+        delta_r = self._mesh.get_shift()[1:]
+        delta_l = self._mesh.get_shift()[:-1]
+
+        self._diagonal_lower[0:no_nodes - 2] = 2.0 / (delta_l * (delta_r + delta_l))
+        self._diagonal[1:no_nodes - 1] = - 2.0 / (delta_l * delta_r)
+        self._diagonal_upper[1:no_nodes - 1] = 2.0 / (delta_r * (delta_r + delta_l))
+
 
+def get_stencil(operator, mesh: Mesh):
+    # The 1-D stencil as three vectors with the length of the mesh, the position i has the coefficients of
+    # u[i - 1], u[i] and u[i + 1] in the row i. The boundary rows are zero.
+    operator.update_operator(0.0, mesh)
+    no_nodes = mesh.get_size()
+    lower = np.zeros(no_nodes)
+    diagonal = np.zeros(no_nodes)
+    upper = np.zeros(no_nodes)
 
+    lower[1:no_nodes - 1] = operator.diagonal_lower()[0:no_nodes - 2]
+    diagonal[1:no_nodes - 1] = operator.diagonal()[1:no_nodes - 1]
+    upper[1:no_nodes - 1] = operator.diagonal_upper()[1:no_nodes - 1]
 
+    return lower, diagonal, upper
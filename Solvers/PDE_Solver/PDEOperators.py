@@ -15,17 +15,31 @@ class LinearPDEOperator(Operator):
         self._laplacian = Laplacian(mesh, BoundaryCondition(BoundaryConditionType.ZERO_LAPLACIAN))
         self._gradient = Gradient(mesh, BoundaryCondition(BoundaryConditionType.ZERO_GRADIENT))
 
+    # u_i is the vector of values on the mesh or a matrix (nodes x columns) with one column by terminal condition,
+    # in this case the tridiagonal system is factored once for all the columns.
     def apply_implicit_operator(self, delta: float, u_i: np_ndarray) -> np_ndarray:
-        return Tools.tdr_system_solver((1.0 - delta * self.diagonal()),
-                                       - delta * self.diagonal_lower(),
-                                       - delta * self.diagonal_upper(),
-                                       u_i)
+        if u_i.ndim == 1:
+            return Tools.tdr_system_solver((1.0 - delta * self.diagonal()),
+                                           - delta * self.diagonal_lower(),
+                                           - delta * self.diagonal_upper(),
+                                           u_i)
+        else:
+            return Tools.tdr_system_solver_multi_rhs((1.0 - delta * self.diagonal()),
+                                                     - delta * self.diagonal_lower(),
+                                                     - delta * self.diagonal_upper(),
+                                                     u_i)
 
     def apply_explicit_operator(self, delta: float, u_i: np_ndarray) -> np_ndarray:
-        return Tools.apply_tdr((1.0 + delta * self.diagonal()),
-                               delta * self.diagonal_lower(),
-                               delta * self.diagonal_upper(),
-                               u_i)
+        if u_i.ndim == 1:
+            return Tools.apply_tdr((1.0 + delta * self.diagonal()),
+                                   delta * self.diagonal_lower(),
+                                   delta * self.diagonal_upper(),
+                                   u_i)
+        else:
+            return Tools.apply_tdr_multi_rhs((1.0 + delta * self.diagonal()),
+                                             delta * self.diagonal_lower(),
+                                             delta * self.diagonal_upper(),
+                                             u_i)
 
     def get_pde(self):
         return self._pde
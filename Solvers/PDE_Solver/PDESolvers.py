@@ -1,11 +1,15 @@
+import copy
 import numpy as np
 
+from scipy.interpolate import interp1d
 from Solvers.PDE_Solver.PDEOperators import LinearPDEOperator
-from Solvers.PDE_Solver.BoundariesConditions import BoundaryCondition
+from Solvers.PDE_Solver.Operators import Gradient, Laplacian, get_stencil
+from Solvers.PDE_Solver.BoundariesConditions import BoundaryCondition, Zero_Laplacian_BC
 from Solvers.PDE_Solver.TerminalConditions import TerminalCondition
-from Solvers.PDE_Solver.Types import SchemeType, BoundaryConditionType
+from Solvers.PDE_Solver.GridStorage import GridStorage
+from Solvers.PDE_Solver.Types import SchemeType, BoundaryConditionType, GridStorageType
 from Solvers.PDE_Solver.Meshes import Mesh
-from Solvers.PDE_Solver import Schemes
+from Solvers.PDE_Solver import Schemes, Tools
 from typing import List
 
 
@@ -17,12 +21,18 @@ class FDSolver(object):
                  operators: List[LinearPDEOperator],
                  scheme_type: SchemeType,
                  bc_type: BoundaryConditionType,
-                 tc: TerminalCondition):
+                 tc: TerminalCondition,
+                 rannacher_steps: int = 0,
+                 storage: GridStorage = None):
 
         self._operators = operators
         self._mesh_t = mesh_t
         self._mesh_x = mesh_x
-        self._u_grid = np.zeros(shape=(mesh_x.get_size(), mesh_t.get_size()))
+
+        # The grid has one column by stored point of mesh_t, by default all of them.
+        self._storage = GridStorage() if storage is None else storage
+        self._grid_columns = self._storage.get_grid_columns(mesh_t)
+        self._u_grid = self._storage.allocate(mesh_x.get_size(), mesh_t)
 
         if scheme_type == SchemeType.EXPLICIT:
             self._scheme = Schemes.ExplicitScheme(operators[0])
@@ -33,37 +43,207 @@ class FDSolver(object):
         else:
             raise ValueError("The operator type " + str(scheme_type))
 
+        # The last rannacher_steps intervals before the maturity are done with two implicit half-steps, which damps
+        # the oscillations of the theta scheme with non-smooth terminal conditions.
+        self._rannacher_steps = rannacher_steps
+        self._rannacher_scheme = Schemes.ImplicitScheme(operators[-1])
+
+        self._scheme_type = scheme_type
+        self._bc_type = bc_type
         self._bc = BoundaryCondition(bc_type)
         self._tc = tc
+        self._error_estimate = None
 
     def get_solution_grid(self):
         return self._u_grid
 
+    def get_solution_times(self):
+        # Points of mesh_t of the columns of the solution grid.
+        return self._mesh_t.get_points()[self._grid_columns >= 0]
+
+    def is_time_homogeneous(self):
+        # The fast path needs constant coefficients and the zero laplacian condition, which is a fixed extrapolation
+        # of the boundary nodes.
+        return self._operators[0].get_pde().time_homogeneous and \
+            isinstance(self._operators[0].get_boundary_condition(), Zero_Laplacian_BC)
+
+    def is_compiled(self):
+        # The compiled path needs the coefficients of a jitclass of JitPDEs and the zero laplacian condition.
+        return self._operators[0].get_pde().get_jit_terms() is not None and \
+            isinstance(self._operators[0].get_boundary_condition(), Zero_Laplacian_BC)
+
+    def get_time_steps(self):
+        # Steps of the backward march in increasing time with its theta, the Rannacher intervals are split in two
+        # implicit half-steps. grid_index is the column of the solution grid after each step (-1 if it isn't stored).
+        delta_t = np.diff(self._mesh_t.get_points())
+        no_intervals = len(delta_t)
+        theta = self._scheme.get_theta()
+        deltas = []
+        thetas = []
+        grid_index = []
+        for i in range(0, no_intervals):
+            if i >= no_intervals - self._rannacher_steps:
+                deltas += [0.5 * delta_t[i], 0.5 * delta_t[i]]
+                thetas += [0.0, 0.0]
+                grid_index += [self._grid_columns[i], -1]
+            else:
+                deltas.append(delta_t[i])
+                thetas.append(theta)
+                grid_index.append(self._grid_columns[i])
+
+        return np.array(deltas), np.array(thetas), np.array(grid_index, dtype=np.int64)
+
+    def homogeneous_backward_march(self, u: np.ndarray, store_grid: bool):
+        # The operator is assembled once and the whole backward march runs in Tools.theta_scheme_backward_march.
+        operator = self._operators[0]
+        operator.update_operator(self._mesh_t.get_point(0), self._mesh_x)
+        operator.apply_boundary_condition(t_i_1=self._mesh_t.get_point(0), t_i=self._mesh_t.get_point(1),
+                                          operator=operator, scheme_type=SchemeType.IMPLICIT)
+
+        delta_t, theta, grid_index = self.get_time_steps()
+        if not store_grid:
+            grid_index[:] = -1
+        elif self._grid_columns[-1] >= 0:
+            self._u_grid[:, self._grid_columns[-1]] = u[:, 0]
+
+        Tools.theta_scheme_backward_march(operator.diagonal().copy(),
+                                          operator.diagonal_lower().copy(),
+                                          operator.diagonal_upper().copy(),
+                                          delta_t,
+                                          theta,
+                                          Zero_Laplacian_BC.get_extrapolation_weights(self._mesh_x),
+                                          u,
+                                          np.asarray(self._u_grid),
+                                          grid_index)
+
+    def jit_backward_march(self, u: np.ndarray, store_grid: bool):
+        # The coefficients are evaluated and the operator assembled by step inside Tools.jit_theta_scheme_backward_march.
+        bc = self._operators[0].get_boundary_condition()
+        gradient = np.array(get_stencil(Gradient(self._mesh_x, bc), self._mesh_x))
+        laplacian = np.array(get_stencil(Laplacian(self._mesh_x, bc), self._mesh_x))
+
+        delta_t, theta, grid_index = self.get_time_steps()
+        t_start = self._mesh_t.get_point(0) + np.cumsum(delta_t) - delta_t
+        if not store_grid:
+            grid_index[:] = -1
+        elif self._grid_columns[-1] >= 0:
+            self._u_grid[:, self._grid_columns[-1]] = u[:, 0]
+
+        Tools.jit_theta_scheme_backward_march(self._operators[0].get_pde().get_jit_terms(),
+                                              np.asarray(self._mesh_x.get_points(), dtype=float),
+                                              gradient,
+                                              laplacian,
+                                              t_start,
+                                              delta_t,
+                                              theta,
+                                              Zero_Laplacian_BC.get_extrapolation_weights(self._mesh_x),
+                                              u,
+                                              np.asarray(self._u_grid),
+                                              grid_index)
+
+    def step_solver(self, i: int, u_i_1: np.ndarray, u_i: np.ndarray):
+        # Step from mesh_t[i + 1] to mesh_t[i], u_i is overwritten in the Rannacher steps.
+        t_i = self._mesh_t.get_point(i)
+        t_i_next = self._mesh_t.get_point(i + 1)
+        if i >= self._mesh_t.get_size() - 1 - self._rannacher_steps:
+            t_i_middle = 0.5 * (t_i + t_i_next)
+            self._rannacher_scheme.step_solver(self._mesh_x, t_i_middle, t_i_next, u_i_1, u_i)
+            np.copyto(u_i, u_i_1)
+            self._rannacher_scheme.step_solver(self._mesh_x, t_i, t_i_middle, u_i_1, u_i)
+        else:
+            self._scheme.step_solver(self._mesh_x, t_i, t_i_next, u_i_1, u_i)
+
     def solver(self):
+        if self.is_time_homogeneous():
+            u = np.array(self._tc.get_value(self._mesh_x), dtype=float).reshape(-1, 1)
+            self.homogeneous_backward_march(u, True)
+            return
+
+        if self.is_compiled():
+            u = np.array(self._tc.get_value(self._mesh_x), dtype=float).reshape(-1, 1)
+            self.jit_backward_march(u, True)
+            return
+
         u_i = np.zeros(self._mesh_x.get_size())
         u_i_1 = np.zeros(self._mesh_x.get_size())
 
         u_i = self._tc.get_value(self._mesh_x)
-        np.copyto(self._u_grid[:, -1], u_i)
+        if self._grid_columns[-1] >= 0:
+            np.copyto(self._u_grid[:, self._grid_columns[-1]], u_i)
         no_t_i = self._mesh_t.get_size()
 
         for i in range(no_t_i-2, -1, -1):
-            self._scheme.step_solver(self._mesh_x,
-                                     self._mesh_t.get_point(i),
-                                     self._mesh_t.get_point(i+1),
-                                     u_i_1,
-                                     u_i)
+            self.step_solver(i, u_i_1, u_i)
 
             np.copyto(u_i, u_i_1)
-            np.copyto(self._u_grid[:, i], u_i_1)
+            if self._grid_columns[i] >= 0:
+                np.copyto(self._u_grid[:, self._grid_columns[i]], u_i_1)
 
     def update_terminal_condition(self, tc: TerminalCondition):
         self._tc = tc
 
+    def solver_multi_rhs(self, tc_s: List[TerminalCondition]):
+        # All the terminal conditions are marched backward together, the operators are updated and factored once by
+        # time step. The output is the solution at the first point of mesh_t with one row by terminal condition.
+        no_tc = len(tc_s)
+        u_i = np.zeros(shape=(self._mesh_x.get_size(), no_tc))
+        u_i_1 = np.zeros(shape=(self._mesh_x.get_size(), no_tc))
 
+        for j in range(0, no_tc):
+            u_i[:, j] = tc_s[j].get_value(self._mesh_x)
 
+        if self.is_time_homogeneous():
+            self.homogeneous_backward_march(u_i, False)
+            return u_i.T
 
+        if self.is_compiled():
+            self.jit_backward_march(u_i, False)
+            return u_i.T
 
+        no_t_i = self._mesh_t.get_size()
 
+        for i in range(no_t_i - 2, -1, -1):
+            self.step_solver(i, u_i_1, u_i)
 
+            np.copyto(u_i, u_i_1)
 
+        return u_i.T
+
+    def get_error_estimate(self):
+        return self._error_estimate
+
+    def get_refined_solver(self):
+        # Solver with the double of intervals in t and x (the same generators, so the nodes of the meshes are kept). The
+        # number of Rannacher steps is the same, so its error has the same order that the one of the scheme.
+        mesh_t = copy.deepcopy(self._mesh_t)
+        mesh_t.update_mesh(self._mesh_t.get_lower_bound(), self._mesh_t.get_upper_bound(),
+                           2 * self._mesh_t.get_size() - 1, self._mesh_t.get_generator())
+        mesh_x = copy.deepcopy(self._mesh_x)
+        mesh_x.update_mesh(self._mesh_x.get_lower_bound(), self._mesh_x.get_upper_bound(),
+                           2 * self._mesh_x.get_size() - 1, self._mesh_x.get_generator())
+        operators = [LinearPDEOperator(mesh_x, operator.get_pde(), operator.get_boundary_condition())
+                     for operator in self._operators]
+
+        return FDSolver(mesh_t, mesh_x, operators, self._scheme_type, self._bc_type, self._tc, self._rannacher_steps,
+                        GridStorage(GridStorageType.FINAL))
+
+    def get_order(self):
+        # Order in time of the scheme, Crank-Nicolson is second order and the implicit and explicit schemes first order.
+        # The Rannacher half-steps only affect a fixed number of intervals, so they don't change it.
+        return 2 if self._scheme_type == SchemeType.CRANK_NICOLSON else 1
+
+    def solver_richardson(self):
+        # Richardson extrapolation (2^p u_h/2 - u_h) / (2^p - 1) at the first point of mesh_t with p = get_order(),
+        # the fine solution is interpolated on mesh_x. (u_h/2 - u_h) / (2^p - 1) is the estimated discretisation error
+        # of the fine solution, it is available in get_error_estimate.
+        self.solver()
+        u_coarse = self._u_grid[:, 0]
+
+        refined_solver = self.get_refined_solver()
+        refined_solver.solver()
+        f_u_fine = interp1d(refined_solver._mesh_x.get_points(), refined_solver.get_solution_grid()[:, 0],
+                            kind='cubic')
+        u_fine = f_u_fine(self._mesh_x.get_points())
+
+        self._error_estimate = (u_fine - u_coarse) / (np.power(2.0, self.get_order()) - 1.0)
+        return u_fine + self._error_estimate
@@ -6,6 +6,8 @@ from abc import abstractmethod
 
 
 class IPDETerms(object):
+    # True if source, convection and diffusion do not depend on t, then the solver assembles the operator once.
+    time_homogeneous = False
 
     @abstractmethod
     def source(self, t: float, x: ndarray):
@@ -21,6 +23,8 @@ class IPDETerms(object):
 
 
 class BS_forward_PDE(IPDETerms):
+    time_homogeneous = True
+
     def __init__(self, sigma):
         self._sigma = sigma
 
@@ -35,6 +39,8 @@ class BS_forward_PDE(IPDETerms):
 
 
 class LN_BS_PDE(IPDETerms):
+    time_homogeneous = True
+
     def __init__(self, r: float, q: float, sigma: float):
         self._r = r
         self._q = q
@@ -82,10 +88,22 @@ class PDE(object):
     def __init__(self,
                  source: Callable[[float, ndarray], ndarray],
                  convection: Callable[[float, ndarray, ndarray], ndarray],
-                 diffusion: Callable[[float, ndarray], ndarray]):
+                 diffusion: Callable[[float, ndarray], ndarray],
+                 time_homogeneous: bool = False,
+                 jit_terms=None):
         self._source = source
         self._convection = convection
         self._diffusion = diffusion
+        self._time_homogeneous = time_homogeneous
+        self._jit_terms = jit_terms
+
+    @property
+    def time_homogeneous(self):
+        return self._time_homogeneous
+
+    def get_jit_terms(self):
+        # The jitclass of JitPDEs if the PDE is compiled, otherwise None.
+        return self._jit_terms
 
     def source(self, t: float, x: ndarray) -> ndarray:
         return self._source(t, x)
@@ -100,5 +118,165 @@ class PDE(object):
     def from_ipde_terms(cls, ipde: IPDETerms):
         return cls(ipde.source,
                    ipde.convection,
-                   ipde.diffusion)
+                   ipde.diffusion,
+                   ipde.time_homogeneous)
+
+    @classmethod
+    def from_jit_terms(cls, jit_terms):
+        # jit_terms is a jitclass of JitPDEs. The Python callables are only used by the generic schemes, FDSolver
+        # evaluates the compiled coefficients inside Tools.jit_theta_scheme_backward_march.
+        def source(t: float, x: ndarray):
+            out = np.empty(x.size)
+            jit_terms.source(t, x, out)
+            return out
+
+        def convection(t: float, x: ndarray, v: ndarray):
+            out = np.empty(x.size)
+            jit_terms.convection(t, x, v, out)
+            return out
+
+        def diffusion(t: float, x: ndarray):
+            out = np.empty(x.size)
+            jit_terms.diffusion(t, x, out)
+            return out
+
+        return cls(source, convection, diffusion, jit_terms.time_homogeneous, jit_terms)
+
+
+class IPDETerms2D(object):
+    # Coefficients of u_t + diffusion_x u_xx + diffusion_y u_yy + mixed u_xy + convection_x u_x + convection_y u_y +
+    # source u = 0, the arguments x and y are the matrices (nodes_x x nodes_y) of the mesh.
+    time_homogeneous = False
+
+    @abstractmethod
+    def source(self, t: float, x: ndarray, y: ndarray):
+        pass
+
+    @abstractmethod
+    def convection_x(self, t: float, x: ndarray, y: ndarray):
+        pass
+
+    @abstractmethod
+    def convection_y(self, t: float, x: ndarray, y: ndarray):
+        pass
+
+    @abstractmethod
+    def diffusion_x(self, t: float, x: ndarray, y: ndarray):
+        pass
+
+    @abstractmethod
+    def diffusion_y(self, t: float, x: ndarray, y: ndarray):
+        pass
+
+    @abstractmethod
+    def mixed(self, t: float, x: ndarray, y: ndarray):
+        pass
+
+
+class LN_HESTON_PDE(IPDETerms2D):
+    # x = log(S_t) and y = V_t.
+    time_homogeneous = True
 
+    def __init__(self, r: float, q: float, k: float, theta: float, epsilon: float, rho: float):
+        self._r = r
+        self._q = q
+        self._k = k
+        self._theta = theta
+        self._epsilon = epsilon
+        self._rho = rho
+
+    def source(self, t: float, x: ndarray, y: ndarray):
+        return - self._r * np.ones(x.shape)
+
+    def convection_x(self, t: float, x: ndarray, y: ndarray):
+        return self._r - self._q - 0.5 * y
+
+    def convection_y(self, t: float, x: ndarray, y: ndarray):
+        return self._k * (self._theta - y)
+
+    def diffusion_x(self, t: float, x: ndarray, y: ndarray):
+        return 0.5 * y
+
+    def diffusion_y(self, t: float, x: ndarray, y: ndarray):
+        return 0.5 * self._epsilon * self._epsilon * y
+
+    def mixed(self, t: float, x: ndarray, y: ndarray):
+        return self._rho * self._epsilon * y
+
+
+class SABR_PDE(IPDETerms2D):
+    # x = F_t and y = alpha_t.
+    time_homogeneous = True
+
+    def __init__(self, beta: float, nu: float, rho: float):
+        self._beta = beta
+        self._nu = nu
+        self._rho = rho
+
+    def source(self, t: float, x: ndarray, y: ndarray):
+        return np.zeros(x.shape)
+
+    def convection_x(self, t: float, x: ndarray, y: ndarray):
+        return np.zeros(x.shape)
+
+    def convection_y(self, t: float, x: ndarray, y: ndarray):
+        return np.zeros(x.shape)
+
+    def diffusion_x(self, t: float, x: ndarray, y: ndarray):
+        return 0.5 * np.power(y * np.power(np.maximum(x, 0.0), self._beta), 2.0)
+
+    def diffusion_y(self, t: float, x: ndarray, y: ndarray):
+        return 0.5 * np.power(self._nu * y, 2.0)
+
+    def mixed(self, t: float, x: ndarray, y: ndarray):
+        return self._rho * self._nu * y * y * np.power(np.maximum(x, 0.0), self._beta)
+
+
+class PDE2D(object):
+    def __init__(self,
+                 source: Callable[[float, ndarray, ndarray], ndarray],
+                 convection_x: Callable[[float, ndarray, ndarray], ndarray],
+                 convection_y: Callable[[float, ndarray, ndarray], ndarray],
+                 diffusion_x: Callable[[float, ndarray, ndarray], ndarray],
+                 diffusion_y: Callable[[float, ndarray, ndarray], ndarray],
+                 mixed: Callable[[float, ndarray, ndarray], ndarray],
+                 time_homogeneous: bool = False):
+        self._source = source
+        self._convection_x = convection_x
+        self._convection_y = convection_y
+        self._diffusion_x = diffusion_x
+        self._diffusion_y = diffusion_y
+        self._mixed = mixed
+        self._time_homogeneous = time_homogeneous
+
+    @property
+    def time_homogeneous(self):
+        return self._time_homogeneous
+
+    def source(self, t: float, x: ndarray, y: ndarray) -> ndarray:
+        return self._source(t, x, y)
+
+    def convection_x(self, t: float, x: ndarray, y: ndarray) -> ndarray:
+        return self._convection_x(t, x, y)
+
+    def convection_y(self, t: float, x: ndarray, y: ndarray) -> ndarray:
+        return self._convection_y(t, x, y)
+
+    def diffusion_x(self, t: float, x: ndarray, y: ndarray) -> ndarray:
+        return self._diffusion_x(t, x, y)
+
+    def diffusion_y(self, t: float, x: ndarray, y: ndarray) -> ndarray:
+        return self._diffusion_y(t, x, y)
+
+    def mixed(self, t: float, x: ndarray, y: ndarray) -> ndarray:
+        return self._mixed(t, x, y)
+
+    @classmethod
+    def from_ipde_terms(cls, ipde: IPDETerms2D):
+        return cls(ipde.source,
+                   ipde.convection_x,
+                   ipde.convection_y,
+                   ipde.diffusion_x,
+                   ipde.diffusion_y,
+                   ipde.mixed,
+                   ipde.time_homogeneous)
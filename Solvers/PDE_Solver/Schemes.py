@@ -28,6 +28,11 @@ class ImplicitScheme(Scheme):
     def __init__(self, operator: Operator):
         Scheme.__init__(self, [operator])
 
+    @staticmethod
+    def get_theta():
+        # weight of the explicit part of the step
+        return 0.0
+
     def step_solver(self, mesh: Mesh, t_i_1: float, t_i: float, u_i_1: ndarray, u_i: ndarray):
         delta_i_1_i = (t_i - t_i_1)
         self._operator[0].update_operator(t_i_1, mesh)
@@ -42,6 +47,11 @@ class ExplicitScheme(Scheme):
     def __init__(self, operator: Operator):
         Scheme.__init__(self, [operator])
 
+    @staticmethod
+    def get_theta():
+        # weight of the explicit part of the step
+        return 1.0
+
     def step_solver(self, mesh: Mesh, t_i_1: float, t_i: float, u_i_1: ndarray, u_i: ndarray):
         delta_i_1_i = (t_i - t_i_1)
         self._operator[0].update_operator(t_i, mesh)
@@ -56,6 +66,7 @@ class ThetaScheme(Scheme):
     def __init__(self, operator: List[Operator], theta: float):
         Scheme.__init__(self, operator)
         self._theta = theta
+        self._u_i_1_explicit = np.zeros(0)
 
     def get_theta(self):
         return self._theta
@@ -72,10 +83,14 @@ class ThetaScheme(Scheme):
 
     def step_solver(self, mesh: Mesh, t_i_1: float, t_i: float, u_i_1: ndarray, u_i: ndarray):
         delta_i_1_i = (t_i - t_i_1)
-        u_i_1_explicit = np.zeros(mesh.get_size())
+        if self._u_i_1_explicit.shape != u_i.shape:
+            self._u_i_1_explicit = np.zeros(u_i.shape)
+        u_i_1_explicit = self._u_i_1_explicit
 
+        # The explicit part is evaluated at t_i and the implicit part at t_i_1, so the scheme is second order for
+        # time-dependent coefficients when theta = 0.5.
         self._operator[0].update_operator(t_i, mesh)
-        self._operator[1].update_operator(t_i, mesh)
+        self._operator[1].update_operator(t_i_1, mesh)
 
         self.modify_operators()
 
@@ -0,0 +1,165 @@
+import numpy as np
+
+from Solvers.PDE_Solver.PDEs import PDE
+from Solvers.PDE_Solver.PDEOperators import LinearPDEOperator
+from Solvers.PDE_Solver.BoundariesConditions import BoundaryCondition, Zero_Laplacian_BC
+from Solvers.PDE_Solver.TerminalConditions import TerminalCondition
+from Solvers.PDE_Solver.Types import SchemeType
+from Solvers.PDE_Solver.Meshes import Mesh
+from Solvers.PDE_Solver import Schemes, Tools
+from typing import Callable, List, Union
+
+
+class ParameterSweepSolver(object):
+    # Backward solver of the PDEs of a family of parameter sets (for example the sigmas of a vega bump grid). All the
+    # PDEs share mesh_t and mesh_x, so they are marched together as a batch of independent tridiagonal systems with one
+    # column by parameter set, which are solved in parallel with Tools.tdr_batch_solver.
+    def __init__(self,
+                 mesh_t: Mesh,
+                 mesh_x: Mesh,
+                 pdes: List[PDE],
+                 scheme_type: SchemeType,
+                 bc: BoundaryCondition,
+                 tc: Union[TerminalCondition, List[TerminalCondition]],
+                 rannacher_steps: int = 0):
+
+        if not isinstance(bc, Zero_Laplacian_BC):
+            raise Exception("The parameter sweep solver only supports the zero laplacian boundary condition.")
+
+        if not isinstance(tc, TerminalCondition) and len(tc) != len(pdes):
+            raise Exception("There must be one terminal condition or one by PDE.")
+
+        if scheme_type == SchemeType.EXPLICIT:
+            self._theta = Schemes.ExplicitScheme.get_theta()
+        elif scheme_type == SchemeType.IMPLICIT:
+            self._theta = Schemes.ImplicitScheme.get_theta()
+        elif scheme_type == SchemeType.CRANK_NICOLSON:
+            self._theta = 0.5
+        else:
+            raise ValueError("The operator type " + str(scheme_type))
+
+        self._mesh_t = mesh_t
+        self._mesh_x = mesh_x
+        self._pdes = pdes
+        self._operators = [LinearPDEOperator(mesh_x, pde, bc) for pde in pdes]
+        self._bc = bc
+        self._tc = tc
+        self._rannacher_steps = rannacher_steps
+        self._time_homogeneous = all(pde.time_homogeneous for pde in pdes)
+        self._w = Zero_Laplacian_BC.get_extrapolation_weights(mesh_x)
+
+        # Operators [lower, diagonal, upper] (nodes x parameter sets) with the layout of Tools.tdr_batch_solver, the
+        # first one is the operator at the end of the step (explicit part) and the second one the operator at the start
+        # (implicit part).
+        shape = (mesh_x.get_size(), len(pdes))
+        shape_off = (mesh_x.get_size() - 1, len(pdes))
+        self._operator_explicit = [np.zeros(shape_off), np.zeros(shape), np.zeros(shape_off)]
+        self._operator_implicit = [np.zeros(shape_off), np.zeros(shape), np.zeros(shape_off)]
+        self._alpha = None
+        self._system = [np.zeros(shape_off), np.zeros(shape), np.zeros(shape_off)]
+        self._gamma = np.empty(shape)
+        self._explicit = np.empty(shape)
+        self._u = None
+
+    @classmethod
+    def from_parameters(cls,
+                        mesh_t: Mesh,
+                        mesh_x: Mesh,
+                        f_pde: Callable[[object], PDE],
+                        parameters: List[object],
+                        scheme_type: SchemeType,
+                        bc: BoundaryCondition,
+                        tc: Union[TerminalCondition, List[TerminalCondition]],
+                        rannacher_steps: int = 0):
+        # f_pde builds the PDE of a parameter set, e.g. lambda sigma: PDE.from_ipde_terms(LN_BS_PDE(r, q, sigma)).
+        return cls(mesh_t, mesh_x, [f_pde(p) for p in parameters], scheme_type, bc, tc, rannacher_steps)
+
+    def get_solution(self):
+        # Matrix (parameter sets x nodes) with the solution at the first point of mesh_t.
+        return self._u.T
+
+    def get_time_steps(self):
+        # Steps of the backward march in increasing time with its theta, the Rannacher intervals are split in two
+        # implicit half-steps.
+        t = self._mesh_t.get_points()
+        no_intervals = len(t) - 1
+        t_start = []
+        deltas = []
+        thetas = []
+        for i in range(0, no_intervals):
+            if i >= no_intervals - self._rannacher_steps:
+                t_middle = 0.5 * (t[i] + t[i + 1])
+                t_start += [t[i], t_middle]
+                deltas += [t_middle - t[i], t[i + 1] - t_middle]
+                thetas += [Schemes.ImplicitScheme.get_theta(), Schemes.ImplicitScheme.get_theta()]
+            else:
+                t_start.append(t[i])
+                deltas.append(t[i + 1] - t[i])
+                thetas.append(self._theta)
+
+        return np.array(t_start), np.array(deltas), np.array(thetas)
+
+    def update_operator(self, t: float, operator: List[np.ndarray]):
+        # Assembly of the operators of all the PDEs at t, the boundary rows are zero.
+        for m, pde_operator in enumerate(self._operators):
+            pde_operator.update_operator(t, self._mesh_x)
+            pde_operator.apply_boundary_condition(operator=pde_operator)
+            operator[0][:, m] = pde_operator.diagonal_lower()
+            operator[1][:, m] = pde_operator.diagonal()
+            operator[2][:, m] = pde_operator.diagonal_upper()
+
+        self._alpha = None
+
+    def update_system(self, alpha: float):
+        # I - alpha A of the implicit part, it only changes with alpha or with the operators.
+        if alpha != self._alpha:
+            np.multiply(- alpha, self._operator_implicit[0], out=self._system[0])
+            np.multiply(- alpha, self._operator_implicit[1], out=self._system[1])
+            self._system[1] += 1.0
+            np.multiply(- alpha, self._operator_implicit[2], out=self._system[2])
+            self._alpha = alpha
+
+    def step_solver(self, delta_t: float, theta: float, u: np.ndarray):
+        # Step of the theta scheme from t + delta_t to t, u is overwritten with the solution at t.
+        if theta > 0.0:
+            Tools.apply_tdr_batch(self._operator_explicit[1], self._operator_explicit[0], self._operator_explicit[2], u,
+                                  self._explicit)
+            self._explicit *= theta * delta_t
+            self._explicit += u
+        else:
+            np.copyto(self._explicit, u)
+
+        self.update_system((1.0 - theta) * delta_t)
+        Tools.tdr_batch_solver(self._system[1], self._system[0], self._system[2], self._explicit, self._gamma, u)
+
+        u[0, :] = self._w[0] * u[1, :] + self._w[1] * u[2, :]
+        u[-1, :] = self._w[2] * u[-3, :] + self._w[3] * u[-2, :]
+
+    def solver(self):
+        # The output is the solution at the first point of mesh_t with one row by parameter set.
+        no_pdes = len(self._pdes)
+        u = np.empty((self._mesh_x.get_size(), no_pdes))
+        for m in range(0, no_pdes):
+            tc = self._tc if isinstance(self._tc, TerminalCondition) else self._tc[m]
+            u[:, m] = tc.get_value(self._mesh_x)
+
+        t_start, delta_t, theta = self.get_time_steps()
+        no_steps = len(delta_t)
+        if no_steps > 0:
+            self.update_operator(t_start[-1] + delta_t[-1], self._operator_explicit)
+            if self._time_homogeneous:
+                for j in range(0, 3):
+                    np.copyto(self._operator_implicit[j], self._operator_explicit[j])
+
+        for s in range(no_steps - 1, -1, -1):
+            if not self._time_homogeneous:
+                self.update_operator(t_start[s], self._operator_implicit)
+
+            self.step_solver(delta_t[s], theta[s], u)
+
+            # The implicit operator at t_start[s] is the explicit one of the step s - 1.
+            if not self._time_homogeneous:
+                self._operator_explicit, self._operator_implicit = self._operator_implicit, self._operator_explicit
+
+        self._u = u
+        return u.T
@@ -74,7 +74,326 @@ def apply_tdr(diagonal,
     y = np.zeros(no_nodes)
     y[0] = diagonal[0] * b[0] + diagonal_upper[0] * b[1]
     y[no_nodes - 1] = diagonal_lower[no_nodes - 2] * b[no_nodes - 2] + diagonal[no_nodes - 1] * b[no_nodes - 1]
-    for i in range(0, no_nodes - 1):
+    for i in range(1, no_nodes - 1):
         y[i] = diagonal_lower[i - 1] * b[i - 1] + diagonal[i] * b[i] + diagonal_upper[i] * b[i + 1]
 
     return y
+
+
+@nb.jit("f8[:,:](f8[:], f8[:], f8[:], f8[:,:])", nopython=True, nogil=True)
+def tdr_system_solver_multi_rhs(diagonal,
+                                diagonal_lower,
+                                diagonal_upper,
+                                b):
+    # Thomas algorithm for the right hand sides b[:, j]. The elimination factors gamma and 1 / pivot are computed once
+    # and the forward and backward substitutions run over all the columns at each node.
+    no_nodes, no_rhs = b.shape
+    x = np.empty((no_nodes, no_rhs))
+    gamma = np.zeros(no_nodes)
+    inv_pivot = np.zeros(no_nodes)
+
+    inv_pivot[0] = 1.0 / diagonal[0]
+    gamma[0] = diagonal_upper[0] * inv_pivot[0]
+    for i in range(1, no_nodes):
+        inv_pivot[i] = 1.0 / (diagonal[i] - diagonal_lower[i - 1] * gamma[i - 1])
+        if i < no_nodes - 1:
+            gamma[i] = diagonal_upper[i] * inv_pivot[i]
+
+    for j in range(0, no_rhs):
+        x[0, j] = b[0, j] * inv_pivot[0]
+
+    for i in range(1, no_nodes):
+        for j in range(0, no_rhs):
+            x[i, j] = (b[i, j] - diagonal_lower[i - 1] * x[i - 1, j]) * inv_pivot[i]
+
+    for i in range(no_nodes - 2, -1, -1):
+        for j in range(0, no_rhs):
+            x[i, j] -= gamma[i] * x[i + 1, j]
+
+    return x
+
+
+@nb.jit("f8[:,:](f8[:], f8[:], f8[:], f8[:,:])", nopython=True, nogil=True)
+def apply_tdr_multi_rhs(diagonal,
+                        diagonal_lower,
+                        diagonal_upper,
+                        b):
+    no_nodes, no_rhs = b.shape
+    y = np.empty((no_nodes, no_rhs))
+    for j in range(0, no_rhs):
+        y[0, j] = diagonal[0] * b[0, j] + diagonal_upper[0] * b[1, j]
+        y[no_nodes - 1, j] = diagonal_lower[no_nodes - 2] * b[no_nodes - 2, j] + \
+            diagonal[no_nodes - 1] * b[no_nodes - 1, j]
+
+    for i in range(1, no_nodes - 1):
+        for j in range(0, no_rhs):
+            y[i, j] = diagonal_lower[i - 1] * b[i - 1, j] + diagonal[i] * b[i, j] + diagonal_upper[i] * b[i + 1, j]
+
+    return y
+
+
+# Number of systems of a block of tdr_batch_solver and apply_tdr_batch, the systems of a block are solved by the same
+# thread with the inner loop over contiguous columns.
+BATCH_BLOCK_SIZE = 16
+
+
+@nb.jit("(f8[:,:], f8[:,:], f8[:,:], f8[:,:], f8[:,:], f8[:,:])", nopython=True, nogil=True, parallel=True)
+def tdr_batch_solver(diagonal,
+                     diagonal_lower,
+                     diagonal_upper,
+                     b,
+                     gamma,
+                     x):
+    # Thomas algorithm for the independent systems in the columns of b (nodes x systems). As in tdr_system_solver, the
+    # row i of the system m has the coefficients diagonal_lower[i - 1, m], diagonal[i, m] and diagonal_upper[i, m] of
+    # x[i - 1, m], x[i, m] and x[i + 1, m], so diagonal_lower and diagonal_upper have no_nodes - 1 rows. gamma is a work
+    # buffer with the shape of b and the solution is written in x, which can be b.
+    no_nodes, no_systems = b.shape
+    no_blocks = (no_systems + BATCH_BLOCK_SIZE - 1) // BATCH_BLOCK_SIZE
+    for k in nb.prange(no_blocks):
+        m_0 = k * BATCH_BLOCK_SIZE
+        m_1 = min(m_0 + BATCH_BLOCK_SIZE, no_systems)
+        for m in range(m_0, m_1):
+            inv_pivot = 1.0 / diagonal[0, m]
+            gamma[0, m] = diagonal_upper[0, m] * inv_pivot
+            x[0, m] = b[0, m] * inv_pivot
+
+        for i in range(1, no_nodes):
+            for m in range(m_0, m_1):
+                inv_pivot = 1.0 / (diagonal[i, m] - diagonal_lower[i - 1, m] * gamma[i - 1, m])
+                if i < no_nodes - 1:
+                    gamma[i, m] = diagonal_upper[i, m] * inv_pivot
+                x[i, m] = (b[i, m] - diagonal_lower[i - 1, m] * x[i - 1, m]) * inv_pivot
+
+        for i in range(no_nodes - 2, -1, -1):
+            for m in range(m_0, m_1):
+                x[i, m] -= gamma[i, m] * x[i + 1, m]
+
+
+@nb.jit("(f8[:,:], f8[:,:], f8[:,:], f8[:,:], f8[:,:])", nopython=True, nogil=True, parallel=True)
+def apply_tdr_batch(diagonal,
+                    diagonal_lower,
+                    diagonal_upper,
+                    u,
+                    y):
+    # y[:, m] = A_m u[:, m] for the tridiagonal matrices A_m with the layout of tdr_batch_solver, y can not be u.
+    no_nodes, no_systems = u.shape
+    no_blocks = (no_systems + BATCH_BLOCK_SIZE - 1) // BATCH_BLOCK_SIZE
+    for k in nb.prange(no_blocks):
+        m_0 = k * BATCH_BLOCK_SIZE
+        m_1 = min(m_0 + BATCH_BLOCK_SIZE, no_systems)
+        for m in range(m_0, m_1):
+            y[0, m] = diagonal[0, m] * u[0, m] + diagonal_upper[0, m] * u[1, m]
+            y[no_nodes - 1, m] = diagonal_lower[no_nodes - 2, m] * u[no_nodes - 2, m] + \
+                diagonal[no_nodes - 1, m] * u[no_nodes - 1, m]
+
+        for i in range(1, no_nodes - 1):
+            for m in range(m_0, m_1):
+                y[i, m] = diagonal_lower[i - 1, m] * u[i - 1, m] + diagonal[i, m] * u[i, m] + \
+                    diagonal_upper[i, m] * u[i + 1, m]
+
+
+@nb.jit("(f8[:], f8[:], f8[:], f8[:], f8[:], f8[:], f8[:,:], f8[:,:], i8[:])", nopython=True, nogil=True)
+def theta_scheme_backward_march(diagonal,
+                                diagonal_lower,
+                                diagonal_upper,
+                                delta_t,
+                                theta,
+                                bc_weights,
+                                u,
+                                u_grid,
+                                grid_index):
+    # Backward march of the theta scheme for a time-homogeneous operator A with zero rows at the boundaries. The step s
+    # is u <- (I - (1 - theta[s]) dt[s] A)^-1 (I + theta[s] dt[s] A) u followed by the extrapolation of the boundary
+    # nodes with bc_weights, the steps are done from the last to the first. The factorisation is only recomputed when
+    # dt or theta change. u (nodes x columns) is the terminal condition on input and the solution at the first time
+    # on output. If grid_index[s] >= 0, u_grid[:, grid_index[s]] gets the first column after the step s.
+    no_nodes, no_rhs = u.shape
+    no_steps = len(delta_t)
+    explicit = np.empty((no_nodes, no_rhs))
+    gamma = np.zeros(no_nodes)
+    inv_pivot = np.zeros(no_nodes)
+    last_delta = -1.0
+    last_theta = -1.0
+
+    for s in range(no_steps - 1, -1, -1):
+        delta = delta_t[s]
+        if delta != last_delta or theta[s] != last_theta:
+            alpha = - (1.0 - theta[s]) * delta
+            inv_pivot[0] = 1.0 / (1.0 + alpha * diagonal[0])
+            gamma[0] = alpha * diagonal_upper[0] * inv_pivot[0]
+            for i in range(1, no_nodes):
+                inv_pivot[i] = 1.0 / (1.0 + alpha * diagonal[i] - alpha * diagonal_lower[i - 1] * gamma[i - 1])
+                if i < no_nodes - 1:
+                    gamma[i] = alpha * diagonal_upper[i] * inv_pivot[i]
+            last_delta = delta
+            last_theta = theta[s]
+
+        beta = theta[s] * delta
+        for j in range(0, no_rhs):
+            explicit[0, j] = (1.0 + beta * diagonal[0]) * u[0, j] + beta * diagonal_upper[0] * u[1, j]
+            explicit[no_nodes - 1, j] = beta * diagonal_lower[no_nodes - 2] * u[no_nodes - 2, j] + \
+                (1.0 + beta * diagonal[no_nodes - 1]) * u[no_nodes - 1, j]
+
+        for i in range(1, no_nodes - 1):
+            for j in range(0, no_rhs):
+                explicit[i, j] = beta * diagonal_lower[i - 1] * u[i - 1, j] + (1.0 + beta * diagonal[i]) * u[i, j] + \
+                    beta * diagonal_upper[i] * u[i + 1, j]
+
+        alpha = - (1.0 - theta[s]) * delta
+        for j in range(0, no_rhs):
+            u[0, j] = explicit[0, j] * inv_pivot[0]
+
+        for i in range(1, no_nodes):
+            for j in range(0, no_rhs):
+                u[i, j] = (explicit[i, j] - alpha * diagonal_lower[i - 1] * u[i - 1, j]) * inv_pivot[i]
+
+        for i in range(no_nodes - 2, -1, -1):
+            for j in range(0, no_rhs):
+                u[i, j] -= gamma[i] * u[i + 1, j]
+
+        for j in range(0, no_rhs):
+            u[0, j] = bc_weights[0] * u[1, j] + bc_weights[1] * u[2, j]
+            u[no_nodes - 1, j] = bc_weights[2] * u[no_nodes - 3, j] + bc_weights[3] * u[no_nodes - 2, j]
+
+        if grid_index[s] >= 0:
+            u_grid[:, grid_index[s]] = u[:, 0]
+
+
+@nb.jit(nopython=True, nogil=True)
+def assemble_jit_operator(pde, t, x, gradient, laplacian, source, convection, diffusion, operator):
+    # operator (3 x nodes) gets the lower, diagonal and upper coefficients of the row i in the column i, the boundary
+    # rows are zero.
+    no_nodes = len(x)
+    pde.diffusion(t, x, diffusion)
+    pde.convection(t, x, diffusion, convection)
+    pde.source(t, x, source)
+    for i in range(1, no_nodes - 1):
+        for j in range(0, 3):
+            operator[j, i] = diffusion[i] * laplacian[j, i] + convection[i] * gradient[j, i]
+        operator[1, i] += source[i]
+
+
+# Without explicit signature, numba compiles one version by jitclass of JitPDEs.
+@nb.jit(nopython=True, nogil=True)
+def jit_theta_scheme_backward_march(pde,
+                                    x,
+                                    gradient,
+                                    laplacian,
+                                    t_start,
+                                    delta_t,
+                                    theta,
+                                    bc_weights,
+                                    u,
+                                    u_grid,
+                                    grid_index):
+    # Backward march of the theta scheme with the coefficients of the compiled pde (a jitclass of JitPDEs). The step s
+    # goes from t_start[s] + delta_t[s] to t_start[s], the explicit part is the operator at the end of the step and the
+    # implicit part the operator at t_start[s], which is the explicit operator of the step s - 1, so the coefficients
+    # are evaluated once by step. gradient and laplacian (3 x nodes) are the stencils of the mesh x. The rest of the
+    # arguments are the ones of theta_scheme_backward_march.
+    no_nodes, no_rhs = u.shape
+    no_steps = len(delta_t)
+    source = np.zeros(no_nodes)
+    convection = np.zeros(no_nodes)
+    diffusion = np.zeros(no_nodes)
+    operator_explicit = np.zeros((3, no_nodes))
+    operator_implicit = np.zeros((3, no_nodes))
+    explicit = np.empty((no_nodes, no_rhs))
+    gamma = np.zeros(no_nodes)
+    inv_pivot = np.zeros(no_nodes)
+
+    if no_steps > 0:
+        assemble_jit_operator(pde, t_start[no_steps - 1] + delta_t[no_steps - 1], x, gradient, laplacian, source,
+                              convection, diffusion, operator_explicit)
+
+    for s in range(no_steps - 1, -1, -1):
+        delta = delta_t[s]
+        assemble_jit_operator(pde, t_start[s], x, gradient, laplacian, source, convection, diffusion,
+                              operator_implicit)
+
+        beta = theta[s] * delta
+        for j in range(0, no_rhs):
+            explicit[0, j] = u[0, j]
+            explicit[no_nodes - 1, j] = u[no_nodes - 1, j]
+
+        for i in range(1, no_nodes - 1):
+            for j in range(0, no_rhs):
+                explicit[i, j] = u[i, j] + beta * (operator_explicit[0, i] * u[i - 1, j] +
+                                                   operator_explicit[1, i] * u[i, j] +
+                                                   operator_explicit[2, i] * u[i + 1, j])
+
+        alpha = - (1.0 - theta[s]) * delta
+        inv_pivot[0] = 1.0
+        gamma[0] = 0.0
+        for i in range(1, no_nodes):
+            inv_pivot[i] = 1.0 / (1.0 + alpha * operator_implicit[1, i] - alpha * operator_implicit[0, i] * gamma[i - 1])
+            gamma[i] = alpha * operator_implicit[2, i] * inv_pivot[i]
+
+        for j in range(0, no_rhs):
+            u[0, j] = explicit[0, j]
+
+        for i in range(1, no_nodes):
+            for j in range(0, no_rhs):
+                u[i, j] = (explicit[i, j] - alpha * operator_implicit[0, i] * u[i - 1, j]) * inv_pivot[i]
+
+        for i in range(no_nodes - 2, -1, -1):
+            for j in range(0, no_rhs):
+                u[i, j] -= gamma[i] * u[i + 1, j]
+
+        for j in range(0, no_rhs):
+            u[0, j] = bc_weights[0] * u[1, j] + bc_weights[1] * u[2, j]
+            u[no_nodes - 1, j] = bc_weights[2] * u[no_nodes - 3, j] + bc_weights[3] * u[no_nodes - 2, j]
+
+        if grid_index[s] >= 0:
+            u_grid[:, grid_index[s]] = u[:, 0]
+
+        operator_explicit[:, :] = operator_implicit
+
+
+# Kernels of the 2-D ADI solver. The solution is a matrix u (nodes_x x nodes_y) and the operator in each direction is
+# given by the matrices lower, diagonal and upper with the coefficients of u[i - 1, j], u[i, j] and u[i + 1, j] (or
+# u[i, j - 1], u[i, j], u[i, j + 1] in the y direction) at the node (i, j). The boundary rows of the operators are zero.
+@nb.jit("f8[:,:](f8[:,:], f8[:,:], f8[:,:], f8[:,:])", nopython=True, nogil=True, parallel=True)
+def apply_operator_x(diagonal, diagonal_lower, diagonal_upper, u):
+    no_x, no_y = u.shape
+    output = np.zeros((no_x, no_y))
+    for i in nb.prange(1, no_x - 1):
+        for j in range(0, no_y):
+            output[i, j] = diagonal_lower[i, j] * u[i - 1, j] + diagonal[i, j] * u[i, j] + \
+                diagonal_upper[i, j] * u[i + 1, j]
+
+    return output
+
+
+@nb.jit("f8[:,:](f8[:,:], f8[:,:], f8[:,:], f8[:,:])", nopython=True, nogil=True, parallel=True)
+def apply_operator_y(diagonal, diagonal_lower, diagonal_upper, u):
+    no_x, no_y = u.shape
+    output = np.zeros((no_x, no_y))
+    for i in nb.prange(0, no_x):
+        for j in range(1, no_y - 1):
+            output[i, j] = diagonal_lower[i, j] * u[i, j - 1] + diagonal[i, j] * u[i, j] + \
+                diagonal_upper[i, j] * u[i, j + 1]
+
+    return output
+
+
+@nb.jit("f8[:,:](f8[:,:], f8[:], f8[:], f8[:], f8[:], f8[:], f8[:], f8[:,:])", nopython=True, nogil=True,
+        parallel=True)
+def apply_mixed_operator(mixed, gradient_x_lower, gradient_x, gradient_x_upper, gradient_y_lower, gradient_y,
+                         gradient_y_upper, u):
+    # mixed * u_xy with the tensor product of the 1-D gradient stencils, the stencil vectors have the length of the
+    # mesh and the coefficients of the node i in the position i.
+    no_x, no_y = u.shape
+    output = np.zeros((no_x, no_y))
+    for i in nb.prange(1, no_x - 1):
+        for j in range(1, no_y - 1):
+            u_x_l = gradient_x_lower[i] * u[i - 1, j - 1] + gradient_x[i] * u[i, j - 1] + \
+                gradient_x_upper[i] * u[i + 1, j - 1]
+            u_x_c = gradient_x_lower[i] * u[i - 1, j] + gradient_x[i] * u[i, j] + gradient_x_upper[i] * u[i + 1, j]
+            u_x_u = gradient_x_lower[i] * u[i - 1, j + 1] + gradient_x[i] * u[i, j + 1] + \
+                gradient_x_upper[i] * u[i + 1, j + 1]
+            output[i, j] = mixed[i, j] * (gradient_y_lower[j] * u_x_l + gradient_y[j] * u_x_c +
+                                          gradient_y_upper[j] * u_x_u)
+
+    return output
@@ -27,3 +27,23 @@ class SchemeType(Enum):
         return self.name
 
 
+class ADISchemeType(Enum):
+    UNKNOWN = -1,
+    DOUGLAS = 0,
+    CRAIG_SNEYD = 1,
+    MODIFIED_CRAIG_SNEYD = 2,
+    HUNDSDORFER_VERWER = 3
+
+    def __str__(self):
+        return self.name
+
+
+class GridStorageType(Enum):
+    UNKNOWN = -1,
+    ALL = 0,
+    FINAL = 1,
+    TIMES = 2,
+    EVERY_K_STEPS = 3
+
+    def __str__(self):
+        return self.name
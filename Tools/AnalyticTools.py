@@ -14,6 +14,7 @@ __author__ = 'David Garcia Lorite'
 import numba as nb
 import numpy as np
 from scipy.special import ndtr
+from scipy.optimize import brentq
 
 
 @nb.jit("f8(f8, f8, f8)", nopython=True, nogil=True)
@@ -55,6 +56,37 @@ def bs_approximation_distribution(r=0.0, q=0.0, t=0.0, sigma=0.0, s0=0.0, s=0.0)
     return 0.5 + first_derive * diff + (1.0 / 6.0) * third_derive * np.power(diff, 3.0)
 
 
+def bs_price(f=0.0, k=0.0, t=0.0, sigma=0.0, is_call=1):
+    sigma_t = sigma * np.sqrt(t)
+    d_1 = np.log(f / k) / sigma_t + 0.5 * sigma_t
+    d_2 = d_1 - sigma_t
+
+    if is_call > 0:
+        return f * ndtr(d_1) - k * ndtr(d_2)
+    else:
+        return k * ndtr(- d_2) - f * ndtr(- d_1)
+
+
+def bs_vega(f=0.0, k=0.0, t=0.0, sigma=0.0):
+    sigma_t = sigma * np.sqrt(t)
+    d_1 = np.log(f / k) / sigma_t + 0.5 * sigma_t
+
+    return f * np.sqrt(t) * np.exp(- 0.5 * d_1 * d_1) / np.sqrt(2.0 * np.pi)
+
+
+def bs_implied_volatility(price=0.0, f=0.0, k=0.0, t=0.0, is_call=1, sigma_min=1e-06, sigma_max=10.0):
+    # The price is undiscounted. If the price is out of the no-arbitrage bounds, we return the closest bound.
+    f_min = bs_price(f, k, t, sigma_min, is_call) - price
+    f_max = bs_price(f, k, t, sigma_max, is_call) - price
+
+    if f_min >= 0.0:
+        return sigma_min
+    elif f_max <= 0.0:
+        return sigma_max
+    else:
+        return brentq(lambda sigma: bs_price(f, k, t, sigma, is_call) - price, sigma_min, sigma_max)
+
+
 @nb.jit("f8(f8,f8,i4)", nopython=True, nogil=True)
 def get_bessel_moments(t, nu, n):
     out = 0.0
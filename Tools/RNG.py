@@ -71,6 +71,20 @@ class RndGenerator(object):
                 first_part_rn = self._rnd_generator.normal(mu, sigma, int(0.5 * size))
                 return np.concatenate((first_part_rn, - first_part_rn), axis=0).reshape(size)
 
+    def gamma(self,
+              shape=1.0,
+              scale=1.0,
+              size=None):
+
+        return self._rnd_generator.gamma(shape, scale, size)
+
+    def inverse_gaussian(self,
+                         mean=1.0,
+                         shape=1.0,
+                         size=None):
+
+        return self._rnd_generator.wald(mean, shape, size)
+
     @staticmethod
     def normal_sobol(mu=0.0,
                      sigma=1.0,
@@ -109,6 +109,27 @@ class LOCAL_VOL_OUTPUT(Enum):
         return self.value
 
 
+class JUMP_DIFFUSION_OUTPUT(Enum):
+    PATHS = 0,
+    INTEGRAL_VARIANCE_PATHS = 1,
+    SPOT_VARIANCE_PATHS = 2,
+    NO_JUMPS_PATHS = 3,
+    TIMES = 4,
+    UNKNOWN = -1
+
+    def __str__(self):
+        return self.value
+
+
+class LEVY_OUTPUT(Enum):
+    PATHS = 0,
+    TIMES = 1,
+    UNKNOWN = -1
+
+    def __str__(self):
+        return self.value
+
+
 class TYPE_STANDARD_NORMAL_SAMPLING(Enum):
     REGULAR_WAY = 1,
     ANTITHETIC = 2
@@ -117,6 +138,30 @@ class TYPE_STANDARD_NORMAL_SAMPLING(Enum):
         return self.value
 
 
+class QUADRATURE_TYPE(Enum):
+    GAUSS_LAGUERRE = 1,
+    GAUSS_LEGENDRE = 2
+
+    def __str__(self):
+        return self.value
+
+
+class TYPE_STD_ERROR(Enum):
+    PRICE = 1,
+    IMPLIED_VOL = 2
+
+    def __str__(self):
+        return self.value
+
+
+class CALIBRATION_MODEL(Enum):
+    HESTON = 1,
+    BATES = 2
+
+    def __str__(self):
+        return self.value
+
+
 class TypeGreeks(Enum):
     DELTA = 0
     GAMMA = 1
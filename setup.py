@@ -6,9 +6,12 @@ setup(
     packages=['Tools', 'Solvers', 'Solvers.ODE_Solver', 'Solvers.PDE_Solver',
               'Solvers.PDE_Solver.Examples', 'MCPricers', 'MC_Engines', 'MC_Engines.MC_SABR', 'MC_Engines.MC_Heston',
               'MC_Engines.GenericSDE', 'MC_Engines.MC_RBergomi', 'MC_Engines.MC_MixedLogNormal',
-              'MC_Engines.MC_LocalVol', 'Instruments', 'AnalyticEngines',
+              'MC_Engines.MC_LocalVol', 'MC_Engines.MC_JumpDiffusion', 'MC_Engines.MC_Levy',
+              'Instruments', 'AnalyticEngines',
               'AnalyticEngines.FourierMethod', 'AnalyticEngines.FourierMethod.COSMethod',
-              'AnalyticEngines.FourierMethod.CharesticFunctions', 'AnalyticEngines.LocalVolatility',
+              'AnalyticEngines.FourierMethod.CharesticFunctions', 'AnalyticEngines.FourierMethod.FFTMethod',
+              'AnalyticEngines.FourierMethod.QuadratureMethod',
+              'AnalyticEngines.LocalVolatility',
               'AnalyticEngines.LocalVolatility.Hagan', 'AnalyticEngines.LocalVolatility.Dupire', 'AnalyticEngines.VolatilityTools',
               'AnalyticEngines.MalliavinMethod', 'VolatilitySurface', 'VolatilitySurface.Tools', 'FractionalBrownian'],
     url='https://github.com/Dagalon/PyStochasticVolatility.git',